@@ -1,21 +1,22 @@
 import csv
 
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.contrib import admin
 from django.core.exceptions import ValidationError
 
-from api.utils import calculate_form_results
+from api.utils import aggregate_form_results
 from api.models import(
     Question,
     Form,
     FormAssignment,
+    FormAssignmentJob,
     FormResponse,
-    User
 )
+from api.services.form_assignment import FormAssignmentPlanner, schedule_default_form_assignment
 
 
 __all__ = ['QuestionInline', 'FormAssignmentInline', 'FormAdmin', 'QuestionAdmin', 
-           'ResponseAdmin', 'FormAssignmentAdmin']
+           'ResponseAdmin', 'FormAssignmentAdmin', 'FormAssignmentJobAdmin']
 
 
 class QuestionInline(admin.TabularInline):
@@ -90,40 +91,6 @@ class FormAdmin(admin.ModelAdmin):
 
         formset.save_m2m()  # Save many-to-many relationships, if any
 
-    def calculate_user_assignments(self, form, check_existing_assignments=True):
-        """
-        Calculate affected and skipped users for a given form.
-        Returns two lists: affected_users and skipped_users.
-
-        Args:
-            form (Form): The form instance being processed.
-            check_existing_assignments (bool): Whether to check for existing assignments in the database.
-        """
-        users = User.objects.all()
-        affected_users = []
-        skipped_users = []
-
-        for user in users:
-            if check_existing_assignments and FormAssignment.objects.filter(form=form, assigned_to=user).exists():
-                skipped_users.append({"user": user, "reason": "Already assigned"})
-                continue
-
-            if form.form_type == Form.FormType.TL:
-                leaders = user.get_leaders()
-                if not leaders:
-                    skipped_users.append({"user": user, "reason": "No leader assigned"})
-                    continue
-                affected_users.append(user)
-
-            elif form.form_type == Form.FormType.PM:              # FUTURE ENHANCEMENT: automated assignment for PMs
-                skipped_users.append({"user": user, "reason": "Manual assignment required"})
-                continue
-
-            else:
-                skipped_users.append({"user": user, "reason": "This form type is not applicable"})
-
-        return affected_users, skipped_users
-    
     def save_model(self, request, obj, form, change):
         """
         Override save_model to handle default form assignment notification.
@@ -131,13 +98,13 @@ class FormAdmin(admin.ModelAdmin):
         super().save_model(request, obj, form, change)
         if obj.is_default and obj.cycle.is_active:
             # Exclude `Already Assigned` instances for the instant notification in admin panel
-            affected_users, skipped_users = self.calculate_user_assignments(obj, check_existing_assignments=False)
+            affected, skipped = FormAssignmentPlanner([obj], check_existing_assignments=False).counts(obj)
 
             # Notify the admin with a summary
             self.message_user(
                 request,
-                f"Form '{obj.name}' processed. Affected: {len(affected_users)} users. "
-                f"Skipped: {len(skipped_users)} users.",
+                f"Form '{obj.name}' processed. Affected: {affected} users. "
+                f"Skipped: {skipped} users.",
                 level="info"
             )
 
@@ -150,24 +117,9 @@ class FormAdmin(admin.ModelAdmin):
             self.message_user(request, "No forms selected.", level="warning")
             return
         
-        # Create CSV response
-        response = HttpResponse(
-            content_type="text/csv",
-            headers={"Content-Disposition": 'attachment; filename="skipped_users.csv"'},
-        )
-        writer = csv.writer(response)
-        writer.writerow(["Form Name", "User Email", "User Name", "Reason Skipped"])
-
-        # Iterate over selected forms
-        skipped_count = 0
-
-        for form in queryset:
-            _, skipped_users = self.calculate_user_assignments(form)
-
-            for entry in skipped_users:
-                user = entry["user"]
-                writer.writerow([form.name, user.email, user.name, entry["reason"]])
-                skipped_count += 1
+        # One plan covers all selected forms; the CSV is streamed from it
+        planner = FormAssignmentPlanner(queryset)
+        skipped_count = sum(planner.counts(form)[1] for form in planner.forms)
 
         if skipped_count == 0:
             self.message_user(request, "No skipped users to export for the selected forms.", level="info")
@@ -179,7 +131,11 @@ class FormAdmin(admin.ModelAdmin):
             level="success"
         )
 
-        return response
+        return StreamingHttpResponse(
+            planner.iter_skipped_csv(),
+            content_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="skipped_users.csv"'},
+        )
 
     export_skipped_users_csv.short_description = "Export Skipped Users to CSV"
 
@@ -209,33 +165,16 @@ class FormAdmin(admin.ModelAdmin):
         ])
 
         for form in queryset:
-            # find all distinct assessed_by IDs for this form
+            # aggregated results of every assessed user (assigned_by) of this form
             assignments = FormAssignment.objects.filter(form=form)
-            assessed_ids = assignments.values_list("assigned_by", flat=True).distinct()
-
-            for assessed_id in assessed_ids:
-                # lookup the assessed user
-                try:
-                    assessed_user = User.objects.get(id=assessed_id)
-                except User.DoesNotExist:
-                    continue
-
-                # gather all responses for that assessed user in this form
-                to_users = assignments.filter(assigned_by=assessed_id)\
-                                      .values_list("assigned_to", flat=True)
-                responses = FormResponse.objects.filter(
-                    question__form=form,
-                    user__in=to_users
-                )
-
-                # calculate aggregated results
-                results = calculate_form_results(responses, form)
+            for results in aggregate_form_results(form, assignments):
+                assessed_name = results["assigned_by_name"]
 
                 # write category averages
                 for category, avg in results["categories"].items():
                     writer.writerow([
                         form.name,
-                        assessed_user.name,
+                        assessed_name,
                         "Category",
                         category,
                         f"{avg:.2f}" if avg is not None else ""
@@ -245,7 +184,7 @@ class FormAdmin(admin.ModelAdmin):
                 for q in results["questions"]:
                     writer.writerow([
                         form.name,
-                        assessed_user.name,
+                        assessed_name,
                         "Question",
                         q["text"],
                         f"{q['average']:.2f}" if q["average"] is not None else ""
@@ -299,3 +238,24 @@ class FormAssignmentAdmin(admin.ModelAdmin):
     search_fields = ("assigned_to__email", "form__name")
 
                            
+
+
+@admin.register(FormAssignmentJob)
+class FormAssignmentJobAdmin(admin.ModelAdmin):
+    list_display = ("form", "status", "assigned", "total", "started_at", "finished_at")
+    list_filter = ("status",)
+    search_fields = ("form__name",)
+    readonly_fields = ("form", "status", "total", "assigned", "error", "started_at", "finished_at")
+    actions = ["rerun_jobs"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def rerun_jobs(self, request, queryset):
+        """Schedule a fresh assignment run for the forms of the selected jobs."""
+        forms = {job.form for job in queryset.select_related("form")}
+        for form in forms:
+            schedule_default_form_assignment(form)
+        self.message_user(request, f"Scheduled assignment for {len(forms)} form(s).", level="success")
+
+    rerun_jobs.short_description = "Run assignment again"
@@ -14,7 +14,7 @@ class ApiKeyAuthentication(authentication.BaseAuthentication):
     Usage:
         1. Client sends request with header: X-API-Key: pk_live_...
         2. We look up the key by prefix (first 12 chars) for efficiency
-        3. Verify the full key matches
+        3. Verify the full key matches (cached per key, see ApiKey.verify_key)
         4. Return the associated user and ApiKey instance
     """
     header_name = 'X-API-Key'
@@ -30,25 +30,12 @@ class ApiKeyAuthentication(authentication.BaseAuthentication):
         if not api_key.startswith('pk_live_'):
             raise exceptions.AuthenticationFailed('Invalid API key format.')
         
-        # Extract prefix for lookup
-        key_prefix = api_key[:12]
-        
-        # Find active API keys with matching prefix
-        try:
-            api_key_obj = ApiKey.objects.filter(
-                key_prefix=key_prefix,
-                is_active=True
-            ).select_related('user').first()
-        except ApiKey.DoesNotExist:
-            raise exceptions.AuthenticationFailed('Invalid API key.')
-        
+        # Look up by prefix (or by the verified-key cache) and verify the full key
+        api_key_obj = ApiKey.get_for_key(api_key)
+
         if not api_key_obj:
             raise exceptions.AuthenticationFailed('Invalid API key.')
         
-        # Verify the key matches
-        if not api_key_obj.verify_key(api_key):
-            raise exceptions.AuthenticationFailed('Invalid API key.')
-        
         # Record usage
         api_key_obj.record_usage()
         
@@ -0,0 +1,632 @@
+"""
+Chunked history import engine shared by import_history and import_history_prod.
+
+Rows are read in chunks. Users, existing timeline events and snapshot histories are
+loaded once per chunk, ladders and pay bands once per import. Each chunk is written
+with bulk_create, so no per-row queries, savepoints or post_save signals are involved;
+the projections the signals would have refreshed are refreshed once per chunk instead.
+"""
+
+import time
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.db import DatabaseError, transaction
+
+from api.management.commands._import_utils import (
+    average_or_none,
+    normalize_stage,
+    parse_date,
+    parse_float_or_none,
+    parse_json_dict,
+)
+from api.models import TimelineEvent
+from api.models.ladder import Ladder, LadderAspect
+from api.models.note import Note, NoteSubmitStatus, NoteType, ProposalType, Summary, SummarySubmitStatus
+from api.models.organization import PayBand
+from api.models.performance_tables import CompensationSnapshot, SenioritySnapshot
+from api.models.timeline import EventType
+from api.models.user import User
+from api.services.org_structure import invalidate_org_structure
+from api.services.performance_tables import refresh_performance_states
+from api.services.user_classification import refresh_user_classifications
+
+HISTORY_IMPORT_CHUNK_SIZE = 1000
+
+# Events that get an imported committee proposal (Note + DONE Summary)
+COMMITTEE_EVENTS = {"MAPPING", "NOTICE", "SENIORITY_CHANGE", "EVALUATION", "PROMOTION"}
+SENIORITY_EVENTS = {"SENIORITY_CHANGE", "MAPPING"}
+KNOWN_EVENTS = set(EventType.values) | COMMITTEE_EVENTS
+
+SUMMARY_TEXT_MAX_LENGTH = TimelineEvent._meta.get_field("summary_text").max_length
+
+
+class RowError(Exception):
+    """A CSV row that cannot be imported; the message lists the reasons."""
+
+
+@dataclass
+class HistoryImportStats:
+    rows: int = 0
+    created_events: int = 0
+    updated_events: int = 0
+    deleted_duplicates: int = 0
+    created_summaries: int = 0
+    created_sen: int = 0
+    created_comp: int = 0
+    skipped: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def counters(self) -> Dict[str, int]:
+        counters = asdict(self)
+        del counters["elapsed"]
+        return counters
+
+    @classmethod
+    def from_counters(cls, counters: Dict[str, int], elapsed: float) -> "HistoryImportStats":
+        return cls(elapsed=elapsed, **counters)
+
+
+@dataclass
+class _ChunkPlan:
+    """Objects one chunk writes, collected before anything touches the database."""
+
+    events: List[TimelineEvent] = field(default_factory=list)
+    updated_events: Dict[int, TimelineEvent] = field(default_factory=dict)
+    deleted_event_ids: List[int] = field(default_factory=list)
+    notes: List[Note] = field(default_factory=list)
+    summaries: List[Summary] = field(default_factory=list)
+    seniority: List[SenioritySnapshot] = field(default_factory=list)
+    compensation: List[CompensationSnapshot] = field(default_factory=list)
+    rows: int = 0
+
+
+def _format_pay_band(band: float) -> str:
+    if band == int(band):
+        return str(int(band))
+    return str(band)
+
+
+def _short_stage(label: Optional[str]) -> Optional[str]:
+    if not label:
+        return None
+    s = label.replace('\u200c', '').split()[0]
+    return s[:-1] if s.endswith('ی') else s
+
+
+def _pay_band_numbers(rows) -> set:
+    numbers = set()
+    for _, row in rows:
+        if (row.get("event_type") or "").strip() == "PAY_CHANGE":
+            number = parse_float_or_none((row.get("pay_band_number") or "").strip())
+            if number is not None:
+                numbers.add(number)
+    return numbers
+
+
+def create_missing_pay_bands(rows: Iterable[Tuple[int, Dict[str, str]]]) -> int:
+    """Create the PayBands PAY_CHANGE *rows* refer to. Returns how many were missing.
+
+    Parallel imports run this once up front, so concurrent partitions never insert
+    (and wait on) the same pay band.
+    """
+    numbers = _pay_band_numbers(rows) - set(PayBand.objects.values_list("number", flat=True))
+    PayBand.objects.bulk_create([PayBand(number=number) for number in numbers], ignore_conflicts=True)
+    return len(numbers)
+
+
+def _no_log(operation: str, details: Dict, status: str = "info") -> None:
+    pass
+
+
+class HistoryImporter:
+    """Imports history CSV rows (``(line_number, row)`` pairs) chunk by chunk.
+
+    *existing* decides what happens to a row whose ``(user, event_type, effective_date)``
+    event already exists: ``"skip"`` it, ``"update"`` the latest event's summary text, or
+    ``"dedupe"`` (update, and delete the older duplicates). Snapshots and committee
+    proposals are only created alongside new events, so re-running an import is a no-op.
+
+    With *strict*, a seniority, pay or bonus row missing its snapshot data is an error;
+    otherwise the event is imported without a snapshot and a warning is logged.
+    *log* receives ``(operation, details, status)`` like ``ProductionLogger.log_operation``.
+    """
+
+    def __init__(
+        self,
+        *,
+        existing: str = "skip",
+        strict: bool = False,
+        proposal_types: Optional[Dict[str, str]] = None,
+        dry_run: bool = False,
+        chunk_size: int = HISTORY_IMPORT_CHUNK_SIZE,
+        log: Optional[Callable[..., None]] = None,
+    ):
+        if existing not in ("skip", "update", "dedupe"):
+            raise ValueError(f"unknown existing-event policy: {existing}")
+        self.existing = existing
+        self.strict = strict
+        self.proposal_types = proposal_types or {}
+        self.dry_run = dry_run
+        self.chunk_size = max(int(chunk_size), 1)
+        self.log = log or _no_log
+        self.stats = HistoryImportStats()
+
+        self._ladders: Dict[str, Ladder] = {}
+        self._aspect_names: Dict[int, Dict[str, str]] = {}
+        self._pay_bands: Dict[float, PayBand] = {}
+        self._users: Dict[str, Optional[User]] = {}
+        self._loaded_user_ids = set()
+        # (user_id, event_type, effective_date) -> latest event, and the older duplicates' pks
+        self._events: Dict[Tuple[int, str, object], TimelineEvent] = {}
+        self._duplicate_event_ids: Dict[Tuple[int, str, object], List[int]] = {}
+        # user_id -> [(effective_date, ladder_id, details, stages)] / [(effective_date, pay_band_id)]
+        self._seniority: Dict[int, List[tuple]] = {}
+        self._compensation: Dict[int, List[tuple]] = {}
+
+    # -------------------------------
+    # Driver
+    # -------------------------------
+
+    def run(self, rows: Iterable[Tuple[int, Dict[str, str]]]) -> HistoryImportStats:
+        started = time.perf_counter()
+        self._load_reference_data()
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            self._import_chunk(chunk)
+            self.stats.elapsed = time.perf_counter() - started
+            self.log("chunk_imported", {
+                "rows": self.stats.rows,
+                "events": self.stats.created_events,
+                "errors": self.stats.errors,
+                "rows_per_second": round(self.stats.rows_per_second, 1),
+            })
+        self.stats.elapsed = time.perf_counter() - started
+        return self.stats
+
+    def _load_reference_data(self):
+        self._ladders = {ladder.code: ladder for ladder in Ladder.objects.all()}
+        self._aspect_names = {}
+        for ladder_id, code, name in LadderAspect.objects.values_list("ladder_id", "code", "name"):
+            self._aspect_names.setdefault(ladder_id, {})[code] = name
+        self._pay_bands = {band.number: band for band in PayBand.objects.all()}
+
+    def _import_chunk(self, chunk: List[Tuple[int, Dict[str, str]]]):
+        emails = {(row.get("user_email") or "").strip() for _, row in chunk}
+        self._load_users(emails)
+        self._ensure_pay_bands(chunk)
+
+        plan = _ChunkPlan()
+        for line_no, row in chunk:
+            self.stats.rows += 1
+            try:
+                self._plan_row(line_no, row, plan)
+            except RowError as exc:
+                self.stats.errors += 1
+                self.log("row_failed", {
+                    "row": line_no,
+                    "user": (row.get("user_email") or "").strip(),
+                    "event_type": (row.get("event_type") or "").strip(),
+                    "errors": str(exc).split("; "),
+                }, "error")
+
+        if self.dry_run:
+            self._count(plan)
+            return
+        touched = {obj.user_id for obj in plan.seniority + plan.compensation} | {n.owner_id for n in plan.notes}
+        try:
+            with transaction.atomic():
+                self._write(plan)
+        except DatabaseError as exc:
+            # Nothing of this chunk was written; reload its users' state from the database
+            self.stats.errors += plan.rows
+            self._forget({self._users[email].pk for email in emails if self._users.get(email)})
+            self.log("chunk_failed", {"rows": plan.rows, "error": str(exc)}, "error")
+            return
+        self._count(plan)
+        if touched:
+            refresh_performance_states(touched)
+        if plan.seniority:
+            refresh_user_classifications({snapshot.user_id for snapshot in plan.seniority})
+            invalidate_org_structure()
+
+    def _write(self, plan: _ChunkPlan):
+        if plan.deleted_event_ids:
+            TimelineEvent.objects.filter(pk__in=plan.deleted_event_ids).delete()
+        TimelineEvent.objects.bulk_create(plan.events)
+        TimelineEvent.objects.bulk_update(plan.updated_events.values(), ["summary_text"])
+        Note.objects.bulk_create(plan.notes)
+        Summary.objects.bulk_create(plan.summaries)
+        SenioritySnapshot.objects.bulk_create(plan.seniority)
+        CompensationSnapshot.objects.bulk_create(plan.compensation)
+
+    def _count(self, plan: _ChunkPlan):
+        self.stats.created_events += len(plan.events)
+        self.stats.updated_events += len(plan.updated_events)
+        self.stats.deleted_duplicates += len(plan.deleted_event_ids)
+        self.stats.created_summaries += len(plan.summaries)
+        self.stats.created_sen += len(plan.seniority)
+        self.stats.created_comp += len(plan.compensation)
+
+    # -------------------------------
+    # Lookup maps
+    # -------------------------------
+
+    def _load_users(self, emails):
+        missing = [email for email in emails if email and email not in self._users]
+        if not missing:
+            return
+        found = {}
+        # Lowest pk wins for duplicated emails, like filter(email=...).first()
+        for user in User.objects.filter(email__in=missing).only("pk", "email").order_by("-pk"):
+            found[user.email] = user
+        for email in missing:
+            self._users[email] = found.get(email)
+
+        user_ids = [user.pk for user in found.values() if user.pk not in self._loaded_user_ids]
+        if not user_ids:
+            return
+        self._loaded_user_ids.update(user_ids)
+        events = (
+            TimelineEvent.objects.filter(user_id__in=user_ids)
+            .only("pk", "user_id", "event_type", "effective_date", "summary_text")
+            .order_by("date_created", "pk")
+        )
+        for event in events:
+            key = (event.user_id, event.event_type, event.effective_date)
+            if key in self._events:
+                self._duplicate_event_ids.setdefault(key, []).append(self._events[key].pk)
+            self._events[key] = event
+        for user_id in user_ids:
+            self._seniority[user_id] = []
+            self._compensation[user_id] = []
+        seniority = (
+            SenioritySnapshot.objects.filter(user_id__in=user_ids)
+            .order_by("effective_date", "date_created")
+            .values_list("user_id", "effective_date", "ladder_id", "details_json", "stages_json")
+        )
+        for user_id, *entry in seniority:
+            self._seniority[user_id].append(tuple(entry))
+        compensation = (
+            CompensationSnapshot.objects.filter(user_id__in=user_ids)
+            .order_by("effective_date", "date_created")
+            .values_list("user_id", "effective_date", "pay_band_id")
+        )
+        for user_id, *entry in compensation:
+            self._compensation[user_id].append(tuple(entry))
+
+    def _forget(self, user_ids):
+        self._loaded_user_ids.difference_update(user_ids)
+        self._users = {email: user for email, user in self._users.items() if user is None or user.pk not in user_ids}
+        self._events = {key: event for key, event in self._events.items() if key[0] not in user_ids}
+        self._duplicate_event_ids = {k: v for k, v in self._duplicate_event_ids.items() if k[0] not in user_ids}
+
+    def _ensure_pay_bands(self, chunk):
+        numbers = _pay_band_numbers(chunk) - self._pay_bands.keys()
+        if not numbers:
+            return
+        if self.dry_run:
+            self._pay_bands.update({number: PayBand(number=number) for number in numbers})
+            return
+        PayBand.objects.bulk_create([PayBand(number=number) for number in numbers], ignore_conflicts=True)
+        self._pay_bands.update({band.number: band for band in PayBand.objects.filter(number__in=numbers)})
+
+    def _previous_seniority(self, user_id, ladder_id, effective_date):
+        """Latest snapshot on *ladder_id* strictly before *effective_date*, or None."""
+        previous = None
+        for entry in self._seniority.get(user_id, ()):
+            if entry[1] == ladder_id and entry[0] < effective_date and (previous is None or entry[0] >= previous[0]):
+                previous = entry
+        return previous
+
+    def _latest_pay_band_id(self, user_id, effective_date):
+        """Pay band of the latest compensation snapshot on or before *effective_date*."""
+        latest = None
+        for entry in self._compensation.get(user_id, ()):
+            if entry[0] <= effective_date and (latest is None or entry[0] >= latest[0]):
+                latest = entry
+        return latest[1] if latest else None
+
+    # -------------------------------
+    # Rows
+    # -------------------------------
+
+    def _plan_row(self, line_no: int, row: Dict[str, str], plan: _ChunkPlan):
+        user_email = (row.get("user_email") or "").strip()
+        event_type = (row.get("event_type") or "").strip()
+        date_raw = (row.get("event_date") or "").strip()
+
+        user = self._users.get(user_email)
+        if user is None:
+            raise RowError(f"user not found: {user_email}")
+        try:
+            effective_date = parse_date(date_raw)
+        except Exception:
+            raise RowError(f"invalid date (expected YYYY-MM-DD): {date_raw}")
+
+        snapshot = self._build_snapshot(line_no, row, event_type, user, effective_date)
+        summary_text = self.rich_summary(row, event_type, user.pk, effective_date)
+        if len(summary_text) > SUMMARY_TEXT_MAX_LENGTH:
+            raise RowError(f"summary text longer than {SUMMARY_TEXT_MAX_LENGTH} characters")
+        if event_type not in KNOWN_EVENTS:
+            self.log("unknown_event_type", {"row": line_no, "user": user_email, "event_type": event_type}, "warning")
+
+        key = (user.pk, event_type, effective_date)
+        existing = self._events.get(key)
+        if existing is not None:
+            if self.existing == "skip":
+                self.stats.skipped += 1
+                self.log("duplicate_event_skipped", {"user": user_email, "event_type": event_type, "date": effective_date})
+                return
+            if self.existing == "dedupe":
+                plan.deleted_event_ids.extend(self._duplicate_event_ids.pop(key, []))
+            if existing.summary_text != summary_text:
+                existing.summary_text = summary_text
+                if existing.pk is not None:
+                    plan.updated_events[existing.pk] = existing
+            plan.rows += 1
+            return
+
+        event = TimelineEvent(
+            user_id=user.pk,
+            event_type=event_type,
+            summary_text=summary_text,
+            effective_date=effective_date,
+            content_type=None,  # No links for imported events
+            object_id=None,
+            visibility_mask=1,
+            created_by=None,
+        )
+        self._events[key] = event
+        plan.events.append(event)
+        plan.rows += 1
+
+        if event_type in COMMITTEE_EVENTS:
+            # Imported proposals skip leader access grants and the summary_to_timeline signal;
+            # a DONE summary marks its note REVIEWED, as ensure_summary_predefined_access would
+            note = Note(
+                owner_id=user.pk,
+                title=summary_text or f"{event_type} Event",
+                content=summary_text,
+                date=effective_date,
+                type=NoteType.Proposal,
+                proposal_type=self.proposal_types.get(event_type, ProposalType.EVALUATION),
+                submit_status=NoteSubmitStatus.REVIEWED,
+                is_import=True,
+                _skip_access_grants=True,
+            )
+            plan.notes.append(note)
+            plan.summaries.append(Summary(
+                note=note,
+                content=summary_text,
+                committee_date=effective_date,
+                submit_status=SummarySubmitStatus.DONE,
+                is_import=True,
+            ))
+
+        if isinstance(snapshot, SenioritySnapshot):
+            plan.seniority.append(snapshot)
+            self._seniority.setdefault(user.pk, []).append(
+                (effective_date, snapshot.ladder_id, snapshot.details_json, snapshot.stages_json)
+            )
+        elif isinstance(snapshot, CompensationSnapshot):
+            plan.compensation.append(snapshot)
+            self._compensation.setdefault(user.pk, []).append((effective_date, snapshot.pay_band_id))
+
+    def _snapshot_problem(self, line_no, user, problems):
+        if self.strict:
+            raise RowError("; ".join(problems))
+        self.log("snapshot_skipped", {"row": line_no, "user": user.email, "warnings": problems}, "warning")
+
+    def _build_snapshot(self, line_no, row, event_type, user, effective_date):
+        """The unsaved snapshot a row creates, or None when the event type has none."""
+        if event_type in SENIORITY_EVENTS:
+            ladder_code = (row.get("ladder_code") or "").strip()
+            details = parse_json_dict(row.get("aspect_details_json"))
+            problems = []
+            if not ladder_code:
+                problems.append("ladder_code required for this event type")
+            if not details:
+                problems.append("aspect_details_json required (absolute levels)")
+            ladder = self._ladders.get(ladder_code)
+            if ladder_code and ladder is None:
+                problems.append(f"ladder not found: {ladder_code}")
+            if problems:
+                self._snapshot_problem(line_no, user, problems)
+                return None
+            stages_raw = parse_json_dict(row.get("aspect_stages_json")) or {}
+            overall = parse_float_or_none((row.get("overall_score") or "").strip())
+            if overall is None:
+                overall = average_or_none(details.values()) or 0.0
+            return SenioritySnapshot(
+                user_id=user.pk,
+                ladder=ladder,
+                title=(row.get("performance_label") or row.get("ladder_title") or ""),
+                overall_score=overall,
+                details_json=details,
+                stages_json={k: normalize_stage(v) for k, v in stages_raw.items()},
+                effective_date=effective_date,
+                source_event=None,
+                is_redacted=False,
+            )
+
+        if event_type == "PAY_CHANGE":
+            pb_raw = (row.get("pay_band_number") or "").strip()
+            pay_band = None
+            if pb_raw:
+                number = parse_float_or_none(pb_raw)
+                if number is None:
+                    self._snapshot_problem(line_no, user, [f"invalid pay_band_number: {pb_raw}"])
+                    return None
+                pay_band = self._pay_bands[number]
+            return CompensationSnapshot(
+                user_id=user.pk,
+                pay_band=pay_band,
+                salary_change=parse_float_or_none(row.get("salary_change")) or 0.0,
+                bonus_percentage=parse_float_or_none(row.get("bonus_percentage")) or 0.0,
+                effective_date=effective_date,
+                source_event=None,
+                is_redacted=False,
+            )
+
+        if event_type == "BONUS_PAYOUT":
+            bonus_percentage = parse_float_or_none(row.get("bonus_percentage"))
+            if bonus_percentage is None:
+                self._snapshot_problem(line_no, user, ["bonus_percentage required for BONUS_PAYOUT"])
+                return None
+            # Carry forward the latest pay band as of the payout date
+            return CompensationSnapshot(
+                user_id=user.pk,
+                pay_band_id=self._latest_pay_band_id(user.pk, effective_date),
+                salary_change=0.0,
+                bonus_percentage=bonus_percentage,
+                effective_date=effective_date,
+                source_event=None,
+                is_redacted=False,
+            )
+        return None
+
+    # -------------------------------
+    # Summary text
+    # -------------------------------
+
+    def rich_summary(self, row, event_type, user_id, effective_date) -> str:
+        """Timeline summary text for a row, mimicking the texts signals.py writes."""
+        if event_type == "PAY_CHANGE":
+            salary_change = parse_float_or_none(row.get("salary_change")) or 0.0
+            new_pay_band = parse_float_or_none(row.get("pay_band_number"))
+
+            if new_pay_band is not None and salary_change != 0:
+                former_pay_band = new_pay_band - salary_change
+                # 24.5 doesn't exist, so a former band of 24.5 is 24
+                if abs(former_pay_band - 24.5) < 0.001:
+                    former_pay_band = 24.0
+                former_band_str = _format_pay_band(former_pay_band)
+                new_band_str = _format_pay_band(new_pay_band)
+                if salary_change > 0:
+                    return f"افزایش پله‌ی حقوقی: {salary_change} (از {former_band_str} به {new_band_str})"
+                return f"کاهش پله‌ی حقوقی: {salary_change} (از {former_band_str} به {new_band_str})"
+            elif salary_change > 0:
+                return f"افزایش پله‌ی حقوقی: {salary_change}"
+            elif salary_change < 0:
+                return f"کاهش پله‌ی حقوقی: {salary_change}"
+            return "تغییر بسته حقوقی"
+
+        if event_type == "BONUS_PAYOUT":
+            bonus_percentage = parse_float_or_none(row.get("bonus_percentage")) or 0.0
+            if bonus_percentage > 0:
+                return f"پرداخت پاداش - {bonus_percentage}٪ از حقوق"
+            return "پرداخت پاداش"
+
+        if event_type == "MAPPING":
+            ladder_code = (row.get("ladder_code") or "").strip()
+            ladder_title = (row.get("ladder_title") or "").strip()
+            overall_score = parse_float_or_none(row.get("overall_score"))
+            details = parse_json_dict(row.get("aspect_details_json"))
+            stages_raw = parse_json_dict(row.get("aspect_stages_json")) or {}
+            ladder_name = ladder_title or ladder_code or "نامشخص"
+
+            ladder = self._ladders.get(ladder_code) if ladder_code else None
+            if ladder and details:
+                aspect_names = self._aspect_names.get(ladder.pk, {})
+                aspect_details = []
+                for code, level in details.items():
+                    stage_label = stages_raw.get(code)
+                    stage_label_clean = stage_label.replace('\u200c', '') if stage_label else None
+                    stage_text = f" - محدوده: {stage_label_clean}" if stage_label_clean else ""
+                    aspect_details.append(f"در بعد {aspect_names.get(code, code)}، سطح: {level}{stage_text}")
+                detailed_text = "\n".join(aspect_details)
+                if overall_score is not None:
+                    detailed_text += f"\n\nسطح کلی: {overall_score}"
+                return f"مپ به لدر {ladder_name}\n{detailed_text}"
+
+            if overall_score is not None:
+                return f"مپ به لدر {ladder_name} - سطح: {overall_score}"
+            return f"مپ به لدر {ladder_name} - سطح: مشخص نشد."
+
+        if event_type == "SENIORITY_CHANGE":
+            ladder_code = (row.get("ladder_code") or "").strip()
+            details = parse_json_dict(row.get("aspect_details_json"))
+            stages_raw = parse_json_dict(row.get("aspect_stages_json")) or {}
+            ladder = self._ladders.get(ladder_code) if ladder_code else None
+            if not ladder or not details:
+                return "تغییر سطح لدر"
+
+            aspect_names = self._aspect_names.get(ladder.pk, {})
+            previous = self._previous_seniority(user_id, ladder.pk, effective_date)
+            old_details = previous[2] if previous else {}
+            old_stages = previous[3] if previous else {}
+
+            aspect_changes = []
+            for code, new_level in details.items():
+                aspect_name = aspect_names.get(code, code)
+                old_level = old_details.get(code, 0) if previous else 0
+                change_amount = new_level - old_level
+
+                stage_label = stages_raw.get(code)
+                stage_label_clean = stage_label.replace('\u200c', '') if stage_label else None
+                stage_text = f" - محدوده: {stage_label_clean}" if stage_label_clean else ""
+                old_stage = old_stages.get(code) if previous else None
+                stage_changed = stage_label and stage_label != old_stage
+
+                if change_amount == 0 and not stage_changed:
+                    aspect_changes.append(f"در بعد {aspect_name}، بدون تغییر. سطح: {old_level}{stage_text}")
+                elif change_amount == 0 and stage_changed:
+                    old_short = _short_stage(old_stage) or 'نامشخص'
+                    aspect_changes.append(
+                        f"در بعد {aspect_name}، بدون تغییر. سطح: {old_level} - تغییر محدوده از {old_short} به {stage_label_clean}"
+                    )
+                elif stage_label:
+                    aspect_changes.append(
+                        f"در بعد {aspect_name}، ارتقا از سطح {old_level} به {new_level} (+{change_amount}) - محدوده: {stage_label}"
+                    )
+                else:
+                    aspect_changes.append(f"در بعد {aspect_name}، ارتقا از سطح {old_level} به {new_level} (+{change_amount})")
+
+            old_overall = round(sum(old_details.values()) / len(old_details), 1) if old_details else 0
+            new_overall = round(sum(details.values()) / len(details), 1)
+            seniority_text = "\n".join(aspect_changes)
+            if old_overall != new_overall:
+                seniority_text += f"\n\nسطح کلی: از {old_overall} به {new_overall}"
+            return seniority_text
+
+        if event_type == "EVALUATION":
+            perf_label = (row.get("performance_label") or "").strip()
+            ladder_code = (row.get("ladder_code") or "").strip()
+            ladder_title = (row.get("ladder_title") or "").strip()
+            overall_score = parse_float_or_none(row.get("overall_score"))
+            details = parse_json_dict(row.get("aspect_details_json"))
+
+            if ladder_code or ladder_title or overall_score is not None or details:
+                ladder_name = ladder_title or ladder_code or "نامشخص"
+                ladder = self._ladders.get(ladder_code) if ladder_code else None
+                if ladder and details:
+                    aspect_names = self._aspect_names.get(ladder.pk, {})
+                    detailed_text = "\n".join(
+                        f"در بعد {aspect_names.get(code, code)}، سطح: {level}" for code, level in details.items()
+                    )
+                    if overall_score is not None:
+                        detailed_text += f"\n\nسطح کلی: {overall_score}"
+                    return f"ارزیابی عملکرد - {ladder_name}\n{detailed_text}"
+                if overall_score is not None:
+                    return f"ارزیابی عملکرد - {ladder_name} - سطح: {overall_score}"
+                return f"ارزیابی عملکرد - {ladder_name}"
+            return perf_label or "ارزیابی عملکرد"
+
+        if event_type == "NOTICE":
+            return "نوتیس عملکردی ثبت شد."
+
+        if event_type == "LADDER_CHANGED":
+            # Old and new ladder names are not part of the CSV
+            return "تغییر لدر"
+
+        return (row.get("summary_text") or "").strip() or "خروجی ایمپورت شده"
@@ -3,13 +3,20 @@ Production utilities for safe import operations.
 Provides backup, rollback, validation, and detailed logging capabilities.
 """
 
+import gzip
+import hashlib
 import json
+import multiprocessing
 import os
 import shutil
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
-from django.core.management.base import BaseCommand
-from django.db import transaction, connection
+from typing import Callable, Dict, Iterable, List, Any, Optional, Tuple
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction, connection, connections
 from django.conf import settings
 import logging
 
@@ -55,6 +62,11 @@ class ProductionLogger:
         else:
             self.logger.info(f"{operation}: {details}")
     
+    def merge_operations(self, entries: List[Dict[str, Any]]):
+        """Fold operations logged by worker processes into this log, in timestamp order."""
+        self.operations_log.extend(entries)
+        self.operations_log.sort(key=lambda entry: entry["timestamp"])
+
     def get_operations_summary(self) -> Dict[str, Any]:
         """Get summary of all operations performed."""
         return {
@@ -65,8 +77,44 @@ class ProductionLogger:
         }
 
 
+BACKUP_FORMAT = "ndjson.gz"
+BACKUP_MANIFEST = "manifest.json"
+BACKUP_BATCH_SIZE = 2000
+# Postgres accepts at most 65535 bind parameters per statement
+RESTORE_MAX_PARAMS = 60000
+
+
+def _backup_value(value):
+    """JSON encoding of the column values psycopg2 returns that json cannot encode itself."""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
 class DatabaseBackup:
-    """Handles database backup and restore operations."""
+    """Handles database backup and restore operations.
+
+    A backup is a directory holding one gzip-compressed NDJSON file per table (one JSON
+    array of column values per line) and a ``manifest.json`` with each table's columns,
+    row count and SHA-256. Tables are read through a server-side cursor and restored with
+    batched multi-row INSERTs, so both run in constant memory.
+    """
+
+    TABLES = [
+        'api_user', 'api_team', 'api_tribe', 'api_chapter', 'api_department',
+        'api_organization', 'api_committee', 'api_timelineevent',
+        'api_compensationsnapshot', 'api_senioritysnapshot', 'api_orgassignmentsnapshot', 'api_note',
+        'api_summary', 'api_payband', 'api_ladder', 'api_ladderaspect',
+        'api_ladderlevel'
+    ]
     
     def __init__(self, command_instance: BaseCommand, logger: ProductionLogger):
         self.command = command_instance
@@ -83,24 +131,15 @@ class DatabaseBackup:
         # Create backup directory
         os.makedirs(backup_path, exist_ok=True)
         
-        # Export database tables to JSON files
-        tables_to_backup = [
-            'api_user', 'api_team', 'api_tribe', 'api_chapter', 'api_department',
-            'api_organization', 'api_committee', 'api_timelineevent',
-            'api_compensationsnapshot', 'api_senioritysnapshot', 'api_note',
-            'api_summary', 'api_payband', 'api_ladder', 'api_ladderaspect',
-            'api_ladderlevel'
-        ]
-        
-        backed_up_tables = []
-        for table in tables_to_backup:
+        manifest = {
+            "backup_id": self.backup_id,
+            "created_at": datetime.now().isoformat(),
+            "format": BACKUP_FORMAT,
+            "tables": {},
+        }
+        for table in self.TABLES:
             try:
-                table_data = self._export_table_to_json(table)
-                if table_data:
-                    file_path = os.path.join(backup_path, f"{table}.json")
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump(table_data, f, indent=2, ensure_ascii=False, default=str)
-                    backed_up_tables.append(table)
+                manifest["tables"][table] = self._export_table(table, backup_path)
             except Exception as e:
                 self.logger.log_operation(
                     "backup_table_failed",
@@ -108,39 +147,157 @@ class DatabaseBackup:
                     "warning"
                 )
         
+        with open(os.path.join(backup_path, BACKUP_MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        
         self.logger.log_operation(
             "backup_created",
             {
                 "backup_id": self.backup_id,
                 "backup_path": backup_path,
-                "tables_backed_up": backed_up_tables
+                "tables_backed_up": list(manifest["tables"]),
+                "rows_backed_up": sum(entry["rows"] for entry in manifest["tables"].values()),
             }
         )
         
         return backup_path
     
-    def _export_table_to_json(self, table_name: str) -> List[Dict]:
-        """Export a database table to JSON format."""
-        with connection.cursor() as cursor:
-            cursor.execute(f"SELECT * FROM {table_name}")
+    def _export_table(self, table_name: str, backup_path: str) -> Dict[str, Any]:
+        """Stream a table into ``<table>.ndjson.gz``; returns its manifest entry."""
+        file_name = f"{table_name}.{BACKUP_FORMAT}"
+        file_path = os.path.join(backup_path, file_name)
+        rows = 0
+        # chunked_cursor is a server-side cursor, so rows arrive BACKUP_BATCH_SIZE at a time
+        with connection.chunked_cursor() as cursor, gzip.open(file_path, "wt", encoding="utf-8") as f:
+            cursor.execute(f"SELECT * FROM {connection.ops.quote_name(table_name)}")
+            batch = cursor.fetchmany(BACKUP_BATCH_SIZE)
+            # A named cursor only describes its columns once the first rows are fetched
             columns = [col[0] for col in cursor.description]
-            rows = cursor.fetchall()
-            return [dict(zip(columns, row)) for row in rows]
+            while batch:
+                for row in batch:
+                    f.write(json.dumps(row, ensure_ascii=False, default=_backup_value))
+                    f.write("\n")
+                rows += len(batch)
+                batch = cursor.fetchmany(BACKUP_BATCH_SIZE)
+        return {
+            "file": file_name,
+            "columns": columns,
+            "rows": rows,
+            "sha256": _file_sha256(file_path),
+        }
+    
+    def _read_manifest(self, backup_path: str) -> Dict[str, Any]:
+        with open(os.path.join(backup_path, BACKUP_MANIFEST), encoding='utf-8') as f:
+            manifest = json.load(f)
+        for table, entry in manifest["tables"].items():
+            if _file_sha256(os.path.join(backup_path, entry["file"])) != entry["sha256"]:
+                raise ValueError(f"checksum mismatch for {entry['file']}")
+        return manifest
+    
+    def _restore_table(self, cursor, table_name: str, entry: Dict[str, Any], backup_path: str) -> int:
+        """Replace a table's rows with the backed-up rows; returns rows inserted."""
+        from django.apps import apps
+        
+        quote = connection.ops.quote_name
+        columns = entry["columns"]
+        models = [m for m in apps.get_models(include_auto_created=True) if m._meta.db_table == table_name]
+        json_columns = {
+            field.column for model in models for field in model._meta.concrete_fields
+            if field.get_internal_type() == "JSONField"
+        }
+        json_positions = [i for i, column in enumerate(columns) if column in json_columns]
+        
+        cursor.execute(f"DELETE FROM {quote(table_name)}")
+        insert = f"INSERT INTO {quote(table_name)} ({', '.join(quote(c) for c in columns)}) VALUES "
+        placeholders = f"({', '.join(['%s'] * len(columns))})"
+        batch_size = max(1, min(BACKUP_BATCH_SIZE, RESTORE_MAX_PARAMS // max(len(columns), 1)))
+        
+        def flush(batch):
+            cursor.execute(insert + ", ".join([placeholders] * len(batch)), [v for row in batch for v in row])
+        
+        restored = 0
+        batch = []
+        with gzip.open(os.path.join(backup_path, entry["file"]), "rt", encoding="utf-8") as f:
+            for line in f:
+                row = json.loads(line)
+                for i in json_positions:
+                    if row[i] is not None:
+                        row[i] = json.dumps(row[i])
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    restored += len(batch)
+                    batch = []
+        if batch:
+            flush(batch)
+            restored += len(batch)
+        if restored != entry["rows"]:
+            raise ValueError(f"{table_name}: restored {restored} rows, manifest lists {entry['rows']}")
+        return restored
     
+    def _refresh_derived_tables(self):
+        """Rebuild the per-user projections from the restored users and snapshots.
+
+        Rows of users created after the backup are deleted first; they would otherwise fail
+        the deferred foreign-key check when the restore commits.
+        """
+        from django.db.models import Exists, OuterRef
+
+        from api.models import InboxCounter, User, UserClassification, UserPerformanceState
+        from api.services.inbox import refresh_inbox_counters
+        from api.services.leadership import rebuild_leadership_closure
+        from api.services.org_structure import invalidate_org_structure
+        from api.services.performance_tables import refresh_performance_states
+        from api.services.timeline_access import invalidate_role_sets
+        from api.services.user_classification import refresh_user_classifications
+
+        def user_exists(column):
+            return Exists(User.objects.filter(pk=OuterRef(column)))
+
+        for model in (UserClassification, UserPerformanceState, InboxCounter):
+            model.objects.filter(~user_exists("user_id")).delete()
+        user_ids = list(User.objects.values_list("pk", flat=True))
+        rebuild_leadership_closure()
+        refresh_performance_states(user_ids)
+        refresh_user_classifications(user_ids)
+        refresh_inbox_counters(user_ids)
+        invalidate_role_sets()
+        invalidate_org_structure()
+
     def restore_backup(self, backup_path: str) -> bool:
-        """Restore database from backup."""
+        """Restore the backed-up tables to their state at backup time.
+
+        Every file is checked against the manifest first. The tables are then emptied and
+        reloaded in one transaction with foreign-key checks deferred to commit, so rows of
+        other tables that still point at restored rows keep their references; a restore that
+        would leave dangling references fails and changes nothing. The per-user projections
+        (leadership closure, classification, performance state, inbox counters) are rebuilt
+        in the same transaction.
+        """
+        from django.apps import apps
+        from django.core.management.color import no_style
+        
         try:
-            # This is a simplified restore - in production, you'd want more sophisticated restore logic
             self.logger.log_operation(
                 "restore_started",
                 {"backup_path": backup_path}
             )
+            manifest = self._read_manifest(backup_path)
+            
+            restored = {}
+            with transaction.atomic(), connection.cursor() as cursor:
+                if connection.vendor == "postgresql":
+                    cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+                for table, entry in manifest["tables"].items():
+                    restored[table] = self._restore_table(cursor, table, entry, backup_path)
+                models = [m for m in apps.get_models(include_auto_created=True) if m._meta.db_table in restored]
+                for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                    cursor.execute(sql)
+                self._refresh_derived_tables()
             
-            # For now, just log the restore attempt
-            # In a real implementation, you'd restore the JSON files to the database
             self.logger.log_operation(
                 "restore_completed",
-                {"backup_path": backup_path}
+                {"backup_path": backup_path, "rows_restored": restored}
             )
             return True
         except Exception as e:
@@ -420,3 +577,67 @@ class ProductionImportBase:
     def get_operations_summary(self) -> Dict[str, Any]:
         """Get summary of all operations performed."""
         return self.logger.get_operations_summary()
+
+    def merge_partitions(self, results: List["PartitionResult"]) -> Dict[str, int]:
+        """Merge the operation logs of worker partitions and return their summed counters."""
+        counters = Counter()
+        for result in results:
+            self.logger.merge_operations(result.operations)
+            counters.update(result.counters)
+        return dict(counters)
+
+
+# -------------------------------
+# Parallel (partitioned) imports
+# -------------------------------
+
+
+def partition_of(key: Optional[str], workers: int) -> int:
+    """Stable partition of a CSV key (e.g. an email) among *workers*, case-insensitive."""
+    return zlib.crc32((key or "").strip().lower().encode("utf-8")) % workers
+
+
+def partition_rows(rows: Iterable[Tuple[int, Dict[str, str]]], key_column: str, partition: int, workers: int):
+    """The ``(line_number, row)`` pairs of *rows* that belong to *partition*, in CSV order."""
+    for idx, row in rows:
+        if partition_of(row.get(key_column), workers) == partition:
+            yield idx, row
+
+
+@dataclass
+class PartitionResult:
+    partition: int
+    counters: Dict[str, int] = field(default_factory=dict)
+    operations: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def _run_partition(worker: Callable, partition: int, workers: int, args: tuple) -> PartitionResult:
+    # Forked from the parent; open a fresh connection of our own and close it when done
+    connections.close_all()
+    prod_import = ProductionImportBase(None)
+    try:
+        counters = worker(prod_import, partition, workers, *args)
+        return PartitionResult(partition, dict(counters), prod_import.logger.operations_log)
+    except Exception as e:
+        prod_import.logger.log_operation("partition_failed", {"partition": partition, "error": str(e)}, "error")
+        return PartitionResult(partition, {}, prod_import.logger.operations_log, error=str(e))
+    finally:
+        connections.close_all()
+
+
+def run_partitioned_import(worker: Callable, workers: int, *args) -> List[PartitionResult]:
+    """Run ``worker(prod_import, partition, workers, *args)`` for every partition in its own process.
+
+    Each process has its own database connection, so every partition commits (or rolls back)
+    in its own transaction. *worker* must be a module-level function returning a dict of
+    counters; what it logs through ``prod_import.logger`` comes back in the PartitionResult.
+    """
+    if connection.in_atomic_block:
+        raise CommandError("--workers cannot be used inside a transaction")
+    # Forked children must not share the parent's open connections
+    connections.close_all()
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [pool.submit(_run_partition, worker, partition, workers, args) for partition in range(workers)]
+        return [future.result() for future in futures]
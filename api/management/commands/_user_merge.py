@@ -0,0 +1,179 @@
+"""
+Set-based merge of duplicate users into the users they duplicate.
+
+Every FK and M2M column pointing at User is found through model introspection, so new
+relations are picked up without touching this module. For each table the rows that would
+collide with a unique constraint after the merge are dropped first, then all of the
+table's user columns are repointed with a single UPDATE over the old -> new id map.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.models import F, UniqueConstraint
+
+from api.models import InboxCounter, LeadershipClosure, UserClassification, UserPerformanceState
+from api.models.user import User
+from api.services.acl_queue import enqueue_acl_recompute
+from api.services.inbox import mark_inbox_dirty
+from api.services.leadership import refresh_leadership_closure
+from api.services.org_structure import invalidate_org_structure
+from api.services.performance_tables import refresh_performance_states
+from api.services.timeline_access import invalidate_role_sets
+from api.services.user_classification import refresh_user_classifications
+
+# Projections of User that are recomputed for the kept users instead of merged; the
+# duplicates' rows go away with them
+DERIVED_MODELS = (LeadershipClosure, UserClassification, UserPerformanceState, InboxCounter)
+
+
+@dataclass
+class UserRelationTable:
+    """A table with one or more columns referencing User."""
+
+    model: type
+    columns: List[str]
+    # Column tuples that must stay unique, each containing at least one of ``columns``
+    unique_groups: List[Tuple[str, ...]] = field(default_factory=list)
+
+    @property
+    def table(self) -> str:
+        return self.model._meta.db_table
+
+
+def _unique_groups(model) -> List[Tuple[str, ...]]:
+    opts = model._meta
+    groups = [(f.column,) for f in opts.concrete_fields if f.unique and not f.primary_key]
+    groups += [tuple(opts.get_field(name).column for name in names) for names in opts.unique_together]
+    # Conditional constraints are treated as unconditional: that only drops more conflicts
+    groups += [
+        tuple(opts.get_field(name).column for name in constraint.fields)
+        for constraint in opts.constraints
+        if isinstance(constraint, UniqueConstraint) and constraint.fields
+    ]
+    return groups
+
+
+def user_relation_tables() -> List[UserRelationTable]:
+    """Every concrete table (M2M through tables included) with columns referencing User."""
+    tables = []
+    for model in apps.get_models(include_auto_created=True):
+        opts = model._meta
+        if opts.proxy or not opts.managed or model in DERIVED_MODELS:
+            continue
+        columns = [
+            f.column for f in opts.concrete_fields
+            if f.is_relation and f.related_model is User and f.target_field.primary_key
+        ]
+        if not columns:
+            continue
+        groups = [group for group in _unique_groups(model) if set(group) & set(columns)]
+        tables.append(UserRelationTable(model, columns, groups))
+    return tables
+
+
+class UserMerger:
+    """Repoints every reference to the duplicate users at the users they duplicate.
+
+    ``mapping`` is ``{duplicate_id: kept_id}``. ``run`` returns, per table, the rows that were
+    repointed and the rows dropped because the kept user already had an equivalent row
+    (e.g. a NoteUserAccess on the same note, or a Comment on the same note). The duplicates
+    themselves are left in place for the caller to delete.
+    """
+
+    def __init__(self, mapping: Dict[int, int]):
+        self.mapping = {old: new for old, new in mapping.items() if old != new}
+        self.stats: Dict[str, Counter] = {}
+
+    def _map_cte(self) -> Tuple[str, list]:
+        values = ", ".join(["(%s, %s)"] * len(self.mapping))
+        params = [pk for pair in self.mapping.items() for pk in pair]
+        return f"WITH m (old_id, new_id) AS (VALUES {values})", params
+
+    def _dedupe(self, cursor, relation: UserRelationTable, group: Tuple[str, ...]) -> int:
+        """Drop rows that would collide on *group* once their user columns are remapped.
+
+        A row loses to the kept user's own row, and among rows of several duplicates of one
+        user the lowest primary key wins.
+        """
+        q = connection.ops.quote_name
+        table, pk = q(relation.table), q(relation.model._meta.pk.column)
+        cte, params = self._map_cte()
+
+        # Value of a column once the merge is applied
+        def merged(alias, column):
+            if column not in relation.columns:
+                return f"{alias}.{q(column)}"
+            return f"COALESCE((SELECT new_id FROM m WHERE old_id = {alias}.{q(column)}), {alias}.{q(column)})"
+
+        def moving(alias):
+            return " OR ".join(
+                f"{alias}.{q(column)} IN (SELECT old_id FROM m)" for column in group if column in relation.columns
+            )
+
+        same_key = " AND ".join(f"{merged('k', column)} = {merged('d', column)}" for column in group)
+        sql = (
+            f"{cte} DELETE FROM {table} AS d WHERE ({moving('d')}) AND EXISTS ("
+            f"SELECT 1 FROM {table} AS k WHERE k.{pk} <> d.{pk} AND {same_key} "
+            # Rows that are not moving keep their key, so they win over every moving row
+            f"AND (NOT ({moving('k')}) OR k.{pk} < d.{pk}))"
+        )
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+    def _repoint(self, cursor, relation: UserRelationTable) -> int:
+        q = connection.ops.quote_name
+        cte, params = self._map_cte()
+        assignments = ", ".join(
+            f"{q(column)} = COALESCE((SELECT new_id FROM m WHERE old_id = {q(column)}), {q(column)})"
+            for column in relation.columns
+        )
+        moving = " OR ".join(f"{q(column)} IN (SELECT old_id FROM m)" for column in relation.columns)
+        cursor.execute(f"{cte} UPDATE {q(relation.table)} SET {assignments} WHERE {moving}", params)
+        return cursor.rowcount
+
+    def run(self) -> Dict[str, Counter]:
+        if not self.mapping:
+            return self.stats
+        with transaction.atomic(), connection.cursor() as cursor:
+            for relation in user_relation_tables():
+                counts = Counter()
+                for group in relation.unique_groups:
+                    counts["deduplicated"] += self._dedupe(cursor, relation, group)
+                counts["repointed"] = self._repoint(cursor, relation)
+                if +counts:
+                    self.stats[relation.table] = counts
+        return self.stats
+
+    def refresh_projections(self):
+        """Recompute what the kept users derive from the rows they received."""
+        kept = set(self.mapping.values())
+        # A kept user that reported to its own duplicate now points at itself
+        User.objects.filter(pk__in=kept, leader_id=F("pk")).update(leader=None)
+        User.objects.filter(pk__in=kept, agile_coach_id=F("pk")).update(agile_coach=None)
+        reports = User.objects.filter(leader_id__in=kept).values_list("pk", flat=True)
+        refresh_leadership_closure(kept | set(reports))
+        refresh_performance_states(kept)
+        refresh_user_classifications(kept)
+        enqueue_acl_recompute(user_ids=kept)
+        mark_inbox_dirty(kept)
+        invalidate_role_sets()
+        invalidate_org_structure()
+
+
+def merge_users(mapping: Dict[int, int]) -> Dict[str, Counter]:
+    """Merge ``{duplicate_id: kept_id}`` and delete the duplicates. Returns per-table counts."""
+    merger = UserMerger(mapping)
+    with transaction.atomic():
+        stats = merger.run()
+        User.objects.filter(pk__in=merger.mapping).delete()
+        merger.refresh_projections()
+    return stats
+
+
+def format_merge_stats(stats: Dict[str, Counter]) -> Iterable[str]:
+    for table, counts in sorted(stats.items()):
+        yield f"{table}: repointed={counts['repointed']}, deduplicated={counts['deduplicated']}"
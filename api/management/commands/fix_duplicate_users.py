@@ -6,7 +6,9 @@ Fix duplicate users created due to case-sensitive email matching in import_users
 
 This command:
 1. Finds duplicate users (case-insensitive email match) created on a specific date
-2. Transfers all related data from duplicates to originals (timeline events, snapshots, etc.)
+2. Transfers all related data from duplicates to originals (every FK and M2M to User,
+   found by model introspection), dropping rows that would duplicate the original's own
+   (e.g. note accesses, comments on the same note)
 3. Deletes ONLY the duplicate users created on that specific date
 
 ⚠️  IMPORTANT: This command does NOT update the original users' data fields.
@@ -16,23 +18,13 @@ This command:
 
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
-from django.utils import timezone
 from django.db.models import Q
+from django.db.models.functions import Lower
 from datetime import datetime
 import pytz
 
+from api.management.commands._user_merge import format_merge_stats, merge_users
 from api.models.user import User
-from api.models.timeline import TimelineEvent, Notice, StockGrant, TitleChange
-from api.models.performance_tables import (
-    OrgAssignmentSnapshot,
-    CompensationSnapshot,
-    SenioritySnapshot,
-    DataAccessOverride,
-)
-from api.models.note import Note, Summary, Feedback
-from api.models.activity import OneOnOneActivityLog
-from api.models.form import FormResponse, FormAssignment
-from api.models.organization import Team, Chapter, Tribe, Organization
 
 
 class Command(BaseCommand):
@@ -88,67 +80,52 @@ class Command(BaseCommand):
         self.stdout.write(f"Excluding: {exclude_email}")
 
         # Find all users created on that date (within a 1-minute window to account for processing time)
-        from django.utils import timezone
         start_time = date_obj_utc
         end_time = date_obj_utc.replace(second=59)
         
         # Find users created on the target date (these are potential duplicates)
-        candidates = User.objects.filter(
+        candidates = list(User.objects.filter(
             date_created__gte=start_time,
             date_created__lte=end_time,
-        ).exclude(email__iexact=exclude_email)
+        ).exclude(email__iexact=exclude_email).order_by("pk"))
 
-        self.stdout.write(f"\nFound {candidates.count()} candidate users created in that time window")
+        self.stdout.write(f"\nFound {len(candidates)} candidate users created in that time window")
 
-        # For each candidate, check if there's an existing user with the same email (case-insensitive)
-        # created BEFORE the target date OR with NULL date_created. If so, the candidate is a duplicate.
-        duplicates_found = {}
-        for candidate in candidates:
-            email_lower = candidate.email.lower()
-            
-            # Check if there's an existing user with the same email created before the target date
-            # OR with NULL date_created (treat NULL as oldest/original)
-            existing_user = User.objects.filter(
-                email__iexact=email_lower
-            ).filter(
-                Q(date_created__lt=start_time) | Q(date_created__isnull=True)
-            ).order_by('date_created').first()  # NULL dates come first in ascending order
-            
-            if existing_user:
-                # Found a duplicate! The candidate is a duplicate of the existing user
-                if email_lower not in duplicates_found:
-                    duplicates_found[email_lower] = {
-                        'original': existing_user,
-                        'duplicates': []
-                    }
-                duplicates_found[email_lower]['duplicates'].append(candidate)
-        
-        # Also check for duplicates within the candidates themselves (multiple users created on same date)
         email_groups = {}
         for candidate in candidates:
-            email_lower = candidate.email.lower()
-            if email_lower not in email_groups:
-                email_groups[email_lower] = []
-            email_groups[email_lower].append(candidate)
-        
-        # Add intra-day duplicates
+            email_groups.setdefault(candidate.email.lower(), []).append(candidate)
+
+        # A candidate is a duplicate if a user with the same email (case-insensitive) was created
+        # BEFORE the target date or has a NULL date_created. One query finds them for all emails.
+        existing_users = {}
+        for existing_user in (
+            User.objects.annotate(email_lower=Lower("email"))
+            .filter(email_lower__in=email_groups)
+            .filter(Q(date_created__lt=start_time) | Q(date_created__isnull=True))
+            .order_by("date_created", "pk")
+        ):
+            existing_users.setdefault(existing_user.email_lower, existing_user)
+
+        duplicates_found = {}
         for email_lower, users in email_groups.items():
-            if len(users) > 1:
+            if email_lower in existing_users:
+                # Every candidate is a duplicate of the existing user
+                duplicates_found[email_lower] = {
+                    'original': existing_users[email_lower],
+                    'duplicates': users
+                }
+            elif len(users) > 1:
                 # Multiple users with same email created on same date
-                if email_lower not in duplicates_found:
-                    # Sort to find original (prefer lowercase email, then oldest)
-                    # Handle NULL dates: treat them as oldest (before any actual date)
-                    users_sorted = sorted(users, key=lambda u: (
-                        u.email.lower() != email_lower,
-                        u.date_created if u.date_created is not None else datetime.min.replace(tzinfo=pytz.UTC)
-                    ))
-                    duplicates_found[email_lower] = {
-                        'original': users_sorted[0],
-                        'duplicates': users_sorted[1:]
-                    }
-                else:
-                    # Already have an original from before, add these as additional duplicates
-                    duplicates_found[email_lower]['duplicates'].extend(users)
+                # Sort to find original (prefer lowercase email, then oldest)
+                # Handle NULL dates: treat them as oldest (before any actual date)
+                users_sorted = sorted(users, key=lambda u: (
+                    u.email.lower() != email_lower,
+                    u.date_created if u.date_created is not None else datetime.min.replace(tzinfo=pytz.UTC)
+                ))
+                duplicates_found[email_lower] = {
+                    'original': users_sorted[0],
+                    'duplicates': users_sorted[1:]
+                }
         
         if not duplicates_found:
             self.stdout.write(self.style.SUCCESS("No duplicate users found!"))
@@ -163,14 +140,6 @@ class Command(BaseCommand):
             for dup in duplicates:
                 self.stdout.write(f"    Duplicate: {dup.email} (ID: {dup.id}, created: {dup.date_created})")
 
-        if dry_run:
-            self.stdout.write(self.style.WARNING("\nDRY RUN - No changes will be made"))
-            return
-
-        # Process each duplicate group
-        total_fixed = 0
-        total_deleted = 0
-
         # SAFETY CHECK: Verify we're only working with users from the target date
         self.stdout.write(self.style.WARNING(
             f"\n⚠️  SAFETY CHECK: Only users created between {start_time} and {end_time} UTC will be processed."
@@ -179,63 +148,48 @@ class Command(BaseCommand):
             "⚠️  NO OLD USERS WILL BE DELETED - Only duplicates from the specified date/time window."
         ))
 
-        with transaction.atomic():
-            for email_lower, dup_info in duplicates_found.items():
-                original = dup_info['original']
-                duplicates = dup_info['duplicates']
-
-                self.stdout.write(f"\nProcessing {email_lower}:")
-                self.stdout.write(f"  Original (KEEPING): {original.email} (ID: {original.id}, created: {original.date_created})")
-                
-                # SAFETY CHECK: Original should NOT be in the target time window
-                # Handle NULL date_created (treat as not in window)
-                if original.date_created is not None and start_time <= original.date_created <= end_time:
-                    self.stdout.write(self.style.ERROR(
-                        f"  ⚠️  WARNING: Original user was created in target time window! "
-                        f"This might indicate an issue. Original will be kept, but please verify."
-                    ))
-                
-                for dup in duplicates:
-                    # SAFETY CHECK: Verify duplicate was created in the target time window
-                    if not (start_time <= dup.date_created <= end_time):
-                        self.stdout.write(self.style.ERROR(
-                            f"  ⚠️  SKIPPING {dup.email} (ID: {dup.id}) - Created on {dup.date_created}, "
-                            f"outside target window! This should not happen."
-                        ))
-                        continue
-                    
-                    self.stdout.write(f"  Duplicate (DELETING): {dup.email} (ID: {dup.id}, created: {dup.date_created})")
-
-                for duplicate in duplicates:
-                    # Double-check: Only delete if created in the target time window
-                    if not (start_time <= duplicate.date_created <= end_time):
-                        self.stdout.write(self.style.ERROR(
-                            f"    ⚠️  SAFETY: Skipping deletion of {duplicate.email} - outside target window!"
-                        ))
-                        continue
+        # Map every duplicate to the user it is merged into
+        mapping = {}
+        for email_lower, dup_info in duplicates_found.items():
+            original = dup_info['original']
 
-                    fixed_count = self._transfer_data(original, duplicate)
-                    total_fixed += fixed_count
-                    self.stdout.write(f"    Transferred {fixed_count} related records")
+            # SAFETY CHECK: Original should NOT be in the target time window
+            # Handle NULL date_created (treat as not in window)
+            if original.date_created is not None and start_time <= original.date_created <= end_time:
+                self.stdout.write(self.style.ERROR(
+                    f"  ⚠️  WARNING: Original user {original.email} (ID: {original.id}) was created in target "
+                    f"time window! This might indicate an issue. Original will be kept, but please verify."
+                ))
+
+            for dup in dup_info['duplicates']:
+                # SAFETY CHECK: Only delete if created in the target time window
+                if not (start_time <= dup.date_created <= end_time):
+                    raise CommandError(
+                        f"CRITICAL SAFETY CHECK FAILED: Attempted to delete user {dup.email} "
+                        f"created on {dup.date_created}, which is outside the target window!"
+                    )
+                mapping[dup.id] = original.id
+
+        # All pairs are merged together: one UPDATE per table that references users
+        with transaction.atomic():
+            stats = merge_users(mapping)
+            if dry_run:
+                transaction.set_rollback(True)
 
-                    # SAFETY: Verify one more time before deletion
-                    if not (start_time <= duplicate.date_created <= end_time):
-                        raise CommandError(
-                            f"CRITICAL SAFETY CHECK FAILED: Attempted to delete user {duplicate.email} "
-                            f"created on {duplicate.date_created}, which is outside the target window!"
-                        )
+        self.stdout.write("\nRows referencing the duplicates, per table:")
+        for line in format_merge_stats(stats):
+            self.stdout.write(f"  {line}")
 
-                    # Delete the duplicate (only if it's from the target date)
-                    duplicate_email = duplicate.email
-                    duplicate_id = duplicate.id
-                    duplicate.delete()
-                    total_deleted += 1
-                    self.stdout.write(self.style.SUCCESS(
-                        f"    ✓ Deleted duplicate user {duplicate_email} (ID: {duplicate_id})"
-                    ))
+        total_fixed = sum(counts["repointed"] for counts in stats.values())
+        if dry_run:
+            self.stdout.write(self.style.WARNING(
+                f"\nDRY RUN - No changes were made. Would transfer {total_fixed} records "
+                f"and delete {len(mapping)} duplicate users"
+            ))
+            return
 
         self.stdout.write(self.style.SUCCESS(
-            f"\n✓ Fix complete! Fixed {total_fixed} records, deleted {total_deleted} duplicate users"
+            f"\n✓ Fix complete! Fixed {total_fixed} records, deleted {len(mapping)} duplicate users"
         ))
         self.stdout.write(self.style.WARNING(
             "\n⚠️  NOTE: This command only transfers data and deletes duplicates."
@@ -244,198 +198,3 @@ class Command(BaseCommand):
             "⚠️  To update the original users' data (name, email, gmail, phone, etc.), "
             "you must run 'import_users_prod' again after this fix."
         ))
-
-    def _transfer_data(self, original_user, duplicate_user):
-        """Transfer all related data from duplicate to original user."""
-        transferred_count = 0
-
-        # TimelineEvent (PROTECT - need to update user FK)
-        timeline_events = TimelineEvent.objects.filter(user=duplicate_user)
-        count = timeline_events.update(user=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Transferred {count} timeline events")
-
-        # SenioritySnapshot (CASCADE - will be deleted, need to transfer)
-        seniority_snapshots = SenioritySnapshot.objects.filter(user=duplicate_user)
-        count = seniority_snapshots.update(user=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Transferred {count} seniority snapshots")
-
-        # CompensationSnapshot (PROTECT - need to update user FK)
-        comp_snapshots = CompensationSnapshot.objects.filter(user=duplicate_user)
-        count = comp_snapshots.update(user=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Transferred {count} compensation snapshots")
-
-        # OrgAssignmentSnapshot (CASCADE - will be deleted, need to transfer)
-        org_snapshots = OrgAssignmentSnapshot.objects.filter(user=duplicate_user)
-        count = org_snapshots.update(user=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Transferred {count} org assignment snapshots")
-
-        # Update leader references in org snapshots
-        leader_snapshots = OrgAssignmentSnapshot.objects.filter(leader=duplicate_user)
-        count = leader_snapshots.update(leader=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Updated {count} org snapshots with leader reference")
-
-        # DataAccessOverride
-        data_overrides = DataAccessOverride.objects.filter(user=duplicate_user)
-        count = data_overrides.update(user=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Transferred {count} data access overrides")
-
-        # Update granted_by references in DataAccessOverride
-        granted_overrides = DataAccessOverride.objects.filter(granted_by=duplicate_user)
-        count = granted_overrides.update(granted_by=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Updated {count} data access overrides with granted_by reference")
-
-        # Notes
-        notes = Note.objects.filter(owner=duplicate_user)
-        count = notes.update(owner=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Transferred {count} notes")
-
-        # Summaries
-        summaries = Summary.objects.filter(note__owner=duplicate_user)
-        # Summaries are linked via Note, so we need to update the note owner (already done above)
-        # But we should also check for any direct references
-        # Actually, Summary doesn't have a direct user FK, it's via Note
-
-        # Feedback
-        sent_feedbacks = Feedback.objects.filter(sender=duplicate_user)
-        count = sent_feedbacks.update(sender=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Transferred {count} sent feedbacks")
-
-        received_feedbacks = Feedback.objects.filter(receiver=duplicate_user)
-        count = received_feedbacks.update(receiver=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Transferred {count} received feedbacks")
-
-        # OneOnOneActivityLog
-        activities = OneOnOneActivityLog.objects.filter(user=duplicate_user)
-        count = activities.update(user=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Transferred {count} activity logs")
-
-        # FormResponse (user-specific form responses)
-        form_responses = FormResponse.objects.filter(user=duplicate_user)
-        count = form_responses.update(user=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Transferred {count} form responses")
-
-        # FormAssignments
-        assigned_forms = FormAssignment.objects.filter(assigned_to=duplicate_user)
-        count = assigned_forms.update(assigned_to=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Transferred {count} form assignments (assigned_to)")
-
-        created_assignments = FormAssignment.objects.filter(assigned_by=duplicate_user)
-        count = created_assignments.update(assigned_by=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Transferred {count} form assignments (assigned_by)")
-
-        # Notice, StockGrant, TitleChange (created_by references)
-        notices = Notice.objects.filter(created_by=duplicate_user)
-        count = notices.update(created_by=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Updated {count} notices (created_by)")
-
-        stock_grants = StockGrant.objects.filter(created_by=duplicate_user)
-        count = stock_grants.update(created_by=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Updated {count} stock grants (created_by)")
-
-        title_changes = TitleChange.objects.filter(created_by=duplicate_user)
-        count = title_changes.update(created_by=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Updated {count} title changes (created_by)")
-
-        # TimelineEvent created_by references
-        created_events = TimelineEvent.objects.filter(created_by=duplicate_user)
-        count = created_events.update(created_by=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Updated {count} timeline events (created_by)")
-
-        # User relationships (leader, agile_coach)
-        # Update users who have duplicate as leader
-        users_with_leader = User.objects.filter(leader=duplicate_user)
-        count = users_with_leader.update(leader=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Updated {count} users with leader reference")
-
-        # Update users who have duplicate as agile_coach
-        users_with_coach = User.objects.filter(agile_coach=duplicate_user)
-        count = users_with_coach.update(agile_coach=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Updated {count} users with agile_coach reference")
-
-        # Update PROTECT foreign key references (must be done before deletion)
-        # Team.leader
-        teams = Team.objects.filter(leader=duplicate_user)
-        count = teams.update(leader=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Updated {count} teams with leader reference")
-
-        # Chapter.leader
-        chapters = Chapter.objects.filter(leader=duplicate_user)
-        count = chapters.update(leader=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Updated {count} chapters with leader reference")
-
-        # Tribe.leader
-        tribes_leader = Tribe.objects.filter(leader=duplicate_user)
-        count = tribes_leader.update(leader=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Updated {count} tribes with leader reference")
-
-        # Tribe.engineering_director
-        tribes_eng = Tribe.objects.filter(engineering_director=duplicate_user)
-        count = tribes_eng.update(engineering_director=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Updated {count} tribes with engineering_director reference")
-
-        # Tribe.product_director
-        tribes_prod = Tribe.objects.filter(product_director=duplicate_user)
-        count = tribes_prod.update(product_director=original_user)
-        transferred_count += count
-        if count > 0:
-            self.stdout.write(f"      - Updated {count} tribes with product_director reference")
-
-        # Organization role references (all PROTECT)
-        org_fields = ['cto', 'vp', 'ceo', 'cpo', 'hr_manager', 'sales_manager', 'cfo', 'function_owner', 'maintainer']
-        for field in org_fields:
-            orgs = Organization.objects.filter(**{field: duplicate_user})
-            count = orgs.update(**{field: original_user})
-            transferred_count += count
-            if count > 0:
-                self.stdout.write(f"      - Updated {count} organizations with {field} reference")
-
-        return transferred_count
-
@@ -4,14 +4,46 @@ NO DELETION OPERATIONS - Only creates/updates organizational entities.
 Includes backup, rollback, validation, and detailed logging.
 """
 
+from collections import Counter
+
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
 from api.management.commands._import_utils import open_csv, row_savepoint
-from api.management.commands._prod_utils import ProductionImportBase
+from api.management.commands._prod_utils import ProductionImportBase, partition_rows, run_partitioned_import
 from api.models.organization import Department, Chapter, Tribe, Team, Organization
 from api.models.user import User
 
+# Column naming the entity of each file type; rows of one entity stay in one partition
+ENTITY_COLUMNS = {
+    "organizations": "organization_name",
+    "chapters": "chapter_name",
+    "tribes": "tribe_name",
+    "teams": "team_name",
+}
+
+# Columns holding user emails referenced by each file type
+USER_COLUMNS = {
+    "organizations": (),
+    "chapters": ("chapter_leader_email",),
+    "tribes": ("tribe_engineering_director_email", "tribe_product_director_email"),
+    "teams": ("team_leader_email",),
+}
+
+
+def _import_org_partition(prod_import, partition, workers, csv_path, encoding, delimiter, file_type, flags):
+    """Import the rows of one entity-name partition in a worker process, in one transaction."""
+    counters = Counter()
+    rows = enumerate(open_csv(csv_path, encoding=encoding, delimiter=delimiter), start=2)
+    with transaction.atomic():
+        Command()._import_rows(
+            partition_rows(rows, ENTITY_COLUMNS[file_type], partition, workers),
+            file_type, prod_import, counters, **flags,
+        )
+        if flags["dry_run"]:
+            transaction.set_rollback(True)
+    return counters
+
 
 class Command(BaseCommand):
     help = "PRODUCTION-SAFE: Import organizational entities from separate CSV files. NO DELETION - Only creates/updates entities."
@@ -26,6 +58,7 @@ class Command(BaseCommand):
         parser.add_argument("--create-users", action="store_true", help="Create users if they don't exist when referenced by email")
         parser.add_argument("--force-update", action="store_true", help="Force update existing organizational relationships")
         parser.add_argument("--validate", action="store_true", default=True, help="Validate data after import")
+        parser.add_argument("--workers", type=int, default=1, help="Import in N processes, partitioned by entity name")
 
     def handle(self, *args, **options):
         csv_path = options["csv"]
@@ -73,51 +106,27 @@ class Command(BaseCommand):
                 except:
                     raise CommandError("Could not determine file type from filename or columns")
 
-            created = updated = skipped = users_created = 0
-            errors = []
-
-            with transaction.atomic():
-                for idx, row in enumerate(open_csv(csv_path, encoding=encoding, delimiter=delimiter), start=2):
-                    with row_savepoint(dry_run):
-                        try:
-                            if file_type == 'organizations':
-                                result = self._process_organization(row, idx, prod_import, dry_run)
-                                created += result.get('created', 0)
-                                updated += result.get('updated', 0)
-                                skipped += result.get('skipped', 0)
-
-                            elif file_type == 'chapters':
-                                result = self._process_chapter(row, idx, prod_import, dry_run, create_users)
-                                created += result.get('created', 0)
-                                updated += result.get('updated', 0)
-                                skipped += result.get('skipped', 0)
-                                users_created += result.get('users_created', 0)
-
-                            elif file_type == 'tribes':
-                                result = self._process_tribe(row, idx, prod_import, dry_run, create_users)
-                                created += result.get('created', 0)
-                                updated += result.get('updated', 0)
-                                skipped += result.get('skipped', 0)
-                                users_created += result.get('users_created', 0)
-
-                            elif file_type == 'teams':
-                                result = self._process_team(row, idx, prod_import, dry_run, create_users, force_update)
-                                created += result.get('created', 0)
-                                updated += result.get('updated', 0)
-                                skipped += result.get('skipped', 0)
-                                users_created += result.get('users_created', 0)
-
-                        except Exception as e:
-                            errors.append(f"Row {idx}: {str(e)}")
-                            prod_import.logger.log_operation(
-                                "org_entity_processing_failed",
-                                {"row": idx, "file_type": file_type, "error": str(e)},
-                                "error"
-                            )
-                
-                if dry_run:
-                    transaction.set_rollback(True)
-                    self.stdout.write(self.style.WARNING("Dry-run complete (no changes committed)."))
+            counters = Counter()
+            flags = {"dry_run": dry_run, "create_users": create_users, "force_update": force_update}
+            if options["workers"] > 1:
+                counters.update(self._import_parallel(
+                    prod_import, options["workers"], csv_path, encoding, delimiter, file_type, flags
+                ))
+            else:
+                with transaction.atomic():
+                    rows = enumerate(open_csv(csv_path, encoding=encoding, delimiter=delimiter), start=2)
+                    self._import_rows(rows, file_type, prod_import, counters, **flags)
+                    if dry_run:
+                        transaction.set_rollback(True)
+            if dry_run:
+                self.stdout.write(self.style.WARNING("Dry-run complete (no changes committed)."))
+            created, updated = counters["created"], counters["updated"]
+            skipped, users_created = counters["skipped"], counters["users_created"]
+            errors = [
+                f"Row {entry['details']['row']}: {entry['details']['error']}"
+                for entry in prod_import.logger.operations_log
+                if entry["operation"] == "org_entity_processing_failed"
+            ]
             
             if not dry_run:
                 # Complete production import with validation
@@ -162,6 +171,90 @@ class Command(BaseCommand):
             
             raise CommandError(f"Production import failed: {str(e)}")
 
+    def _import_rows(self, rows, file_type, prod_import, counters, dry_run, create_users, force_update):
+        """Process ``(line_number, row)`` pairs of one file type, adding to *counters*."""
+        for idx, row in rows:
+            with row_savepoint(dry_run):
+                try:
+                    if file_type == 'organizations':
+                        result = self._process_organization(row, idx, prod_import, dry_run)
+                        counters['created'] += result.get('created', 0)
+                        counters['updated'] += result.get('updated', 0)
+                        counters['skipped'] += result.get('skipped', 0)
+
+                    elif file_type == 'chapters':
+                        result = self._process_chapter(row, idx, prod_import, dry_run, create_users)
+                        counters['created'] += result.get('created', 0)
+                        counters['updated'] += result.get('updated', 0)
+                        counters['skipped'] += result.get('skipped', 0)
+                        counters['users_created'] += result.get('users_created', 0)
+
+                    elif file_type == 'tribes':
+                        result = self._process_tribe(row, idx, prod_import, dry_run, create_users)
+                        counters['created'] += result.get('created', 0)
+                        counters['updated'] += result.get('updated', 0)
+                        counters['skipped'] += result.get('skipped', 0)
+                        counters['users_created'] += result.get('users_created', 0)
+
+                    elif file_type == 'teams':
+                        result = self._process_team(row, idx, prod_import, dry_run, create_users, force_update)
+                        counters['created'] += result.get('created', 0)
+                        counters['updated'] += result.get('updated', 0)
+                        counters['skipped'] += result.get('skipped', 0)
+                        counters['users_created'] += result.get('users_created', 0)
+
+                except Exception as e:
+                    counters['errors'] += 1
+                    prod_import.logger.log_operation(
+                        "org_entity_processing_failed",
+                        {"row": idx, "file_type": file_type, "error": str(e)},
+                        "error"
+                    )
+
+    def _import_parallel(self, prod_import, workers, csv_path, encoding, delimiter, file_type, flags):
+        """Import each entity-name partition in its own process and merge logs and counters.
+
+        Entities several partitions share (the Engineering department, referenced users,
+        the tribes teams belong to and their departments) are created here first, so no two
+        partitions create the same one.
+        """
+        users_created = 0
+        if not flags["dry_run"]:
+            with transaction.atomic():
+                rows = enumerate(open_csv(csv_path, encoding=encoding, delimiter=delimiter), start=2)
+                users_created = self._create_shared_entities(
+                    [row for _, row in rows], file_type, prod_import, flags["create_users"]
+                )
+        results = run_partitioned_import(
+            _import_org_partition, workers, csv_path, encoding, delimiter, file_type, flags
+        )
+        counters = prod_import.merge_partitions(results)
+        # The partitions only find the users created above, so count them here
+        counters["users_created"] = counters.get("users_created", 0) + users_created
+        failed = [result for result in results if result.error]
+        if failed:
+            for result in failed:
+                self.stdout.write(self.style.ERROR(f"Partition {result.partition} rolled back: {result.error}"))
+            raise CommandError(f"{len(failed)} of {workers} partitions failed; the others were committed")
+        return counters
+
+    def _create_shared_entities(self, rows, file_type, prod_import, create_users):
+        """Create what several partitions reference. Returns the number of users created."""
+        if file_type == 'organizations':
+            return 0
+        Department.objects.get_or_create(name="Engineering")
+        users_created = 0
+        if create_users:
+            emails = {(row.get(column) or "").strip() for column in USER_COLUMNS[file_type] for row in rows} - {""}
+            for email in sorted(emails):
+                users_created += self._get_or_create_user_prod(email, create_users, False, prod_import)[1]
+        if file_type == 'teams':
+            for tribe_name in {(row.get("team_tribe_name") or "").strip() for row in rows} - {""}:
+                tribe, _ = Tribe.objects.get_or_create(name=tribe_name)
+                if tribe.category == "NON_TECH":
+                    Department.objects.get_or_create(name=tribe.name)
+        return users_created
+
     def _process_organization(self, row, idx, prod_import, dry_run):
         """PRODUCTION-SAFE: Process organization creation/update."""
         org_name = (row.get("organization_name") or "").strip()
@@ -203,9 +296,8 @@ class Command(BaseCommand):
             leader = None
             users_created = 0
             if chap_leader_email:
-                leader = self._get_or_create_user_prod(chap_leader_email, create_users, dry_run, prod_import)
-                if leader and hasattr(leader, 'id') and leader.id:
-                    users_created = 1
+                leader, leader_created = self._get_or_create_user_prod(chap_leader_email, create_users, dry_run, prod_import)
+                users_created = int(leader_created)
 
             # Link chapter to Engineering department by default (PRODUCTION-SAFE: Only create, no deletion)
             eng_dep = Department.objects.filter(name="Engineering").first()
@@ -277,14 +369,12 @@ class Command(BaseCommand):
             users_created = 0
             
             if tribe_eng_director_email:
-                eng_director = self._get_or_create_user_prod(tribe_eng_director_email, create_users, dry_run, prod_import)
-                if eng_director and hasattr(eng_director, 'id') and eng_director.id:
-                    users_created += 1
+                eng_director, director_created = self._get_or_create_user_prod(tribe_eng_director_email, create_users, dry_run, prod_import)
+                users_created += director_created
             
             if tribe_prod_director_email:
-                prod_director = self._get_or_create_user_prod(tribe_prod_director_email, create_users, dry_run, prod_import)
-                if prod_director and hasattr(prod_director, 'id') and prod_director.id:
-                    users_created += 1
+                prod_director, director_created = self._get_or_create_user_prod(tribe_prod_director_email, create_users, dry_run, prod_import)
+                users_created += director_created
 
             tribe, tribe_created = Tribe.objects.update_or_create(
                 name=tribe_name,
@@ -346,9 +436,8 @@ class Command(BaseCommand):
             leader = None
             users_created = 0
             if team_leader_email:
-                leader = self._get_or_create_user_prod(team_leader_email, create_users, dry_run, prod_import)
-                if leader and hasattr(leader, 'id') and leader.id:
-                    users_created = 1
+                leader, leader_created = self._get_or_create_user_prod(team_leader_email, create_users, dry_run, prod_import)
+                users_created = int(leader_created)
 
             # Determine appropriate department (PRODUCTION-SAFE: Only create, no deletion)
             if t_tribe and t_tribe.category == "NON_TECH":
@@ -393,13 +482,16 @@ class Command(BaseCommand):
         return {"created": 1}
 
     def _get_or_create_user_prod(self, email, create_users, dry_run, prod_import):
-        """PRODUCTION-SAFE: Get existing user or create new one if create_users is True and not dry-run."""
+        """PRODUCTION-SAFE: Get existing user or create new one if create_users is True and not dry-run.
+
+        Returns ``(user, created)``; *user* is None when it neither exists nor could be created.
+        """
         if not email:
-            return None
+            return None, False
 
         user = User.objects.filter(email=email).first()
         if user:
-            return user
+            return user, False
 
         if not create_users or dry_run:
             prod_import.logger.log_operation(
@@ -407,7 +499,7 @@ class Command(BaseCommand):
                 {"email": email, "reason": "create_users=False or dry_run=True"},
                 "warning"
             )
-            return None
+            return None, False
 
         # Create new user with minimal required fields (PRODUCTION-SAFE: Only create, no deletion)
         try:
@@ -421,11 +513,11 @@ class Command(BaseCommand):
                 "user_created_for_org",
                 {"email": email, "name": user.name}
             )
-            return user
+            return user, True
         except Exception as e:
             prod_import.logger.log_operation(
                 "user_creation_failed",
                 {"email": email, "error": str(e)},
                 "error"
             )
-            return None
+            return None, False
@@ -5,17 +5,42 @@ Includes backup, rollback, validation, and detailed logging.
 """
 
 import csv
+from collections import Counter
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from django.contrib.auth.hashers import make_password
 
 from api.management.commands._import_utils import open_csv, row_savepoint
-from api.management.commands._prod_utils import ProductionImportBase
+from api.management.commands._prod_utils import ProductionImportBase, partition_rows, run_partitioned_import
 from api.models.user import User
 from api.models.organization import Department, Chapter, Tribe, Team, Organization, Committee
 from api.models.role import Role, RoleType, RoleScope
 
 
+def _partition(csv_path, encoding, delimiter, partition, workers):
+    rows = enumerate(open_csv(csv_path, encoding=encoding, delimiter=delimiter), start=2)
+    return partition_rows(rows, "Email", partition, workers)
+
+
+def _import_users_partition(prod_import, partition, workers, csv_path, encoding, delimiter):
+    """PASS 1 for one email partition, in a worker process and its own transaction."""
+    counters = Counter()
+    with transaction.atomic():
+        Command()._import_users(_partition(csv_path, encoding, delimiter, partition, workers), prod_import, counters)
+    return counters
+
+
+def _import_assignments_partition(prod_import, partition, workers, csv_path, encoding, delimiter, force_update):
+    """PASS 2 org assignments for one email partition, in a worker process and its own transaction."""
+    counters = Counter()
+    with transaction.atomic():
+        Command()._import_relationships(
+            _partition(csv_path, encoding, delimiter, partition, workers), prod_import, counters, force_update,
+            leaders=False,
+        )
+    return counters
+
+
 class Command(BaseCommand):
     help = "PRODUCTION-SAFE: Import users from CSV file. NO DELETION - Only creates/updates users and relationships."
 
@@ -28,6 +53,7 @@ class Command(BaseCommand):
         parser.add_argument("--backup", action="store_true", default=True, help="Create backup before import")
         parser.add_argument("--force-update", action="store_true", help="Force update existing user relationships")
         parser.add_argument("--validate", action="store_true", default=True, help="Validate data after import")
+        parser.add_argument("--workers", type=int, default=1, help="Import in N processes, partitioned by email")
 
     def handle(self, *args, **options):
         csv_path = options["csv"]
@@ -38,6 +64,10 @@ class Command(BaseCommand):
         create_backup = bool(options["backup"])
         force_update = bool(options["force_update"])
         validate = bool(options["validate"])
+        workers = options["workers"]
+
+        def rows():
+            return enumerate(open_csv(csv_path, encoding=encoding, delimiter=delimiter), start=2)
 
         # Initialize production import utilities
         prod_import = ProductionImportBase(self, log_file)
@@ -47,485 +77,38 @@ class Command(BaseCommand):
             raise CommandError("Failed to start production import")
 
         try:
-            created = updated = skipped = users_with_roles = 0
-            errors = []
+            counters = Counter()
 
-            # Wrap everything in atomic block for dry-run, or use separate blocks for real import
             if dry_run:
+                if workers > 1:
+                    # Pass 2 of a dry-run needs the uncommitted users of every partition
+                    self.stdout.write(self.style.WARNING("--workers is ignored with --dry-run."))
                 # For dry-run, wrap everything in one atomic block so we can rollback at the end
                 with transaction.atomic():
-                    # PASS 1: Create/update all users first without relationships
-                    for idx, row in enumerate(open_csv(csv_path, encoding=encoding, delimiter=delimiter), start=2):
-                        with row_savepoint(dry_run):
-                            try:
-                                # Extract user data
-                                name = (row.get("Name") or "").strip()
-                                email = (row.get("Email") or "").strip()
-                                gmail = (row.get("Gmail") or "").strip()
-                                phone = (row.get("Phone") or "").strip() if "Phone" in row else ""
-                                role_name = (row.get("Role") or "").strip()
-
-                                if not email:
-                                    skipped += 1
-                                    prod_import.logger.log_operation(
-                                        "user_skipped",
-                                        {"row": idx, "reason": "No email provided"},
-                                        "warning"
-                                    )
-                                    continue
-
-                                # Create or get user (PRODUCTION-SAFE: No deletion)
-                                # Use case-insensitive email lookup to avoid duplicates
-                                existing_user = User.objects.filter(email__iexact=email).first()
-                                if existing_user:
-                                    # Update existing user
-                                    user = existing_user
-                                    user_created = False
-                                    user.name = name
-                                    user.gmail = gmail
-                                    user.phone = phone
-                                    user.username = email
-                                    user.is_active = True
-                                    user.save(update_fields=["name", "gmail", "phone", "username", "is_active"])
-                                else:
-                                    # Create new user
-                                    user = User.objects.create(
-                                        email=email,
-                                        name=name,
-                                        gmail=gmail,
-                                        phone=phone,
-                                        username=email,
-                                        is_active=True,
-                                    )
-                                    user_created = True
-
-                                if user_created:
-                                    created += 1
-                                    prod_import.logger.log_operation(
-                                        "user_created",
-                                        {"email": email, "name": name}
-                                    )
-                                else:
-                                    updated += 1
-                                    prod_import.logger.log_operation(
-                                        "user_updated",
-                                        {"email": email, "name": name}
-                                    )
-                                
-                                if role_name:
-                                    users_with_roles += 1
-
-                            except Exception as e:
-                                errors.append(f"Row {idx}: {str(e)}")
-                                prod_import.logger.log_operation(
-                                    "user_creation_failed",
-                                    {"row": idx, "email": email, "error": str(e)},
-                                    "error"
-                                )
-
-                    # PASS 2: Set organizational assignments and relationships (PRODUCTION-SAFE)
-                    for idx, row in enumerate(open_csv(csv_path, encoding=encoding, delimiter=delimiter), start=2):
-                        with row_savepoint(dry_run):
-                            try:
-                                email = (row.get("Email") or "").strip()
-                                team_name = (row.get("Team") or "").strip()
-                                tribe_name = (row.get("Tribe") or "").strip()
-                                chapter_name = (row.get("Chapter") or "").strip()
-                                leader_email = (row.get("Leader") or "").strip()
-                                agile_coach_email = (row.get("PR") or "").strip() or (row.get("Agile Coach") or "").strip()
-                                role_name = (row.get("Role") or "").strip()
-
-                                if not email:
-                                    continue
-
-                                user = User.objects.filter(email__iexact=email).first()
-                                if not user:
-                                    prod_import.logger.log_operation(
-                                        "user_not_found",
-                                        {"email": email, "row": idx},
-                                        "warning"
-                                    )
-                                    continue
-
-                                # Update organizational assignments (PRODUCTION-SAFE: Only update, no deletion)
-                                organization = Organization.objects.first()  # Use the first organization
-                                team_obj = None
-                                tribe_obj = None
-                                chapter_obj = None
-                                department_obj = None
-
-                                if team_name:
-                                    team_obj = Team.objects.filter(name=team_name).first()
-                                    if team_obj:
-                                        # Update team assignment
-                                        if user.team != team_obj or force_update:
-                                            user.team = team_obj
-                                            department_obj = team_obj.department
-                                            
-                                            # Tribe comes from team automatically (via property)
-                                            # Get chapter from team's tribe's department if available
-                                            if team_obj.tribe and team_obj.tribe.department:
-                                                chapter_obj = Chapter.objects.filter(department=team_obj.tribe.department).first()
-                                            
-                                            prod_import.logger.log_operation(
-                                                "team_assignment_updated",
-                                                {"user": email, "team": team_name}
-                                            )
-                                    else:
-                                        prod_import.logger.log_operation(
-                                            "team_not_found",
-                                            {"user": email, "team": team_name},
-                                            "warning"
-                                        )
-                                
-                                elif tribe_name:
-                                    tribe_obj = Tribe.objects.filter(name=tribe_name).first()
-                                    if tribe_obj:
-                                        # Update tribe assignment (no team)
-                                        if user.team != None or force_update:
-                                            user.team = None
-                                            department_obj = tribe_obj.department
-                                            
-                                            prod_import.logger.log_operation(
-                                                "tribe_assignment_updated",
-                                                {"user": email, "tribe": tribe_name}
-                                            )
-                                    else:
-                                        prod_import.logger.log_operation(
-                                            "tribe_not_found",
-                                            {"user": email, "tribe": tribe_name},
-                                            "warning"
-                                        )
-
-                                # Set chapter assignment (PRODUCTION-SAFE: Only update, no deletion)
-                                if chapter_name:
-                                    chapter_obj = Chapter.objects.filter(name=chapter_name).first()
-                                    if chapter_obj:
-                                        if user.chapter != chapter_obj or force_update:
-                                            user.chapter = chapter_obj
-                                            prod_import.logger.log_operation(
-                                                "chapter_assignment_updated",
-                                                {"user": email, "chapter": chapter_name}
-                                            )
-                                    else:
-                                        # Create chapter if it doesn't exist
-                                        chapter_obj = Chapter.objects.create(name=chapter_name)
-                                        user.chapter = chapter_obj
-                                        prod_import.logger.log_operation(
-                                            "chapter_created_and_assigned",
-                                            {"user": email, "chapter": chapter_name}
-                                        )
-                                else:
-                                    if user.chapter is not None or force_update:
-                                        user.chapter = None  # Clear chapter if no chapter specified
-                                        prod_import.logger.log_operation(
-                                            "chapter_cleared",
-                                            {"user": email}
-                                        )
-
-                                # Update organizational fields (PRODUCTION-SAFE: Only update, no deletion)
-                                if force_update or user.department != department_obj:
-                                    user.department = department_obj  # Update department assignment
-                                    user.organization = organization
-                                    user.save(update_fields=["team", "chapter", "department", "organization"])
-                                    
-                                    prod_import.logger.log_operation(
-                                        "org_fields_updated",
-                                        {"user": email, "chapter": user.chapter.name if user.chapter else None, "department": department_obj.name if department_obj else None}
-                                    )
-
-                                # Update leader relationship (PRODUCTION-SAFE: Only update, no deletion)
-                                if leader_email:
-                                    leader = User.objects.filter(email__iexact=leader_email).first()
-                                    if leader:
-                                        if user.leader != leader or force_update:
-                                            user.leader = leader
-                                            user.save(update_fields=["leader"])
-                                            
-                                            prod_import.logger.log_operation(
-                                                "leader_assignment_updated",
-                                                {"user": email, "leader": leader_email}
-                                            )
-                                    else:
-                                        prod_import.logger.log_operation(
-                                            "leader_not_found",
-                                            {"user": email, "leader": leader_email},
-                                            "warning"
-                                        )
-
-                                # Update agile coach (PRODUCTION-SAFE: Only update, no deletion)
-                                if agile_coach_email:
-                                    agile_coach = User.objects.filter(email__iexact=agile_coach_email).first()
-                                    if agile_coach:
-                                        if user.agile_coach != agile_coach or force_update:
-                                            user.agile_coach = agile_coach
-                                            user.save(update_fields=["agile_coach"])
-                                            
-                                            prod_import.logger.log_operation(
-                                                "agile_coach_assignment_updated",
-                                                {"user": email, "agile_coach": agile_coach_email}
-                                            )
-                                    else:
-                                        prod_import.logger.log_operation(
-                                            "agile_coach_not_found",
-                                            {"user": email, "agile_coach": agile_coach_email},
-                                            "warning"
-                                        )
-
-                                # Assign roles (PRODUCTION-SAFE: Only update, no deletion)
-                                if role_name:
-                                    self._assign_user_role_prod(user, role_name, prod_import)
-
-                            except Exception as e:
-                                errors.append(f"Row {idx} (relationships): {str(e)}")
-                                prod_import.logger.log_operation(
-                                    "relationship_update_failed",
-                                    {"row": idx, "email": email, "error": str(e)},
-                                    "error"
-                                )
+                    self._import_users(rows(), prod_import, counters, dry_run=True)
+                    self._import_relationships(rows(), prod_import, counters, force_update, dry_run=True)
                     
                     # Rollback the entire atomic block for dry-run
                     transaction.set_rollback(True)
                     self.stdout.write(self.style.WARNING("Dry-run complete (no changes committed)."))
             else:
-                # For real import, use separate atomic blocks for better granularity
-                # PASS 1: Create/update all users first without relationships
-                with transaction.atomic():
-                    for idx, row in enumerate(open_csv(csv_path, encoding=encoding, delimiter=delimiter), start=2):
-                        with row_savepoint(dry_run):
-                            try:
-                                # Extract user data
-                                name = (row.get("Name") or "").strip()
-                                email = (row.get("Email") or "").strip()
-                                gmail = (row.get("Gmail") or "").strip()
-                                phone = (row.get("Phone") or "").strip() if "Phone" in row else ""
-                                role_name = (row.get("Role") or "").strip()
-
-                                if not email:
-                                    skipped += 1
-                                    prod_import.logger.log_operation(
-                                        "user_skipped",
-                                        {"row": idx, "reason": "No email provided"},
-                                        "warning"
-                                    )
-                                    continue
-
-                                # Create or get user (PRODUCTION-SAFE: No deletion)
-                                # Use case-insensitive email lookup to avoid duplicates
-                                existing_user = User.objects.filter(email__iexact=email).first()
-                                if existing_user:
-                                    # Update existing user
-                                    user = existing_user
-                                    user_created = False
-                                    user.name = name
-                                    user.gmail = gmail
-                                    user.phone = phone
-                                    user.username = email
-                                    user.is_active = True
-                                    user.save(update_fields=["name", "gmail", "phone", "username", "is_active"])
-                                else:
-                                    # Create new user
-                                    user = User.objects.create(
-                                        email=email,
-                                        name=name,
-                                        gmail=gmail,
-                                        phone=phone,
-                                        username=email,
-                                        is_active=True,
-                                    )
-                                    user_created = True
-
-                                if user_created:
-                                    created += 1
-                                    prod_import.logger.log_operation(
-                                        "user_created",
-                                        {"email": email, "name": name}
-                                    )
-                                else:
-                                    updated += 1
-                                    prod_import.logger.log_operation(
-                                        "user_updated",
-                                        {"email": email, "name": name}
-                                    )
-                                
-                                if role_name:
-                                    users_with_roles += 1
-
-                            except Exception as e:
-                                errors.append(f"Row {idx}: {str(e)}")
-                                prod_import.logger.log_operation(
-                                    "user_creation_failed",
-                                    {"row": idx, "email": email, "error": str(e)},
-                                    "error"
-                                )
-
-                # PASS 2: Set organizational assignments and relationships (PRODUCTION-SAFE)
-                with transaction.atomic():
-                    for idx, row in enumerate(open_csv(csv_path, encoding=encoding, delimiter=delimiter), start=2):
-                        with row_savepoint(dry_run):
-                            try:
-                                email = (row.get("Email") or "").strip()
-                                team_name = (row.get("Team") or "").strip()
-                                tribe_name = (row.get("Tribe") or "").strip()
-                                chapter_name = (row.get("Chapter") or "").strip()
-                                leader_email = (row.get("Leader") or "").strip()
-                                agile_coach_email = (row.get("PR") or "").strip() or (row.get("Agile Coach") or "").strip()
-                                role_name = (row.get("Role") or "").strip()
-
-                                if not email:
-                                    continue
-
-                                user = User.objects.filter(email__iexact=email).first()
-                                if not user:
-                                    prod_import.logger.log_operation(
-                                        "user_not_found",
-                                        {"email": email, "row": idx},
-                                        "warning"
-                                    )
-                                    continue
-
-                                # Update organizational assignments (PRODUCTION-SAFE: Only update, no deletion)
-                                organization = Organization.objects.first()  # Use the first organization
-                                team_obj = None
-                                tribe_obj = None
-                                chapter_obj = None
-                                department_obj = None
-
-                                if team_name:
-                                    team_obj = Team.objects.filter(name=team_name).first()
-                                    if team_obj:
-                                        # Update team assignment
-                                        if user.team != team_obj or force_update:
-                                            user.team = team_obj
-                                            department_obj = team_obj.department
-                                            
-                                            # Tribe comes from team automatically (via property)
-                                            # Get chapter from team's tribe's department if available
-                                            if team_obj.tribe and team_obj.tribe.department:
-                                                chapter_obj = Chapter.objects.filter(department=team_obj.tribe.department).first()
-                                            
-                                            prod_import.logger.log_operation(
-                                                "team_assignment_updated",
-                                                {"user": email, "team": team_name}
-                                            )
-                                    else:
-                                        prod_import.logger.log_operation(
-                                            "team_not_found",
-                                            {"user": email, "team": team_name},
-                                            "warning"
-                                        )
-                                
-                                elif tribe_name:
-                                    tribe_obj = Tribe.objects.filter(name=tribe_name).first()
-                                    if tribe_obj:
-                                        # Update tribe assignment (no team)
-                                        if user.team != None or force_update:
-                                            user.team = None
-                                            department_obj = tribe_obj.department
-                                            
-                                            prod_import.logger.log_operation(
-                                                "tribe_assignment_updated",
-                                                {"user": email, "tribe": tribe_name}
-                                            )
-                                    else:
-                                        prod_import.logger.log_operation(
-                                            "tribe_not_found",
-                                            {"user": email, "tribe": tribe_name},
-                                            "warning"
-                                        )
-
-                                # Set chapter assignment (PRODUCTION-SAFE: Only update, no deletion)
-                                if chapter_name:
-                                    chapter_obj = Chapter.objects.filter(name=chapter_name).first()
-                                    if chapter_obj:
-                                        if user.chapter != chapter_obj or force_update:
-                                            user.chapter = chapter_obj
-                                            prod_import.logger.log_operation(
-                                                "chapter_assignment_updated",
-                                                {"user": email, "chapter": chapter_name}
-                                            )
-                                    else:
-                                        # Create chapter if it doesn't exist
-                                        chapter_obj = Chapter.objects.create(name=chapter_name)
-                                        user.chapter = chapter_obj
-                                        prod_import.logger.log_operation(
-                                            "chapter_created_and_assigned",
-                                            {"user": email, "chapter": chapter_name}
-                                        )
-                                else:
-                                    if user.chapter is not None or force_update:
-                                        user.chapter = None  # Clear chapter if no chapter specified
-                                        prod_import.logger.log_operation(
-                                            "chapter_cleared",
-                                            {"user": email}
-                                        )
-
-                                # Update organizational fields (PRODUCTION-SAFE: Only update, no deletion)
-                                if force_update or user.department != department_obj:
-                                    user.department = department_obj  # Update department assignment
-                                    user.organization = organization
-                                    user.save(update_fields=["team", "chapter", "department", "organization"])
-                                    
-                                    prod_import.logger.log_operation(
-                                        "org_fields_updated",
-                                        {"user": email, "chapter": user.chapter.name if user.chapter else None, "department": department_obj.name if department_obj else None}
-                                    )
-
-                                # Update leader relationship (PRODUCTION-SAFE: Only update, no deletion)
-                                if leader_email:
-                                    leader = User.objects.filter(email__iexact=leader_email).first()
-                                    if leader:
-                                        if user.leader != leader or force_update:
-                                            user.leader = leader
-                                            user.save(update_fields=["leader"])
-                                            
-                                            prod_import.logger.log_operation(
-                                                "leader_assignment_updated",
-                                                {"user": email, "leader": leader_email}
-                                            )
-                                    else:
-                                        prod_import.logger.log_operation(
-                                            "leader_not_found",
-                                            {"user": email, "leader": leader_email},
-                                            "warning"
-                                        )
-
-                                # Update agile coach (PRODUCTION-SAFE: Only update, no deletion)
-                                if agile_coach_email:
-                                    agile_coach = User.objects.filter(email__iexact=agile_coach_email).first()
-                                    if agile_coach:
-                                        if user.agile_coach != agile_coach or force_update:
-                                            user.agile_coach = agile_coach
-                                            user.save(update_fields=["agile_coach"])
-                                            
-                                            prod_import.logger.log_operation(
-                                                "agile_coach_assignment_updated",
-                                                {"user": email, "agile_coach": agile_coach_email}
-                                            )
-                                    else:
-                                        prod_import.logger.log_operation(
-                                            "agile_coach_not_found",
-                                            {"user": email, "agile_coach": agile_coach_email},
-                                            "warning"
-                                        )
-
-                                # Assign roles (PRODUCTION-SAFE: Only update, no deletion)
-                                if role_name:
-                                    self._assign_user_role_prod(user, role_name, prod_import)
-
-                            except Exception as e:
-                                errors.append(f"Row {idx} (relationships): {str(e)}")
-                                prod_import.logger.log_operation(
-                                    "relationship_update_failed",
-                                    {"row": idx, "email": email, "error": str(e)},
-                                    "error"
-                                )
+                if workers > 1:
+                    counters.update(self._import_parallel(prod_import, workers, csv_path, encoding, delimiter, force_update))
+                else:
+                    # For real import, use separate atomic blocks for better granularity
+                    # PASS 1: Create/update all users first without relationships
+                    with transaction.atomic():
+                        self._import_users(rows(), prod_import, counters)
+
+                    # PASS 2: Set organizational assignments and relationships (PRODUCTION-SAFE)
+                    with transaction.atomic():
+                        self._import_relationships(rows(), prod_import, counters, force_update)
 
                 # Complete production import with validation
                 if validate:
                     expected_counts = {
-                        "users": created + updated,
-                        "users_with_roles": users_with_roles
+                        "users": counters["created"] + counters["updated"],
+                        "users_with_roles": counters["users_with_roles"]
                     }
                     
                     if not prod_import.complete_production_import("users", expected_counts):
@@ -533,11 +116,18 @@ class Command(BaseCommand):
                         return
 
             # Final summary
-            message = f"PRODUCTION-SAFE Users import finished. created={created}, updated={updated}, skipped={skipped}"
-            if users_with_roles > 0:
-                message += f", users_with_roles={users_with_roles}"
-            if errors:
-                message += f", errors={len(errors)}"
+            message = (
+                f"PRODUCTION-SAFE Users import finished. created={counters['created']}, "
+                f"updated={counters['updated']}, skipped={counters['skipped']}"
+            )
+            if counters["users_with_roles"] > 0:
+                message += f", users_with_roles={counters['users_with_roles']}"
+            if counters["errors"]:
+                message += f", errors={counters['errors']}"
+                errors = [
+                    entry["details"] for entry in prod_import.logger.operations_log
+                    if entry["operation"] in ("user_creation_failed", "relationship_update_failed")
+                ]
                 self.stdout.write(self.style.WARNING(f"Errors encountered: {errors}"))
             
             self.stdout.write(self.style.SUCCESS(message))
@@ -563,6 +153,297 @@ class Command(BaseCommand):
             
             raise CommandError(f"Production import failed: {str(e)}")
 
+    def _import_parallel(self, prod_import, workers, csv_path, encoding, delimiter, force_update):
+        """Run both passes partitioned by email, one process and transaction per partition.
+
+        User rows and org assignments only touch the partition's own users. Chapters are
+        created up front, and leaders and roles are applied here afterwards: they rewrite
+        leadership-closure rows, org/tribe role holders and committees shared across
+        partitions, which concurrent writers would race on.
+        """
+        def rows():
+            return enumerate(open_csv(csv_path, encoding=encoding, delimiter=delimiter), start=2)
+
+        counters = Counter()
+        # PASS 1: Create/update all users first without relationships
+        self._run_partitions(prod_import, counters, _import_users_partition, workers, csv_path, encoding, delimiter)
+
+        # PASS 2: Org assignments per partition, then leaders and roles with a single writer
+        with transaction.atomic():
+            self._create_missing_chapters(rows(), prod_import)
+        self._run_partitions(
+            prod_import, counters, _import_assignments_partition, workers, csv_path, encoding, delimiter, force_update
+        )
+        with transaction.atomic():
+            self._import_relationships(rows(), prod_import, counters, force_update, assignments=False)
+        return counters
+
+    def _run_partitions(self, prod_import, counters, worker, workers, *args):
+        results = run_partitioned_import(worker, workers, *args)
+        counters.update(prod_import.merge_partitions(results))
+        failed = [result for result in results if result.error]
+        if failed:
+            for result in failed:
+                self.stdout.write(self.style.ERROR(f"Partition {result.partition} rolled back: {result.error}"))
+            raise CommandError(f"{len(failed)} of {workers} partitions failed; the others were committed")
+
+    def _create_missing_chapters(self, rows, prod_import):
+        """Create the chapters the CSV names, so parallel partitions never create the same one."""
+        names = {(row.get("Chapter") or "").strip() for _, row in rows if (row.get("Email") or "").strip()}
+        names.discard("")
+        existing = set(Chapter.objects.filter(name__in=names).values_list("name", flat=True))
+        for chapter_name in sorted(names - existing):
+            Chapter.objects.create(name=chapter_name)
+            prod_import.logger.log_operation(
+                "chapter_created",
+                {"chapter": chapter_name}
+            )
+
+    def _import_users(self, rows, prod_import, counters, dry_run=False):
+        """PASS 1: Create/update all users first without relationships."""
+        for idx, row in rows:
+            with row_savepoint(dry_run):
+                try:
+                    self._import_user_row(idx, row, prod_import, counters)
+                except Exception as e:
+                    counters["errors"] += 1
+                    prod_import.logger.log_operation(
+                        "user_creation_failed",
+                        {"row": idx, "email": (row.get("Email") or "").strip(), "error": str(e)},
+                        "error"
+                    )
+
+    def _import_user_row(self, idx, row, prod_import, counters):
+        # Extract user data
+        name = (row.get("Name") or "").strip()
+        email = (row.get("Email") or "").strip()
+        gmail = (row.get("Gmail") or "").strip()
+        phone = (row.get("Phone") or "").strip() if "Phone" in row else ""
+        role_name = (row.get("Role") or "").strip()
+
+        if not email:
+            counters["skipped"] += 1
+            prod_import.logger.log_operation(
+                "user_skipped",
+                {"row": idx, "reason": "No email provided"},
+                "warning"
+            )
+            return
+
+        # Create or get user (PRODUCTION-SAFE: No deletion)
+        # Use case-insensitive email lookup to avoid duplicates
+        existing_user = User.objects.filter(email__iexact=email).first()
+        if existing_user:
+            # Update existing user
+            user = existing_user
+            user.name = name
+            user.gmail = gmail
+            user.phone = phone
+            user.username = email
+            user.is_active = True
+            user.save(update_fields=["name", "gmail", "phone", "username", "is_active"])
+            counters["updated"] += 1
+            prod_import.logger.log_operation(
+                "user_updated",
+                {"email": email, "name": name}
+            )
+        else:
+            # Create new user
+            User.objects.create(
+                email=email,
+                name=name,
+                gmail=gmail,
+                phone=phone,
+                username=email,
+                is_active=True,
+            )
+            counters["created"] += 1
+            prod_import.logger.log_operation(
+                "user_created",
+                {"email": email, "name": name}
+            )
+
+        if role_name:
+            counters["users_with_roles"] += 1
+
+    def _import_relationships(self, rows, prod_import, counters, force_update, dry_run=False,
+                              assignments=True, leaders=True):
+        """PASS 2: Set organizational assignments (team, chapter, agile coach) and/or leaders and roles."""
+        for idx, row in rows:
+            with row_savepoint(dry_run):
+                try:
+                    email = (row.get("Email") or "").strip()
+                    if not email:
+                        continue
+
+                    user = User.objects.filter(email__iexact=email).first()
+                    if not user:
+                        prod_import.logger.log_operation(
+                            "user_not_found",
+                            {"email": email, "row": idx},
+                            "warning"
+                        )
+                        continue
+
+                    if assignments:
+                        self._update_org_assignments(row, user, prod_import, force_update)
+                    if leaders:
+                        self._update_leader(row, user, prod_import, force_update)
+                    if assignments:
+                        self._update_agile_coach(row, user, prod_import, force_update)
+
+                    # Assign roles (PRODUCTION-SAFE: Only update, no deletion)
+                    role_name = (row.get("Role") or "").strip()
+                    if leaders and role_name:
+                        self._assign_user_role_prod(user, role_name, prod_import)
+
+                except Exception as e:
+                    counters["errors"] += 1
+                    prod_import.logger.log_operation(
+                        "relationship_update_failed",
+                        {"row": idx, "email": (row.get("Email") or "").strip(), "error": str(e)},
+                        "error"
+                    )
+
+    def _update_org_assignments(self, row, user, prod_import, force_update):
+        email = (row.get("Email") or "").strip()
+        team_name = (row.get("Team") or "").strip()
+        tribe_name = (row.get("Tribe") or "").strip()
+        chapter_name = (row.get("Chapter") or "").strip()
+
+        # Update organizational assignments (PRODUCTION-SAFE: Only update, no deletion)
+        organization = Organization.objects.first()  # Use the first organization
+        team_obj = None
+        tribe_obj = None
+        chapter_obj = None
+        department_obj = None
+
+        if team_name:
+            team_obj = Team.objects.filter(name=team_name).first()
+            if team_obj:
+                # Update team assignment
+                if user.team != team_obj or force_update:
+                    user.team = team_obj
+                    department_obj = team_obj.department
+
+                    # Tribe comes from team automatically (via property)
+                    # Get chapter from team's tribe's department if available
+                    if team_obj.tribe and team_obj.tribe.department:
+                        chapter_obj = Chapter.objects.filter(department=team_obj.tribe.department).first()
+
+                    prod_import.logger.log_operation(
+                        "team_assignment_updated",
+                        {"user": email, "team": team_name}
+                    )
+            else:
+                prod_import.logger.log_operation(
+                    "team_not_found",
+                    {"user": email, "team": team_name},
+                    "warning"
+                )
+
+        elif tribe_name:
+            tribe_obj = Tribe.objects.filter(name=tribe_name).first()
+            if tribe_obj:
+                # Update tribe assignment (no team)
+                if user.team != None or force_update:
+                    user.team = None
+                    department_obj = tribe_obj.department
+
+                    prod_import.logger.log_operation(
+                        "tribe_assignment_updated",
+                        {"user": email, "tribe": tribe_name}
+                    )
+            else:
+                prod_import.logger.log_operation(
+                    "tribe_not_found",
+                    {"user": email, "tribe": tribe_name},
+                    "warning"
+                )
+
+        # Set chapter assignment (PRODUCTION-SAFE: Only update, no deletion)
+        if chapter_name:
+            chapter_obj = Chapter.objects.filter(name=chapter_name).first()
+            if chapter_obj:
+                if user.chapter != chapter_obj or force_update:
+                    user.chapter = chapter_obj
+                    prod_import.logger.log_operation(
+                        "chapter_assignment_updated",
+                        {"user": email, "chapter": chapter_name}
+                    )
+            else:
+                # Create chapter if it doesn't exist
+                chapter_obj = Chapter.objects.create(name=chapter_name)
+                user.chapter = chapter_obj
+                prod_import.logger.log_operation(
+                    "chapter_created_and_assigned",
+                    {"user": email, "chapter": chapter_name}
+                )
+        else:
+            if user.chapter is not None or force_update:
+                user.chapter = None  # Clear chapter if no chapter specified
+                prod_import.logger.log_operation(
+                    "chapter_cleared",
+                    {"user": email}
+                )
+
+        # Update organizational fields (PRODUCTION-SAFE: Only update, no deletion)
+        if force_update or user.department != department_obj:
+            user.department = department_obj  # Update department assignment
+            user.organization = organization
+            user.save(update_fields=["team", "chapter", "department", "organization"])
+
+            prod_import.logger.log_operation(
+                "org_fields_updated",
+                {"user": email, "chapter": user.chapter.name if user.chapter else None, "department": department_obj.name if department_obj else None}
+            )
+
+    def _update_leader(self, row, user, prod_import, force_update):
+        email = (row.get("Email") or "").strip()
+        leader_email = (row.get("Leader") or "").strip()
+
+        # Update leader relationship (PRODUCTION-SAFE: Only update, no deletion)
+        if leader_email:
+            leader = User.objects.filter(email__iexact=leader_email).first()
+            if leader:
+                if user.leader != leader or force_update:
+                    user.leader = leader
+                    user.save(update_fields=["leader"])
+
+                    prod_import.logger.log_operation(
+                        "leader_assignment_updated",
+                        {"user": email, "leader": leader_email}
+                    )
+            else:
+                prod_import.logger.log_operation(
+                    "leader_not_found",
+                    {"user": email, "leader": leader_email},
+                    "warning"
+                )
+
+    def _update_agile_coach(self, row, user, prod_import, force_update):
+        email = (row.get("Email") or "").strip()
+        agile_coach_email = (row.get("PR") or "").strip() or (row.get("Agile Coach") or "").strip()
+
+        # Update agile coach (PRODUCTION-SAFE: Only update, no deletion)
+        if agile_coach_email:
+            agile_coach = User.objects.filter(email__iexact=agile_coach_email).first()
+            if agile_coach:
+                if user.agile_coach != agile_coach or force_update:
+                    user.agile_coach = agile_coach
+                    user.save(update_fields=["agile_coach"])
+
+                    prod_import.logger.log_operation(
+                        "agile_coach_assignment_updated",
+                        {"user": email, "agile_coach": agile_coach_email}
+                    )
+            else:
+                prod_import.logger.log_operation(
+                    "agile_coach_not_found",
+                    {"user": email, "agile_coach": agile_coach_email},
+                    "warning"
+                )
+
     def _assign_user_role_prod(self, user, role_name, prod_import):
         """PRODUCTION-SAFE: Assign a role to a user by setting them as the role holder on appropriate organizational entities."""
         from api.models.organization import Organization, Tribe
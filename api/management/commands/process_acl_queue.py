@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from api.services.acl_queue import ACL_QUEUE_BATCH_SIZE, process_acl_queue
+
+
+class Command(BaseCommand):
+    help = "Applies queued NoteUserAccess recomputations (see ACL_RECOMPUTE_DEFERRED)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=ACL_QUEUE_BATCH_SIZE,
+                            help="Queue rows claimed per transaction")
+
+    def handle(self, *args, **options):
+        processed = process_acl_queue(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} queued access recomputations"))
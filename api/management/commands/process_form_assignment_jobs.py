@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from api.services.form_assignment import (
+    FORM_ASSIGNMENT_BATCH_SIZE,
+    FORM_ASSIGNMENT_STALE_AFTER,
+    process_form_assignment_jobs,
+)
+
+
+class Command(BaseCommand):
+    help = "Runs pending and interrupted default-form assignment jobs (see FormAssignmentJob)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=FORM_ASSIGNMENT_BATCH_SIZE,
+                            help="Assignments inserted per transaction")
+        parser.add_argument("--stale-after", type=int, default=int(FORM_ASSIGNMENT_STALE_AFTER.total_seconds() // 60),
+                            help="Minutes without progress after which a running job is run again")
+
+    def handle(self, *args, **options):
+        processed = process_form_assignment_jobs(
+            batch_size=options["batch_size"], stale_after=timedelta(minutes=options["stale_after"])
+        )
+        self.stdout.write(self.style.SUCCESS(f"Ran {processed} pending form assignment jobs"))
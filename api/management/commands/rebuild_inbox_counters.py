@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from api.models import User
+from api.services.inbox import refresh_inbox_counters
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the InboxCounter rows served by /inbox/summary/"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--email", type=str, help="Only rebuild the counters of this user")
+
+    def handle(self, *args, **options):
+        users = User.objects.all()
+        if options["email"]:
+            users = users.filter(email=options["email"])
+        written = refresh_inbox_counters(users.values_list("pk", flat=True))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt inbox counters for {written} users"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.services.leadership import rebuild_leadership_closure
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the LeadershipClosure table from User.leader"
+
+    def handle(self, *args, **options):
+        written = rebuild_leadership_closure()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt leadership closure with {written} rows"))
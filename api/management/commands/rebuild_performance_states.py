@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from api.models import User
+from api.services.performance_tables import refresh_performance_states
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the UserPerformanceState projection used by the personnel performance table"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--email", type=str, help="Only rebuild the row for this user")
+
+    def handle(self, *args, **options):
+        users = User.objects.all()
+        if options["email"]:
+            users = users.filter(email=options["email"])
+        written = refresh_performance_states(users.values_list("pk", flat=True))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt performance state for {written} users"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from api.models import User
+from api.services.user_classification import refresh_user_classifications
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the UserClassification rows used by the tech/product/finance visibility rules"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--email", type=str, help="Only rebuild the row for this user")
+
+    def handle(self, *args, **options):
+        users = User.objects.all()
+        if options["email"]:
+            users = users.filter(email=options["email"])
+        written = refresh_user_classifications(users.values_list("pk", flat=True))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt classification for {written} users"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from api.services.dashboard_stats import compute_dashboard_stats, refresh_dashboard_stats
+
+
+class Command(BaseCommand):
+    help = "Stores a new admin dashboard statistics snapshot (see DashboardStats); meant to run periodically"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--incremental", action="store_true",
+                            help="Only read rows created since the latest snapshot instead of recounting")
+
+    def handle(self, *args, **options):
+        if options["incremental"]:
+            stats = refresh_dashboard_stats()
+        else:
+            stats = compute_dashboard_stats()
+        self.stdout.write(self.style.SUCCESS(f"Stored dashboard statistics snapshot {stats.pk}"))
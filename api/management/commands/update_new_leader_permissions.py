@@ -6,6 +6,7 @@ from django.contrib.auth import get_user_model
 
 from api.models import Note
 from api.models import Note, NoteUserAccess, User
+from api.services.leadership import refresh_leadership_closure
 
 
 User = get_user_model()
@@ -30,7 +31,10 @@ class Command(BaseCommand):
         new_email = options["new_email"]
         former_leader = User.objects.get(email=former_email)
         new_leader = User.objects.get(email=new_email)
-        User.objects.filter(leader=former_leader).update(leader=new_leader)
+        moved_ids = list(User.objects.filter(leader=former_leader).values_list("pk", flat=True))
+        User.objects.filter(pk__in=moved_ids).update(leader=new_leader)
+        # .update() bypasses User.save, so keep the leadership closure in sync here
+        refresh_leadership_closure(moved_ids)
         NoteUserAccess.objects.filter(user=former_leader) \
             .exclude(note__owner=former_leader) \
                 .update(
@@ -0,0 +1,146 @@
+import json
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from django.db import connections
+
+__all__ = [
+    "RequestMetrics",
+    "RequestMetricsMiddleware",
+    "current_request_metrics",
+    "timed_serializer",
+]
+
+
+logger = logging.getLogger("api.metrics")
+
+_current_metrics: ContextVar[Optional["RequestMetrics"]] = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """SQL query count, DB time and serializer time collected for one request.
+
+    Installed as a ``connection.execute_wrapper`` so every query of the request is counted.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.total_time = 0.0
+        self.view_name: Optional[str] = None
+        self.query_budget: Optional[int] = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+    @property
+    def python_time(self) -> float:
+        return max(self.total_time - self.db_time - self.serializer_time, 0.0)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.query_budget is not None and self.queries > self.query_budget
+
+    def server_timing(self) -> str:
+        return ", ".join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f"serializer;dur={self.serializer_time * 1000:.1f}",
+            f"app;dur={self.python_time * 1000:.1f}",
+            f"total;dur={self.total_time * 1000:.1f}",
+        ])
+
+
+def current_request_metrics() -> Optional[RequestMetrics]:
+    return _current_metrics.get()
+
+
+@contextmanager
+def timed_serializer():
+    """Count the enclosed block as serializer time; queries it runs stay under DB time."""
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    started, db_before = time.perf_counter(), metrics.db_time
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.serializer_time += max(elapsed - (metrics.db_time - db_before), 0.0)
+
+
+def _view_query_budget(request, view_func) -> Optional[int]:
+    """``query_budget`` declared on the view class; a dict is keyed by viewset action."""
+    budget = getattr(getattr(view_func, "cls", None), "query_budget", None)
+    if isinstance(budget, dict):
+        action = (getattr(view_func, "actions", None) or {}).get(request.method.lower())
+        budget = budget.get(action)
+    return budget
+
+
+class RequestMetricsMiddleware:
+    """Adds a ``Server-Timing`` header and an ``api.metrics`` log line to every response.
+
+    Views opt into a query budget with QueryBudgetMixin; requests over budget are logged as
+    warnings. The collected RequestMetrics is also attached to the response as
+    ``response.request_metrics`` for tests. Queries run while a streaming response is
+    consumed happen after this middleware returns and are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        metrics.total_time = time.perf_counter() - started
+
+        response["Server-Timing"] = metrics.server_timing()
+        response.request_metrics = metrics
+        self._log(request, response, metrics)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current_metrics.get()
+        if metrics is None:
+            return None
+        view_class = getattr(view_func, "cls", None)
+        metrics.view_name = view_class.__name__ if view_class else getattr(view_func, "__name__", None)
+        metrics.query_budget = _view_query_budget(request, view_func)
+        return None
+
+    @staticmethod
+    def _log(request, response, metrics: RequestMetrics):
+        level = logging.WARNING if metrics.over_budget else logging.INFO
+        if not logger.isEnabledFor(level):
+            return
+        logger.log(level, json.dumps({
+            "event": "query_budget_exceeded" if metrics.over_budget else "request_metrics",
+            "method": request.method,
+            "path": request.path,
+            "view": metrics.view_name,
+            "status": response.status_code,
+            "queries": metrics.queries,
+            "query_budget": metrics.query_budget,
+            "db_ms": round(metrics.db_time * 1000, 1),
+            "serializer_ms": round(metrics.serializer_time * 1000, 1),
+            "python_ms": round(metrics.python_time * 1000, 1),
+            "total_ms": round(metrics.total_time * 1000, 1),
+        }))
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.1 on 2026-10-18 02:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0068_summary_seniority_level'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserPerformanceState',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='performance_state', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('is_mapped', models.BooleanField(default=False)),
+                ('last_committee_date', models.DateField(blank=True, null=True)),
+                ('committees_by_year', models.JSONField(blank=True, default=dict)),
+                ('last_bonus_date', models.DateField(blank=True, null=True)),
+                ('last_bonus_percentage', models.FloatField(blank=True, null=True)),
+                ('last_salary_change_date', models.DateField(blank=True, null=True)),
+                ('stale_after', models.DateField(blank=True, db_index=True, null=True)),
+                ('computed_on', models.DateField()),
+                ('date_updated', models.DateTimeField(auto_now=True)),
+                ('latest_comp', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.compensationsnapshot')),
+                ('latest_org', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.orgassignmentsnapshot')),
+                ('latest_seniority', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.senioritysnapshot')),
+            ],
+            options={
+                'verbose_name': 'وضعیت فعلی عملکرد کاربر',
+                'verbose_name_plural': 'وضعیت\u200cهای فعلی عملکرد کاربران',
+            },
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.0.1 on 2026-10-18 02:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_leadership_closure(apps, schema_editor):
+    User = apps.get_model("api", "User")
+    LeadershipClosure = apps.get_model("api", "LeadershipClosure")
+    leader_map = dict(User.objects.values_list("pk", "leader_id"))
+    rows = []
+    for user_id in leader_map:
+        visited = set()
+        current = leader_map.get(user_id)
+        depth = 1
+        while current is not None and current not in visited:
+            rows.append(
+                LeadershipClosure(
+                    ancestor_id=current, descendant_id=user_id, depth=depth
+                )
+            )
+            visited.add(current)
+            current = leader_map.get(current)
+            depth += 1
+    LeadershipClosure.objects.bulk_create(rows, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0069_userperformancestate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeadershipClosure",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("depth", models.PositiveSmallIntegerField()),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="descendant_links",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "descendant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ancestor_links",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "زنجیره رهبری",
+                "verbose_name_plural": "زنجیره\u200cهای رهبری",
+                "indexes": [
+                    models.Index(
+                        fields=["descendant", "depth"],
+                        name="api_leaders_descend_4f6d6b_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="leadershipclosure",
+            constraint=models.UniqueConstraint(
+                fields=("ancestor", "descendant"), name="unique_leadership_closure_pair"
+            ),
+        ),
+        migrations.RunPython(build_leadership_closure, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.0.1 on 2026-10-18 02:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0070_leadershipclosure"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NoteAccessRecompute",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date_created", models.DateTimeField(auto_now_add=True)),
+                (
+                    "note",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="api.note",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "بازمحاسبه دسترسی",
+                "verbose_name_plural": "بازمحاسبه\u200cهای دسترسی",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="noteaccessrecompute",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("note__isnull", False)),
+                fields=("note",),
+                name="unique_pending_note_access_recompute",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="noteaccessrecompute",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("user__isnull", False)),
+                fields=("user",),
+                name="unique_pending_user_access_recompute",
+            ),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0071_noteaccessrecompute"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserClassification",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="classification",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "ladder_category",
+                    models.CharField(
+                        choices=[
+                            ("TECH", "فنی"),
+                            ("PRODUCT", "محصول"),
+                            ("OTHER", "سایر"),
+                        ],
+                        db_index=True,
+                        default="OTHER",
+                        max_length=16,
+                        verbose_name="دسته لدر",
+                    ),
+                ),
+                (
+                    "is_technical",
+                    models.BooleanField(
+                        db_index=True, default=False, verbose_name="فنی"
+                    ),
+                ),
+                (
+                    "is_product",
+                    models.BooleanField(
+                        db_index=True, default=False, verbose_name="محصول"
+                    ),
+                ),
+                (
+                    "is_finance",
+                    models.BooleanField(
+                        db_index=True, default=False, verbose_name="مالی"
+                    ),
+                ),
+                ("date_updated", models.DateTimeField(auto_now=True)),
+                (
+                    "latest_ladder",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="api.ladder",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "دسته\u200cبندی کاربر",
+                "verbose_name_plural": "دسته\u200cبندی\u200cهای کاربران",
+            },
+        ),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:32
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0072_userclassification"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FormAssignmentJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "uuid",
+                    models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+                ),
+                (
+                    "date_created",
+                    models.DateTimeField(
+                        auto_now_add=True, null=True, verbose_name="تاریخ ساخت"
+                    ),
+                ),
+                (
+                    "date_updated",
+                    models.DateTimeField(
+                        auto_now=True, null=True, verbose_name="تاریخ بروزرسانی"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "در انتظار"),
+                            ("RUNNING", "در حال اجرا"),
+                            ("DONE", "انجام\u200cشده"),
+                            ("FAILED", "ناموفق"),
+                        ],
+                        default="PENDING",
+                        max_length=16,
+                        verbose_name="وضعیت",
+                    ),
+                ),
+                (
+                    "total",
+                    models.PositiveIntegerField(default=0, verbose_name="تعداد کل"),
+                ),
+                (
+                    "assigned",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="تخصیص\u200cداده\u200cشده"
+                    ),
+                ),
+                ("error", models.TextField(blank=True, verbose_name="خطا")),
+                (
+                    "started_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="زمان شروع"
+                    ),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="زمان پایان"
+                    ),
+                ),
+                (
+                    "form",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="assignment_jobs",
+                        to="api.form",
+                        verbose_name="فرم",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "تخصیص خودکار فرم",
+                "verbose_name_plural": "تخصیص\u200cهای خودکار فرم",
+                "ordering": ("-date_created",),
+            },
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:38
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0073_formassignmentjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DashboardStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "uuid",
+                    models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+                ),
+                (
+                    "date_created",
+                    models.DateTimeField(
+                        auto_now_add=True, null=True, verbose_name="تاریخ ساخت"
+                    ),
+                ),
+                (
+                    "date_updated",
+                    models.DateTimeField(
+                        auto_now=True, null=True, verbose_name="تاریخ بروزرسانی"
+                    ),
+                ),
+                ("metrics", models.JSONField(default=dict, verbose_name="آمار")),
+                (
+                    "watermarks",
+                    models.JSONField(
+                        blank=True, default=dict, verbose_name="نشانگرهای زمانی"
+                    ),
+                ),
+                (
+                    "is_incremental",
+                    models.BooleanField(default=False, verbose_name="محاسبه افزایشی"),
+                ),
+            ],
+            options={
+                "verbose_name": "آمار داشبورد",
+                "verbose_name_plural": "آمار داشبورد",
+                "ordering": ("-date_created",),
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0074_dashboardstats"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="noteuseraccess",
+            index=models.Index(
+                fields=["user", "can_view", "note"],
+                name="noteaccess_user_view_note_idx",
+            ),
+        ),
+    ]
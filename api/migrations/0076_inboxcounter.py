@@ -0,0 +1,76 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:45
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0075_noteuseraccess_visibility_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InboxCounter",
+            fields=[
+                (
+                    "uuid",
+                    models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+                ),
+                (
+                    "date_created",
+                    models.DateTimeField(
+                        auto_now_add=True, null=True, verbose_name="تاریخ ساخت"
+                    ),
+                ),
+                (
+                    "date_updated",
+                    models.DateTimeField(
+                        auto_now=True, null=True, verbose_name="تاریخ بروزرسانی"
+                    ),
+                ),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="inbox_counter",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="کاربر",
+                    ),
+                ),
+                (
+                    "unread_mentions",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="منشن\u200cهای خوانده\u200cنشده"
+                    ),
+                ),
+                (
+                    "unread_feedback",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="بازخوردهای خوانده\u200cنشده"
+                    ),
+                ),
+                (
+                    "unread_one_on_ones",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="۱×۱های خوانده\u200cنشده"
+                    ),
+                ),
+                (
+                    "pending_feedback_requests",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="درخواست\u200cهای بازخورد در انتظار"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "شمارنده صندوق",
+                "verbose_name_plural": "شمارنده\u200cهای صندوق",
+            },
+        ),
+    ]
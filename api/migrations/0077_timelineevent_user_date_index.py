@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0076_inboxcounter"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="timelineevent",
+            index=models.Index(
+                fields=["user", "effective_date", "date_created"],
+                name="timeline_user_date_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.1 on 2026-10-18 04:35
+
+import time
+
+from django.db import migrations, models
+
+
+def create_org_structure_version(apps, schema_editor):
+    OrgStructureVersion = apps.get_model("api", "OrgStructureVersion")
+    OrgStructureVersion.objects.get_or_create(pk=1, defaults={"version": time.time_ns()})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0077_timelineevent_user_date_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrgStructureVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.BigIntegerField(default=0, verbose_name="نسخه")),
+                (
+                    "date_updated",
+                    models.DateTimeField(auto_now=True, verbose_name="تاریخ بروزرسانی"),
+                ),
+            ],
+            options={
+                "verbose_name": "نسخه ساختار سازمانی",
+                "verbose_name_plural": "نسخه ساختار سازمانی",
+            },
+        ),
+        migrations.RunPython(create_org_structure_version, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,19 @@
+from django.conf import settings
 from django.contrib.auth.hashers import make_password, check_password
+from django.core.cache import cache
 from django.db import models
 from django.utils import timezone
+import hashlib
+import hmac
 import secrets
 
 from api.models.base import MerlinBaseModel
 
 __all__ = ["ApiKey"]
 
+VERIFIED_KEY_CACHE_PREFIX = "apikey:verified"
+LAST_USED_CACHE_PREFIX = "apikey:last_used"
+
 
 class ApiKey(MerlinBaseModel):
     """API Key for service account authentication.
@@ -66,16 +73,61 @@ class ApiKey(MerlinBaseModel):
         self.key_hash = make_password(key)
         self.key_prefix = key[:12] if len(key) >= 12 else key
 
+    @staticmethod
+    def verified_cache_key(key: str) -> str:
+        """Cache key of a verified key: an HMAC of the key, never the key itself."""
+        digest = hmac.new(
+            settings.SECRET_KEY.encode(), key.encode(), hashlib.sha256
+        ).hexdigest()
+        return f"{VERIFIED_KEY_CACHE_PREFIX}:{digest}"
+
     def verify_key(self, key: str) -> bool:
-        """Verify if the provided key matches this API key."""
+        """Verify if the provided key matches this API key.
+
+        A successful check_password is cached against the current key_hash, so later
+        requests skip the password hasher. Deactivating or rotating the key (set_key)
+        invalidates the cached entry immediately.
+        """
         if not self.is_active:
             return False
-        return check_password(key, self.key_hash)
+        cache_key = self.verified_cache_key(key)
+        if cache.get(cache_key) == (self.pk, self.key_hash):
+            return True
+        if not check_password(key, self.key_hash):
+            return False
+        cache.set(
+            cache_key,
+            (self.pk, self.key_hash),
+            getattr(settings, "API_KEY_CACHE_TIMEOUT", 300),
+        )
+        return True
+
+    @classmethod
+    def get_for_key(cls, key: str):
+        """Active ApiKey (with its user) matching the plain *key*, or None."""
+        cached = cache.get(cls.verified_cache_key(key))
+        if cached is not None:
+            candidates = cls.objects.filter(pk=cached[0], is_active=True)
+        else:
+            candidates = cls.objects.filter(key_prefix=key[:12], is_active=True)
+        for api_key in candidates.select_related("user"):
+            if api_key.verify_key(key):
+                return api_key
+        return None
 
     def record_usage(self):
-        """Record that this key was used (updates last_used timestamp)."""
+        """Record that this key was used (updates last_used timestamp).
+
+        The row is written at most once per ``API_KEY_LAST_USED_INTERVAL`` seconds per
+        key, so last_used is accurate to that interval.
+        """
         self.last_used = timezone.now()
-        self.save(update_fields=["last_used"])
+        if cache.add(
+            f"{LAST_USED_CACHE_PREFIX}:{self.pk}",
+            True,
+            getattr(settings, "API_KEY_LAST_USED_INTERVAL", 60),
+        ):
+            ApiKey.objects.filter(pk=self.pk).update(last_used=self.last_used)
 
     @classmethod
     def generate_key(cls) -> str:
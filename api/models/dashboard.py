@@ -0,0 +1,22 @@
+from django.db import models
+
+from api.models.base import MerlinBaseModel
+
+__all__ = ['DashboardStats']
+
+
+class DashboardStats(MerlinBaseModel):
+    """Snapshot of the admin dashboard metrics (see api.services.dashboard_stats)."""
+
+    metrics = models.JSONField(default=dict, verbose_name="آمار")
+    # Per counted model, the newest date_created already included in the totals
+    watermarks = models.JSONField(default=dict, blank=True, verbose_name="نشانگرهای زمانی")
+    is_incremental = models.BooleanField(default=False, verbose_name="محاسبه افزایشی")
+
+    class Meta:
+        verbose_name = "آمار داشبورد"
+        verbose_name_plural = "آمار داشبورد"
+        ordering = ("-date_created",)
+
+    def __str__(self):
+        return f"DashboardStats @ {self.date_created:%Y-%m-%d %H:%M}"
@@ -6,7 +6,7 @@ from api.models.base import MerlinBaseModel
 from api.models.user import User
 from api.models.cycle import Cycle
 
-__all__ = ['Form', 'Question', 'FormResponse', 'FormAssignment']
+__all__ = ['Form', 'Question', 'FormResponse', 'FormAssignment', 'FormAssignmentJob']
 
 class Form(MerlinBaseModel):
     class FormType(models.TextChoices):
@@ -88,3 +88,29 @@ class FormAssignment(MerlinBaseModel):
     def __str__(self):
         return f"{self.form.name} assigned to {self.assigned_to}"
 
+
+
+class FormAssignmentJob(MerlinBaseModel):
+    """Progress of the automatic assignment of a default form (see api.services.form_assignment)."""
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "در انتظار"
+        RUNNING = "RUNNING", "در حال اجرا"
+        DONE = "DONE", "انجام‌شده"
+        FAILED = "FAILED", "ناموفق"
+
+    form = models.ForeignKey(Form, on_delete=models.CASCADE, related_name="assignment_jobs", verbose_name="فرم")
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING, verbose_name="وضعیت")
+    total = models.PositiveIntegerField(default=0, verbose_name="تعداد کل")
+    assigned = models.PositiveIntegerField(default=0, verbose_name="تخصیص‌داده‌شده")
+    error = models.TextField(blank=True, verbose_name="خطا")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="زمان شروع")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="زمان پایان")
+
+    class Meta:
+        verbose_name = "تخصیص خودکار فرم"
+        verbose_name_plural = "تخصیص‌های خودکار فرم"
+        ordering = ("-date_created",)
+
+    def __str__(self):
+        return f"{self.form.name}: {self.assigned}/{self.total} ({self.get_status_display()})"
@@ -1,4 +1,7 @@
+from collections import defaultdict
+
 from django.db import models, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from .base import MerlinBaseModel
@@ -8,7 +11,7 @@ from api.models import (Cycle,
                         ValueSection,
                         )
 
-__all__ = ['NoteType', 'ProposalType', 'NoteSubmitStatus', 'SummarySubmitStatus', 'Note', 'Comment', 'Feedback', 'FeedbackForm', 'FeedbackRequest', 'FeedbackRequestUserLink', 'FeedbackTagLink', 'Summary', 'NoteUserAccess', 'Vibe',
+__all__ = ['NoteType', 'ProposalType', 'NoteSubmitStatus', 'SummarySubmitStatus', 'Note', 'Comment', 'Feedback', 'FeedbackForm', 'FeedbackRequest', 'FeedbackRequestUserLink', 'FeedbackTagLink', 'Summary', 'NoteUserAccess', 'NoteAccessRecompute', 'InboxCounter', 'Vibe',
            'OneOnOne', 'OneOnOneTagLink', 'leader_permissions', 'committee_roles_permissions']
 
 class NoteType(models.TextChoices):
@@ -245,14 +248,30 @@ class NoteUserAccess(MerlinBaseModel):
             "user",
             "note",
         )
+        indexes = [
+            # Covers the visibility EXISTS of get_notes_visible_to (index-only scan)
+            models.Index(fields=["user", "can_view", "note"], name="noteaccess_user_view_note_idx"),
+        ]
         verbose_name = "دسترسی"
         verbose_name_plural = "دسترسی‌ها"
 
+    ACCESS_FLAGS = (
+        "can_view",
+        "can_edit",
+        "can_view_summary",
+        "can_write_summary",
+        "can_view_feedbacks",
+        "can_write_feedback",
+    )
+
     def __str__(self):
         return f"{self.user} - {self.note}"
 
     @classmethod
     def make_note_inaccessible_if_not(cls, user, note):
+        from api.services.inbox import mark_inbox_dirty
+
+        mark_inbox_dirty([user.pk])
         cls.objects.filter(user=user, note=note).update(
             **{
                 "can_view": False,
@@ -266,90 +285,206 @@ class NoteUserAccess(MerlinBaseModel):
 
     @classmethod
     def ensure_note_predefined_accesses(cls, note):
-        
-        if note.type == NoteType.ONE_ON_ONE:
-            return
-        
-        # FEEDBACK and FEEDBACK_REQUEST notes have explicit access control
-        # managed by dedicated service functions (grant_feedback_access, grant_feedback_request_access)
-        if note.type in [NoteType.FEEDBACK, NoteType.FEEDBACK_REQUEST]:
+        cls.ensure_notes_predefined_accesses([note])
+
+    @classmethod
+    def ensure_notes_predefined_accesses(cls, notes):
+        """
+        Batch version of ensure_note_predefined_accesses.
+
+        The desired rows of every note are computed in memory, existing rows are read with a
+        single query and only the difference is written (one bulk insert, one bulk update).
+        As with the previous per-row update_or_create calls, rows are never removed and a later
+        grant for the same user overrides an earlier one (mention > committee > coach > leader > owner).
+        """
+        # ONE_ON_ONE, FEEDBACK and FEEDBACK_REQUEST notes have explicit access control
+        # managed by dedicated service functions (grant_oneonone_access, grant_feedback_access, ...)
+        notes = [
+            note for note in notes
+            if note.type not in (NoteType.ONE_ON_ONE, NoteType.FEEDBACK, NoteType.FEEDBACK_REQUEST)
+        ]
+        if not notes:
             return
-        
-        # Owner
-        cls.objects.update_or_create(
-            user=note.owner,
-            note=note,
-            defaults={
+
+        from api.services.inbox import mark_inbox_dirty
+
+        desired = cls._predefined_accesses(notes)
+        existing = {
+            (row.note_id, row.user_id): row
+            for row in cls.objects.filter(note__in=notes).only("pk", "note_id", "user_id", *cls.ACCESS_FLAGS)
+        }
+
+        now = timezone.now()
+        to_create, to_update = [], []
+        for (note_id, user_id), flags in desired.items():
+            row = existing.get((note_id, user_id))
+            if row is None:
+                to_create.append(cls(note_id=note_id, user_id=user_id, **flags))
+            elif any(getattr(row, flag) != value for flag, value in flags.items()):
+                for flag, value in flags.items():
+                    setattr(row, flag, value)
+                row.date_updated = now
+                to_update.append(row)
+
+        with transaction.atomic():
+            if to_create:
+                cls.objects.bulk_create(
+                    to_create,
+                    update_conflicts=True,
+                    unique_fields=["user", "note"],
+                    update_fields=[*cls.ACCESS_FLAGS, "date_updated"],
+                )
+            if to_update:
+                cls.objects.bulk_update(to_update, [*cls.ACCESS_FLAGS, "date_updated"])
+            # Bulk writes send no post_save; refresh the inbox counters of the affected users
+            mark_inbox_dirty(row.user_id for row in to_create + to_update)
+
+    @classmethod
+    def _predefined_accesses(cls, notes):
+        """Return {(note_id, user_id): flags} for *notes*, loading owners, committees and mentions in bulk."""
+        owner_model = Note._meta.get_field("owner").related_model
+        owners = owner_model.objects.select_related(
+            "committee", "team__tribe", "chapter", "organization"
+        ).in_bulk({note.owner_id for note in notes})
+        note_ids = [note.pk for note in notes]
+
+        done_summary_note_ids = set(
+            Summary.objects.filter(note_id__in=note_ids, submit_status=SummarySubmitStatus.DONE)
+            .values_list("note_id", flat=True)
+        )
+
+        mentioned_user_ids = defaultdict(list)
+        for note_id, user_id in Note.mentioned_users.through.objects.filter(note_id__in=note_ids).values_list(
+            "note_id", "user_id"
+        ):
+            mentioned_user_ids[note_id].append(user_id)
+
+        # Committee grants only apply to proposals that were sent to the committee
+        committee_ids = {
+            owners[note.owner_id].committee_id
+            for note in notes
+            if note.submit_status in (NoteSubmitStatus.PENDING, NoteSubmitStatus.REVIEWED)
+            and note.type in committee_roles_permissions.keys()
+            and owners[note.owner_id].committee_id is not None
+        }
+        committee_member_ids = defaultdict(list)
+        committee_roles = defaultdict(dict)
+        if committee_ids:
+            for committee_id, user_id in Committee.members.through.objects.filter(
+                committee_id__in=committee_ids
+            ).values_list("committee_id", "user_id"):
+                committee_member_ids[committee_id].append(user_id)
+            for link in Committee.roles.through.objects.filter(committee_id__in=committee_ids).select_related("role"):
+                committee_roles[link.committee_id][link.role_id] = link.role
+        role_member_ids = {}
+
+        desired = {}
+        for note in notes:
+            owner = owners[note.owner_id]
+            grants = {}
+
+            # Owner
+            grants[owner.pk] = {
                 "can_view": True,
                 "can_edit": not note.is_sent_to_committee(),
-                "can_view_summary": note.has_summary_with_done_submit_status(),
+                "can_view_summary": note.pk in done_summary_note_ids,
                 "can_write_summary": note.type == NoteType.GOAL,
                 "can_view_feedbacks": True,
                 "can_write_feedback": True,
-            },
-        )
+            }
+
+            if note.type != NoteType.Personal:
+                # Leaders
+                if owner.leader_id is not None and note.type in leader_permissions.keys():
+                    grants[owner.leader_id] = leader_permissions[note.type]
+
+                # Agile Coach
+                if owner.agile_coach_id is not None:
+                    grants[owner.agile_coach_id] = {
+                        "can_view": True,
+                        "can_edit": False,
+                        "can_view_summary": True,
+                        "can_write_summary": True,
+                        "can_write_feedback": True,
+                        "can_view_feedbacks": True,
+                    }
+
+                # Committee members
+                if owner.committee_id in committee_ids and note.type in committee_roles_permissions.keys() \
+                        and note.submit_status in (NoteSubmitStatus.PENDING, NoteSubmitStatus.REVIEWED):
+                    # Committee role members
+                    if owner.pk not in role_member_ids:
+                        role_member_ids[owner.pk] = owner.get_committee_role_member_ids(
+                            roles=committee_roles[owner.committee_id].values()
+                        )
+                    for user_id in (*role_member_ids[owner.pk], *committee_member_ids[owner.committee_id]):
+                        grants[user_id] = committee_roles_permissions[note.type]
 
-        if note.type == NoteType.Personal:
-            return
-        
-        # Leaders
-        if (
-            leader := note.owner.leader
-        ) is not None:
-            if note.type in leader_permissions.keys():
-                cls.objects.update_or_create(
-                    user=leader,
-                    note=note,
-                    defaults=leader_permissions[note.type],
-                )
+                # Mentioned users
+                for user_id in mentioned_user_ids[note.pk]:
+                    grants[user_id] = {
+                        "can_view": True,
+                        "can_edit": False,
+                        "can_view_summary": False,
+                        "can_write_summary": False,
+                        "can_view_feedbacks": False,
+                        "can_write_feedback": True,
+                    }
 
-        # Agile Coach
-        cls.objects.update_or_create(
-            user=note.owner.agile_coach,
-            note=note,
-            defaults={
-                "can_view": True,
-                "can_edit": False,
-                "can_view_summary": True,
-                "can_write_summary": True,
-                "can_write_feedback": True,
-                "can_view_feedbacks": True,
-            },
-        )
+            for user_id, flags in grants.items():
+                desired[(note.pk, user_id)] = dict(flags)
+        return desired
 
-        # Committee members
-        committee:Committee = note.owner.committee
-        if committee is not None:
-            # Committee role members
-            if note.submit_status in (NoteSubmitStatus.PENDING, NoteSubmitStatus.REVIEWED) and note.type in committee_roles_permissions.keys():
-                for member in note.owner.get_committee_role_members():
-                    cls.objects.update_or_create(
-                        user=member,
-                        note=note,
-                        defaults=committee_roles_permissions[note.type],
-                    )
-                for member in committee.members.all():
-                    cls.objects.update_or_create(
-                        user=member,
-                        note=note,
-                        defaults=committee_roles_permissions[note.type],
-                    )
-
-
-        # Mentioned users
-        for user in note.mentioned_users.all():
-            cls.objects.update_or_create(
-                user=user,
-                note=note,
-                defaults={
-                    "can_view": True,
-                    "can_edit": False,
-                    "can_view_summary": False,
-                    "can_write_summary": False,
-                    "can_view_feedbacks": False,
-                    "can_write_feedback": True,
-                },
-            )
+
+class NoteAccessRecompute(models.Model):
+    """Pending NoteUserAccess recomputation, keyed by note or by note owner.
+
+    Rows are enqueued by the m2m signals (see api.services.acl_queue) when
+    ``ACL_RECOMPUTE_DEFERRED`` is enabled; duplicates collapse on the unique
+    constraints and ``process_acl_queue`` drains the table in batches.
+    """
+
+    note = models.ForeignKey(Note, on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    user = models.ForeignKey("api.User", on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    date_created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "بازمحاسبه دسترسی"
+        verbose_name_plural = "بازمحاسبه‌های دسترسی"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["note"], condition=models.Q(note__isnull=False), name="unique_pending_note_access_recompute"
+            ),
+            models.UniqueConstraint(
+                fields=["user"], condition=models.Q(user__isnull=False), name="unique_pending_user_access_recompute"
+            ),
+        ]
+
+    def __str__(self):
+        return f"note={self.note_id} user={self.user_id}"
+
+
+class InboxCounter(MerlinBaseModel):
+    """Per-user unread/pending counters behind the inbox badges.
+
+    Kept up to date by api.services.inbox: read_by changes, NoteUserAccess grants and
+    feedback-request invitations recompute the counters of the affected users on commit.
+    """
+
+    user = models.OneToOneField(
+        "api.User", on_delete=models.CASCADE, primary_key=True, related_name="inbox_counter", verbose_name="کاربر"
+    )
+    unread_mentions = models.PositiveIntegerField(default=0, verbose_name="منشن‌های خوانده‌نشده")
+    unread_feedback = models.PositiveIntegerField(default=0, verbose_name="بازخوردهای خوانده‌نشده")
+    unread_one_on_ones = models.PositiveIntegerField(default=0, verbose_name="۱×۱های خوانده‌نشده")
+    pending_feedback_requests = models.PositiveIntegerField(default=0, verbose_name="درخواست‌های بازخورد در انتظار")
+
+    class Meta:
+        verbose_name = "شمارنده صندوق"
+        verbose_name_plural = "شمارنده‌های صندوق"
+
+    def __str__(self):
+        return f"{self.user} inbox"
 
 
 class Vibe(models.TextChoices):
@@ -5,7 +5,7 @@ from django.core.exceptions import ValidationError
 from api.models.base import MerlinBaseModel
 from api.models.user import User
 
-__all__ = ['Organization', 'Department', 'Chapter', 'Tribe', 'Team', 'Committee', 'ValueSection', 'ValueTag', 'OrgValueTag', 'PayBand']
+__all__ = ['Organization', 'Department', 'Chapter', 'Tribe', 'Team', 'Committee', 'ValueSection', 'ValueTag', 'OrgValueTag', 'PayBand', 'OrgStructureVersion']
 
 
 class Organization(MerlinBaseModel):
@@ -323,3 +323,21 @@ class PayBand(MerlinBaseModel):
 
 	def __str__(self):
 		return f"پله {self.number}"
+
+
+class OrgStructureVersion(models.Model):
+	"""Single-row version of the org structure, bumped by api.services.org_structure.
+
+	Kept in the database so changes made by any process (other workers, management
+	commands) invalidate the caches keyed by it everywhere.
+	"""
+
+	version = models.BigIntegerField(default=0, verbose_name="نسخه")
+	date_updated = models.DateTimeField(auto_now=True, verbose_name="تاریخ بروزرسانی")
+
+	class Meta:
+		verbose_name = "نسخه ساختار سازمانی"
+		verbose_name_plural = "نسخه ساختار سازمانی"
+
+	def __str__(self):
+		return f"Org structure v{self.version}"
@@ -8,6 +8,7 @@ __all__ = [
     "CompensationSnapshot",
     "SenioritySnapshot",
     "DataAccessOverride",
+    "UserPerformanceState",
 ]
 
 
@@ -134,4 +135,45 @@ class DataAccessOverride(MerlinBaseModel):
         ]
 
     def __str__(self) -> str:
-        return f"Override({self.scope}) for {self.user}" 
\ No newline at end of file
+        return f"Override({self.scope}) for {self.user}" 
+
+class UserPerformanceState(models.Model):
+    """Denormalized "as of today" projection of a user's latest snapshots.
+
+    Maintained by the snapshot/summary signals so the personnel performance table can
+    read current values with plain joins instead of per-row correlated subqueries.
+    Rows become stale once a future-dated snapshot or committee takes effect; see
+    ``stale_after``.
+    """
+
+    user = models.OneToOneField(
+        "api.User", on_delete=models.CASCADE, primary_key=True, related_name="performance_state"
+    )
+    latest_comp = models.ForeignKey(
+        CompensationSnapshot, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    latest_seniority = models.ForeignKey(
+        SenioritySnapshot, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    latest_org = models.ForeignKey(
+        OrgAssignmentSnapshot, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    is_mapped = models.BooleanField(default=False)
+    last_committee_date = models.DateField(null=True, blank=True)
+    # {"<persian year>": <number of committees with committee_date in that year>}
+    committees_by_year = models.JSONField(default=dict, blank=True)
+    last_bonus_date = models.DateField(null=True, blank=True)
+    last_bonus_percentage = models.FloatField(null=True, blank=True)
+    last_salary_change_date = models.DateField(null=True, blank=True)
+    # Earliest future effective date among the user's rows; the projection must be
+    # recomputed once this date is reached.
+    stale_after = models.DateField(null=True, blank=True, db_index=True)
+    computed_on = models.DateField()
+    date_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "وضعیت فعلی عملکرد کاربر"
+        verbose_name_plural = "وضعیت‌های فعلی عملکرد کاربران"
+
+    def __str__(self):
+        return f"PerformanceState({self.user_id}) @ {self.computed_on}"
@@ -89,6 +89,10 @@ class TimelineEvent(MerlinBaseModel):
         verbose_name = "رویداد پروفایل"
         verbose_name_plural = "رویدادهای پروفایل"
         ordering = ("-effective_date", "-date_created")
+        indexes = [
+            # Timeline pages (keyset on effective_date, date_created, id) per user
+            models.Index(fields=["user", "effective_date", "date_created"], name="timeline_user_date_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user} • {self.get_event_type_display()} • {self.effective_date}"
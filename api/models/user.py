@@ -6,7 +6,7 @@ import logging
 from api.models.base import MerlinBaseModel
 
 
-__all__ = ['User']
+__all__ = ['User', 'LeadershipClosure', 'LadderCategory', 'UserClassification']
 
 
 logger = logging.getLogger(__name__)
@@ -71,30 +71,46 @@ class User(MerlinBaseModel, AbstractUser):
     def tribe(self):
         return self.team.tribe if self.team else None
 
-    def get_committee_role_members(self):
-        committee_role_members = set()
+    def get_committee_role_members(self, roles=None):
+        member_ids = self.get_committee_role_member_ids(roles)
+        return set(User.objects.filter(pk__in=member_ids)) if member_ids else set()
 
-        for role in self.committee.roles.distinct():
+    def get_committee_role_member_ids(self, roles=None):
+        """Ids of the users filling the committee roles of this user.
+
+        *roles* can be passed when the committee roles were already loaded (e.g. for many users
+        of the same committee). Role members are read through their ``<role>_id`` attribute, so
+        no user rows are loaded when the scope objects are select_related.
+        """
+        committee_role_member_ids = set()
+        if roles is None:
+            roles = self.committee.roles.distinct()
+
+        from api.models import RoleScope
+
+        for role in roles:
             role_type_raw = role.role_type
             role_scope_raw = role.role_scope
             role_scope = role_scope_raw.lower()
             role_type = role_type_raw.lower().replace(" ", "_")  # normalize to attribute style
-            member = None
-
-            from api.models import RoleScope
 
             if role_scope_raw == RoleScope.USER:
-                member = getattr(self, role_type, None)
+                scope_object = self
             else:
                 scope_object = getattr(self, role_scope, None)
-                if scope_object:
+
+            member_id = None
+            if scope_object:
+                member_id = getattr(scope_object, f"{role_type}_id", None)
+                if member_id is None:
                     member = getattr(scope_object, role_type, None)
+                    member_id = getattr(member, "pk", None)
 
-            if member:
-                committee_role_members.add(member)
+            if member_id:
+                committee_role_member_ids.add(member_id)
             else:
                 logger.warning("Unresolved committee role %s:%s for user %s (id=%s)", role.role_scope, role.role_type, self, self.pk)
-        return committee_role_members
+        return committee_role_member_ids
 
     def save(self, *args, **kwargs):
         self.username = self.email
@@ -107,8 +123,9 @@ class User(MerlinBaseModel, AbstractUser):
         
         if original_leader != self.leader:
             # Local import to avoid circular import at module load time
-            from api.services import ensure_leader_note_accesses
+            from api.services import ensure_leader_note_accesses, refresh_leadership_closure
             ensure_leader_note_accesses(self, self.leader)
+            refresh_leadership_closure([self.pk])
 
     class Meta:
         verbose_name = "کاربر"
@@ -128,3 +145,69 @@ class User(MerlinBaseModel, AbstractUser):
             current = current.leader
             depth += 1
         return leaders
+
+
+class LeadershipClosure(models.Model):
+    """Transitive closure of ``User.leader``: one row per (leader, report) pair at any depth.
+
+    ``depth`` is 1 for direct reports. Maintained by User.save (see
+    api.services.leadership) and rebuildable with ``rebuild_leadership_closure``.
+    """
+
+    ancestor = models.ForeignKey(User, on_delete=models.CASCADE, related_name="descendant_links")
+    descendant = models.ForeignKey(User, on_delete=models.CASCADE, related_name="ancestor_links")
+    depth = models.PositiveSmallIntegerField()
+
+    class Meta:
+        verbose_name = "زنجیره رهبری"
+        verbose_name_plural = "زنجیره‌های رهبری"
+        constraints = [
+            models.UniqueConstraint(fields=["ancestor", "descendant"], name="unique_leadership_closure_pair"),
+        ]
+        indexes = [
+            models.Index(fields=["descendant", "depth"]),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} → {self.descendant_id} ({self.depth})"
+
+
+class LadderCategory(models.TextChoices):
+    TECH = "TECH", "فنی"
+    PRODUCT = "PRODUCT", "محصول"
+    OTHER = "OTHER", "سایر"
+
+
+class UserClassification(models.Model):
+    """Denormalized tech/product/finance classification of a user.
+
+    Derived from the latest SenioritySnapshot ladder and the user's chapter, team and tribe
+    (see api.services.user_classification), so role-scoped visibility filters are plain
+    indexed predicates instead of per-user snapshot lookups. Kept current by the snapshot and
+    org-structure signals; a missing row means "recompute on next read".
+    """
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="classification"
+    )
+    latest_ladder = models.ForeignKey(
+        "api.Ladder", on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    ladder_category = models.CharField(
+        max_length=16,
+        choices=LadderCategory.choices,
+        default=LadderCategory.OTHER,
+        db_index=True,
+        verbose_name="دسته لدر",
+    )
+    is_technical = models.BooleanField(default=False, db_index=True, verbose_name="فنی")
+    is_product = models.BooleanField(default=False, db_index=True, verbose_name="محصول")
+    is_finance = models.BooleanField(default=False, db_index=True, verbose_name="مالی")
+    date_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "دسته‌بندی کاربر"
+        verbose_name_plural = "دسته‌بندی‌های کاربران"
+
+    def __str__(self):
+        return f"{self.user_id} ({self.ladder_category})"
@@ -42,11 +42,15 @@ class FormSerializer(serializers.ModelSerializer):
     def get_is_expired(self, obj):
         if obj.is_default:
             return obj.cycle.end_date < timezone.now()
+        elif hasattr(obj, "has_open_assignment"):
+            return not obj.has_open_assignment
         else:
             return not FormAssignment.objects.filter(form=obj, deadline__gte=timezone.now().date()).exists()
 
     def get_is_filled(self, obj):
         """Returns True if the requesting user has already filled this form."""
+        if hasattr(obj, "is_filled_by_user"):
+            return obj.is_filled_by_user
         user = self.context['request'].user
         return FormResponse.objects.filter(form=obj, user=user).exists()
 
@@ -9,6 +9,7 @@ from django.db import transaction
 from api.services import grant_oneonone_access
 from api.serializers.organization import TagReadSerializer
 from api.models import (
+    InboxCounter,
     Note,
     NoteType,
     NoteUserAccess,
@@ -42,6 +43,7 @@ __all__ = [
     "OneOnOneSerializer",
     "OneOnOneTagLinkReadSerializer",
     "LinkedNoteSerializer",
+    "InboxCounterSerializer",
 ]
 
 
@@ -199,14 +201,20 @@ class NoteSerializer(serializers.ModelSerializer):
         return value
 
     def get_read_status(self, obj):
+        if hasattr(obj, "is_read"):
+            return obj.is_read
         user = self.context["request"].user
         return obj.read_by.filter(uuid=user.uuid).exists()
 
     def to_representation(self, instance):
         user = self.context["request"].user
-        access_level_obj = NoteUserAccess.objects.filter(
-            user=user, note=instance
-        ).first()
+        if hasattr(instance, "user_accesses"):
+            # Prefetched for the request user by NoteViewSet.get_queryset
+            access_level_obj = next(iter(instance.user_accesses), None)
+        else:
+            access_level_obj = NoteUserAccess.objects.filter(
+                user=user, note=instance
+            ).first()
         instance.access_level = access_level_obj
         return super().to_representation(instance)
 
@@ -500,3 +508,14 @@ class OneOnOneSerializer(serializers.ModelSerializer):
             # Member should not see leader's vibe
             data.pop("leader_vibe", None)
         return data
+
+
+class InboxCounterSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = InboxCounter
+        fields = [
+            "unread_mentions",
+            "unread_feedback",
+            "unread_one_on_ones",
+            "pending_feedback_requests",
+        ]
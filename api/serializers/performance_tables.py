@@ -29,7 +29,15 @@ class PerformanceTableResponseSerializer(serializers.Serializer):
     results = UserPerformanceDataSerializer(many=True)
 
 
+class PerformanceTableCursorResponseSerializer(serializers.Serializer):
+    count = serializers.IntegerField(allow_null=True)
+    page_size = serializers.IntegerField()
+    next_cursor = serializers.CharField(allow_null=True)
+    results = UserPerformanceDataSerializer(many=True)
+
+
 __all__ = [
     "UserPerformanceDataSerializer",
     "PerformanceTableResponseSerializer",
+    "PerformanceTableCursorResponseSerializer",
 ]
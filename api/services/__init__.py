@@ -4,5 +4,12 @@ from . import timeline_access
 from .note_access import *
 from .timeline_access import *
 from .performance_tables import *
+from .leadership import *
+from .acl_queue import *
+from .user_classification import *
+from .org_structure import *
+from .form_assignment import *
+from .dashboard_stats import *
+from .inbox import *
 
 __all__ = []
\ No newline at end of file
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+from typing import Iterable
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+
+from api.models import Note, NoteAccessRecompute, NoteType, NoteUserAccess
+
+__all__ = [
+    "acl_recompute_deferred",
+    "enqueue_acl_recompute",
+    "recompute_note_accesses",
+    "process_acl_queue",
+]
+
+ACL_QUEUE_BATCH_SIZE = 500
+
+# Note types whose access rows are not managed by ensure_note_predefined_accesses
+UNMANAGED_NOTE_TYPES = (NoteType.ONE_ON_ONE, NoteType.FEEDBACK, NoteType.FEEDBACK_REQUEST)
+
+_pending = threading.local()
+
+
+def acl_recompute_deferred() -> bool:
+    return getattr(settings, "ACL_RECOMPUTE_DEFERRED", "false") == "true"
+
+
+def recompute_note_accesses(note_ids: Iterable[int] = (), user_ids: Iterable[int] = ()) -> int:
+    """Recompute predefined accesses of *note_ids* and of every note owned by *user_ids*. Returns notes processed."""
+    note_ids, user_ids = set(note_ids), set(user_ids)
+    if not note_ids and not user_ids:
+        return 0
+    notes = list(
+        Note.objects.filter(Q(pk__in=note_ids) | Q(owner_id__in=user_ids)).exclude(type__in=UNMANAGED_NOTE_TYPES)
+    )
+    NoteUserAccess.ensure_notes_predefined_accesses(notes)
+    return len(notes)
+
+
+def _flush_pending_keys():
+    keys, _pending.keys = getattr(_pending, "keys", set()), set()
+    NoteAccessRecompute.objects.bulk_create(
+        [NoteAccessRecompute(**{field: pk}) for field, pk in keys],
+        ignore_conflicts=True,
+    )
+
+
+def _flush_registered() -> bool:
+    return any(func is _flush_pending_keys for _, func, _ in connection.run_on_commit)
+
+
+def enqueue_acl_recompute(note_ids: Iterable[int] = (), user_ids: Iterable[int] = ()) -> None:
+    """Schedule an ACL recompute for *note_ids* and for the notes owned by *user_ids*.
+
+    With ``ACL_RECOMPUTE_DEFERRED`` disabled this recomputes right away. Otherwise keys are
+    collected for the current transaction (duplicates collapse) and written to the
+    NoteAccessRecompute queue on commit, to be drained by ``process_acl_queue``.
+    """
+    note_ids = {pk for pk in note_ids if pk is not None}
+    user_ids = {pk for pk in user_ids if pk is not None}
+    if not note_ids and not user_ids:
+        return
+
+    if not acl_recompute_deferred():
+        recompute_note_accesses(note_ids, user_ids)
+        return
+
+    registered = _flush_registered()
+    if not registered:
+        # A rolled back transaction drops its on_commit callbacks; start from a fresh buffer
+        _pending.keys = set()
+    _pending.keys.update(("note_id", pk) for pk in note_ids)
+    _pending.keys.update(("user_id", pk) for pk in user_ids)
+    if not registered:
+        transaction.on_commit(_flush_pending_keys)
+
+
+def process_acl_queue(batch_size: int = ACL_QUEUE_BATCH_SIZE) -> int:
+    """Drain the NoteAccessRecompute queue in batches. Returns the number of queue rows processed.
+
+    Rows are claimed with SKIP LOCKED so several workers can run side by side.
+    """
+    processed = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                NoteAccessRecompute.objects.select_for_update(skip_locked=True).order_by("pk")[:batch_size]
+            )
+            if not batch:
+                return processed
+            recompute_note_accesses(
+                (row.note_id for row in batch if row.note_id is not None),
+                (row.user_id for row in batch if row.user_id is not None),
+            )
+            NoteAccessRecompute.objects.filter(pk__in=[row.pk for row in batch]).delete()
+        processed += len(batch)
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from persiantools.jdatetime import JalaliDate
+
+from api.models import (
+    ApiKey,
+    Cycle,
+    DashboardStats,
+    Department,
+    Feedback,
+    FeedbackRequest,
+    Form,
+    FormAssignment,
+    Note,
+    User,
+)
+from api.models.note import NoteSubmitStatus, NoteType, ProposalType
+
+__all__ = [
+    "compute_dashboard_stats",
+    "refresh_dashboard_stats",
+    "latest_dashboard_stats",
+    "dashboard_stats_context",
+]
+
+logger = logging.getLogger(__name__)
+
+# Metric stem -> model; each yields ``total_<stem>`` and ``recent_<stem>`` (created in the last 7 days)
+COUNTED_MODELS = {
+    "users": User,
+    "notes": Note,
+    "feedback": Feedback,
+    "feedback_requests": FeedbackRequest,
+    "forms": Form,
+    "cycles": Cycle,
+    "departments": Department,
+}
+
+DASHBOARD_STATS_HISTORY = 100
+
+NO_ACTIVE_CYCLE = "هیچ دوره فعالی وجود ندارد"
+
+
+def _persian_month_bounds(now: datetime) -> Tuple[datetime, datetime]:
+    """Start and end of the current Persian calendar month, falling back to the Gregorian month."""
+    try:
+        jalali_today = JalaliDate.to_jalali(now.date())
+        month_start_greg = JalaliDate(jalali_today.year, jalali_today.month, 1).to_gregorian()
+        if jalali_today.month == 12:
+            next_month_start = JalaliDate(jalali_today.year + 1, 1, 1).to_gregorian()
+        else:
+            next_month_start = JalaliDate(jalali_today.year, jalali_today.month + 1, 1).to_gregorian()
+        month_end_greg = next_month_start - timedelta(days=1)
+        return (
+            timezone.make_aware(datetime.combine(month_start_greg, datetime.min.time())),
+            timezone.make_aware(datetime.combine(month_end_greg, datetime.max.time())),
+        )
+    except Exception as e:
+        logger.error(f"Error calculating Persian calendar dates: {e}", exc_info=True)
+        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        next_month = (now.replace(day=1) + timedelta(days=32)).replace(day=1)
+        return month_start, next_month - timedelta(days=1)
+
+
+def _count_authenticated_sessions(now: datetime) -> int:
+    """Active sessions that belong to a logged-in user. Decodes every session, so snapshots only."""
+    count = 0
+    for session in Session.objects.filter(expire_date__gte=now).only("session_key", "session_data").iterator():
+        try:
+            if session.get_decoded().get("_auth_user_id"):
+                count += 1
+        except Exception:
+            pass
+    return count
+
+
+def _proposal_metrics(week_ago: datetime, month_start: datetime, month_end: datetime) -> Dict:
+    """Proposal counts by type and by status (total, this week, this month) in one grouped query."""
+    by_type = {str(code): 0 for code, _ in ProposalType.choices}
+    by_status = {str(code): {"total": 0, "week": 0, "month": 0} for code, _ in NoteSubmitStatus.choices}
+    rows = (
+        Note.objects.filter(type=NoteType.Proposal)
+        .values("proposal_type", "submit_status")
+        .annotate(
+            total=Count("pk"),
+            week=Count("pk", filter=Q(date_updated__gte=week_ago)),
+            month=Count("pk", filter=Q(date_updated__gte=month_start, date_updated__lte=month_end)),
+        )
+        .order_by()
+    )
+    for row in rows:
+        if row["proposal_type"] in by_type:
+            by_type[row["proposal_type"]] += row["total"]
+        status = by_status.setdefault(str(row["submit_status"]), {"total": 0, "week": 0, "month": 0})
+        for window in ("total", "week", "month"):
+            status[window] += row[window]
+    return {"proposals_by_type": by_type, "proposals_by_status": by_status}
+
+
+def _window_metrics(now: datetime) -> Dict:
+    """Metrics that are cheap grouped aggregates and always recomputed."""
+    week_ago = now - timedelta(days=7)
+    month_start, month_end = _persian_month_bounds(now)
+    forms_by_state = dict(
+        FormAssignment.objects.values_list("is_completed").annotate(n=Count("pk")).order_by()
+    )
+    current_cycle = Cycle.objects.filter(is_active=True).order_by("-start_date").values_list("name", flat=True).first()
+    return {
+        "active_api_keys": ApiKey.objects.filter(is_active=True).count(),
+        "unique_logins_this_week": User.objects.filter(last_login__gte=week_ago).count(),
+        "pending_forms": forms_by_state.get(False, 0),
+        "completed_forms": forms_by_state.get(True, 0),
+        "current_cycle_name": current_cycle or NO_ACTIVE_CYCLE,
+        **_proposal_metrics(week_ago, month_start, month_end),
+    }
+
+
+def compute_dashboard_stats(now: Optional[datetime] = None) -> DashboardStats:
+    """Recompute every dashboard metric from scratch and store it as a new DashboardStats."""
+    now = now or timezone.now()
+    week_ago = now - timedelta(days=7)
+    metrics, watermarks = {}, {}
+    for stem, model in COUNTED_MODELS.items():
+        counts = model.objects.aggregate(
+            total=Count("pk"),
+            recent=Count("pk", filter=Q(date_created__gte=week_ago)),
+            latest=Max("date_created"),
+        )
+        metrics[f"total_{stem}"] = counts["total"]
+        metrics[f"recent_{stem}"] = counts["recent"]
+        watermarks[stem] = counts["latest"].isoformat() if counts["latest"] else None
+    metrics["active_user_sessions"] = _count_authenticated_sessions(now)
+    metrics.update(_window_metrics(now))
+    return _save_snapshot(metrics, watermarks, is_incremental=False)
+
+
+def refresh_dashboard_stats(now: Optional[datetime] = None) -> DashboardStats:
+    """Bring the latest snapshot up to date, reading only rows created since its watermarks.
+
+    Totals grow by the rows created after each model's watermark; the 7-day, monthly and
+    grouped metrics are recomputed. Deleted rows (and rows committed late with an older
+    date_created) are only corrected by the next ``compute_dashboard_stats``, which the
+    ``refresh_dashboard_stats`` command runs unless ``--incremental`` is given.
+    """
+    previous = latest_dashboard_stats()
+    if previous is None:
+        return compute_dashboard_stats(now)
+    now = now or timezone.now()
+    week_ago = now - timedelta(days=7)
+    metrics, watermarks = dict(previous.metrics), dict(previous.watermarks)
+    for stem, model in COUNTED_MODELS.items():
+        watermark = parse_datetime(watermarks[stem]) if watermarks.get(stem) else None
+        if watermark is None:
+            new_rows = None
+            window = model.objects.all()
+        else:
+            new_rows = Q(date_created__gt=watermark)
+            window = model.objects.filter(date_created__gte=min(watermark, week_ago))
+        counts = window.aggregate(
+            new=Count("pk", filter=new_rows),
+            recent=Count("pk", filter=Q(date_created__gte=week_ago)),
+            latest=Max("date_created"),
+        )
+        metrics[f"total_{stem}"] = (metrics.get(f"total_{stem}", 0) if watermark else 0) + counts["new"]
+        metrics[f"recent_{stem}"] = counts["recent"]
+        if counts["latest"] and (watermark is None or counts["latest"] > watermark):
+            watermarks[stem] = counts["latest"].isoformat()
+    metrics.update(_window_metrics(now))
+    return _save_snapshot(metrics, watermarks, is_incremental=True)
+
+
+def _save_snapshot(metrics: Dict, watermarks: Dict, is_incremental: bool) -> DashboardStats:
+    stats = DashboardStats.objects.create(metrics=metrics, watermarks=watermarks, is_incremental=is_incremental)
+    stale = DashboardStats.objects.order_by("-date_created", "-pk").values_list("pk", flat=True)[
+        DASHBOARD_STATS_HISTORY:
+    ]
+    DashboardStats.objects.filter(pk__in=list(stale)).delete()
+    return stats
+
+
+def latest_dashboard_stats() -> Optional[DashboardStats]:
+    return DashboardStats.objects.order_by("-date_created", "-pk").first()
+
+
+def _snapshot_max_age() -> timedelta:
+    return timedelta(seconds=getattr(settings, "DASHBOARD_STATS_MAX_AGE", 3600))
+
+
+def dashboard_stats_context(refresh: bool = False) -> Dict:
+    """Dashboard template context from the latest snapshot.
+
+    With *refresh*, or when the snapshot is older than ``DASHBOARD_STATS_MAX_AGE`` seconds,
+    it is first brought up to date with ``refresh_dashboard_stats``.
+    """
+    stats = latest_dashboard_stats()
+    if stats is None:
+        stats = compute_dashboard_stats()
+    elif refresh or stats.date_created < timezone.now() - _snapshot_max_age():
+        stats = refresh_dashboard_stats()
+    metrics = stats.metrics
+
+    labels = dict(NoteSubmitStatus.choices)
+    proposals_by_status = {int(code): counts for code, counts in metrics["proposals_by_status"].items()}
+
+    def by_status(window):
+        return {
+            code: {"count": counts[window], "label": labels.get(code, code)}
+            for code, counts in proposals_by_status.items()
+        }
+
+    unique_logins = metrics["unique_logins_this_week"]
+    total_logins = max(unique_logins, metrics.get("active_user_sessions", 0))
+    reviewed = proposals_by_status.get(NoteSubmitStatus.REVIEWED, {})
+    context = {key: value for key, value in metrics.items() if key != "proposals_by_status"}
+    context.update({
+        "total_logins_this_week": total_logins,
+        "avg_logins_per_day": round(total_logins / 7, 1),
+        "proposals_by_status_total": by_status("total"),
+        "proposals_by_status_week": by_status("week"),
+        "proposals_by_status_month": by_status("month"),
+        "pending_proposals": proposals_by_status.get(NoteSubmitStatus.PENDING, {}).get("total", 0),
+        "reviewed_proposals_this_week": reviewed.get("week", 0),
+        "reviewed_proposals_this_month": reviewed.get("month", 0),
+        "stats_computed_at": stats.date_created,
+    })
+    return context
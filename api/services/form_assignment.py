@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import csv
+import logging
+import threading
+from datetime import timedelta
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import close_old_connections, transaction
+from django.db.models import Exists, FilteredRelation, OuterRef, Q
+from django.utils import timezone
+
+from api.models import Form, FormAssignment, FormAssignmentJob, User
+from api.utils.streaming import Echo
+
+__all__ = [
+    "FormAssignmentPlanner",
+    "default_form_assignment_targets",
+    "schedule_default_form_assignment",
+    "run_form_assignment_job",
+    "process_form_assignment_jobs",
+]
+
+logger = logging.getLogger(__name__)
+
+FORM_ASSIGNMENT_BATCH_SIZE = 1000
+# A running job commits progress (and date_updated) after every batch; one silent for this
+# long died with its worker and is run again by process_form_assignment_jobs
+FORM_ASSIGNMENT_STALE_AFTER = timedelta(minutes=15)
+
+
+SKIP_ALREADY_ASSIGNED = "Already assigned"
+SKIP_NO_LEADER = "No leader assigned"
+SKIP_MANUAL_ASSIGNMENT = "Manual assignment required"
+SKIP_NOT_APPLICABLE = "This form type is not applicable"
+
+
+class FormAssignmentPlanner:
+    """Affected and skipped users of several forms, planned from a single pass over the users.
+
+    Users are read once, LEFT JOINed to their existing assignments of the planned forms, so
+    the plan costs the same few queries for one form or many. A TL form affects every user
+    with a leader (``leader_id IS NULL`` means skipped); other form types skip everyone.
+    """
+
+    def __init__(self, forms: Iterable[Form], check_existing_assignments: bool = True):
+        self.forms = list(forms)
+        users = User.objects.order_by("pk")
+        if check_existing_assignments and self.forms:
+            rows = users.annotate(
+                planned_assignments=FilteredRelation(
+                    "assigned_forms", condition=Q(assigned_forms__form__in=self.forms)
+                ),
+                # Users without such an assignment get one unmatched LEFT JOIN row, aggregated away
+                assigned_form_ids=ArrayAgg(
+                    "planned_assignments__form_id",
+                    distinct=True,
+                    filter=Q(planned_assignments__isnull=False),
+                    default=[],
+                ),
+            ).values_list("email", "name", "leader_id", "assigned_form_ids")
+        else:
+            rows = (
+                (email, name, leader_id, ())
+                for email, name, leader_id in users.values_list("email", "name", "leader_id")
+            )
+        # (email, name, leader_id, {form_id, ...}) per user
+        self._users = [(email, name, leader_id, set(form_ids)) for email, name, leader_id, form_ids in rows]
+
+    def _skip_reason(self, form: Form, leader_id: Optional[int], assigned_form_ids) -> Optional[str]:
+        if form.pk in assigned_form_ids:
+            return SKIP_ALREADY_ASSIGNED
+        if form.form_type == Form.FormType.TL:
+            return SKIP_NO_LEADER if leader_id is None else None
+        if form.form_type == Form.FormType.PM:  # FUTURE ENHANCEMENT: automated assignment for PMs
+            return SKIP_MANUAL_ASSIGNMENT
+        return SKIP_NOT_APPLICABLE
+
+    def counts(self, form: Form) -> Tuple[int, int]:
+        """(affected, skipped) user counts of *form*."""
+        skipped = sum(1 for _ in self.skipped(form))
+        return len(self._users) - skipped, skipped
+
+    def skipped(self, form: Form) -> Iterator[Tuple[str, str, str]]:
+        """(email, name, reason) of every user *form* skips, lazily."""
+        for email, name, leader_id, assigned_form_ids in self._users:
+            reason = self._skip_reason(form, leader_id, assigned_form_ids)
+            if reason is not None:
+                yield email, name, reason
+
+    def iter_skipped_csv(self) -> Iterator[str]:
+        """Yield the skipped users of every planned form as CSV lines."""
+        writer = csv.writer(Echo())
+        yield writer.writerow(["Form Name", "User Email", "User Name", "Reason Skipped"])
+        for form in self.forms:
+            for email, name, reason in self.skipped(form):
+                yield writer.writerow([form.name, email, name, reason])
+
+
+def default_form_assignment_targets(form: Form) -> List[Tuple[int, int]]:
+    """(assigned_to_id, assigned_by_id) pairs a default *form* still has to be assigned to.
+
+    TL forms go to every user with a leader, assessed by that direct leader
+    (``user.get_leaders()[0]``); users already assigned to the form are skipped.
+    Other form types are assigned manually.
+    """
+    if form.form_type != Form.FormType.TL:
+        return []
+    return list(
+        User.objects.filter(leader__isnull=False)
+        .exclude(Exists(FormAssignment.objects.filter(form=form, assigned_to=OuterRef("pk"))))
+        .order_by("pk")
+        .values_list("pk", "leader_id")
+    )
+
+
+def _in_background() -> bool:
+    return getattr(settings, "FORM_ASSIGNMENT_IN_BACKGROUND", "false") == "true"
+
+
+def _run_in_thread(job_id: int):
+    try:
+        run_form_assignment_job(job_id)
+    finally:
+        close_old_connections()
+
+
+def _start(job_id: int):
+    if _in_background():
+        threading.Thread(target=_run_in_thread, args=(job_id,), daemon=True).start()
+    else:
+        run_form_assignment_job(job_id)
+
+
+def schedule_default_form_assignment(form: Form) -> FormAssignmentJob:
+    """Record a FormAssignmentJob for *form* and run it once the current transaction commits.
+
+    With ``FORM_ASSIGNMENT_IN_BACKGROUND`` enabled the job runs in a background thread, so
+    the saving request does not wait for it. A job still pending for the form is reused;
+    jobs left pending or interrupted (e.g. by a restart) are picked up by
+    ``process_form_assignment_jobs``.
+    """
+    pending = form.assignment_jobs.filter(status=FormAssignmentJob.Status.PENDING).first()
+    if pending is not None:
+        return pending
+    job = FormAssignmentJob.objects.create(form=form)
+    transaction.on_commit(lambda: _start(job.pk))
+    return job
+
+
+def run_form_assignment_job(job_id: int, batch_size: int = FORM_ASSIGNMENT_BATCH_SIZE) -> int:
+    """Create the missing assignments of a pending job in batches. Returns assignments created.
+
+    Progress is committed after every batch. Each batch holds a lock on the form and drops
+    users assigned in the meantime, so concurrent jobs for one form never duplicate rows.
+    """
+    claimed = FormAssignmentJob.objects.filter(pk=job_id, status=FormAssignmentJob.Status.PENDING).update(
+        status=FormAssignmentJob.Status.RUNNING, started_at=timezone.now(), date_updated=timezone.now()
+    )
+    if not claimed:
+        return 0
+    job = FormAssignmentJob.objects.select_related("form__cycle").get(pk=job_id)
+    form = job.form
+    try:
+        targets = default_form_assignment_targets(form)
+        job.total = len(targets)
+        job.save(update_fields=["total", "date_updated"])
+        for start in range(0, len(targets), batch_size):
+            batch = dict(targets[start:start + batch_size])
+            with transaction.atomic():
+                Form.objects.select_for_update().filter(pk=form.pk).first()
+                already_assigned = set(
+                    FormAssignment.objects.filter(form=form, assigned_to_id__in=batch.keys())
+                    .values_list("assigned_to_id", flat=True)
+                )
+                created = FormAssignment.objects.bulk_create([
+                    FormAssignment(
+                        form=form,
+                        assigned_to_id=assigned_to_id,
+                        assigned_by_id=assigned_by_id,
+                        deadline=form.cycle.end_date,
+                    )
+                    for assigned_to_id, assigned_by_id in batch.items()
+                    if assigned_to_id not in already_assigned
+                ])
+                job.assigned += len(created)
+                job.save(update_fields=["assigned", "date_updated"])
+    except Exception as exc:
+        logger.exception("Default form assignment job %s failed", job_id)
+        FormAssignmentJob.objects.filter(pk=job_id).update(
+            status=FormAssignmentJob.Status.FAILED, error=str(exc), finished_at=timezone.now()
+        )
+        return job.assigned
+    FormAssignmentJob.objects.filter(pk=job_id).update(
+        status=FormAssignmentJob.Status.DONE, finished_at=timezone.now()
+    )
+    return job.assigned
+
+
+def process_form_assignment_jobs(
+    batch_size: int = FORM_ASSIGNMENT_BATCH_SIZE, stale_after: timedelta = FORM_ASSIGNMENT_STALE_AFTER
+) -> int:
+    """Run every pending FormAssignmentJob, oldest first. Returns the number of jobs run.
+
+    Running jobs without progress for *stale_after* were interrupted (their worker was
+    recycled mid-run) and are reset to pending first. Assignments they already committed
+    are kept; the rerun only creates the missing ones.
+    """
+    FormAssignmentJob.objects.filter(
+        status=FormAssignmentJob.Status.RUNNING, date_updated__lt=timezone.now() - stale_after
+    ).update(status=FormAssignmentJob.Status.PENDING, total=0, assigned=0, started_at=None)
+    job_ids = list(
+        FormAssignmentJob.objects.filter(status=FormAssignmentJob.Status.PENDING)
+        .order_by("date_created")
+        .values_list("pk", flat=True)
+    )
+    for job_id in job_ids:
+        run_form_assignment_job(job_id, batch_size=batch_size)
+    return len(job_ids)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import threading
+from typing import Iterable
+
+from django.db import connection, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q
+
+from api.models import FeedbackRequestUserLink, InboxCounter, Note, NoteType, NoteUserAccess
+
+__all__ = [
+    "INBOX_COUNTER_FIELDS",
+    "refresh_inbox_counters",
+    "mark_inbox_dirty",
+    "get_inbox_counter",
+]
+
+INBOX_COUNTER_FIELDS = (
+    "unread_mentions",
+    "unread_feedback",
+    "unread_one_on_ones",
+    "pending_feedback_requests",
+)
+
+INBOX_BATCH_SIZE = 1000
+
+_pending = threading.local()
+
+
+def _unread_note_counts(user_ids):
+    """{user_id: {counter: n}} for the unread notes each user can view, in one grouped query.
+
+    ``unread_mentions`` matches ``/notes/?retrieve_mentions=true&unread=true``: notes the user
+    does not own, minus feedback answers where the user is only an observer of the request.
+    """
+    is_read = Note.read_by.through.objects.filter(note_id=OuterRef("note_id"), user_id=OuterRef("user_id"))
+    rows = (
+        NoteUserAccess.objects.filter(user_id__in=user_ids, can_view=True)
+        .filter(~Exists(is_read))
+        .values("user_id")
+        .annotate(
+            unread_mentions=Count(
+                "pk",
+                filter=~Q(note__owner_id=F("user_id"))
+                & (
+                    ~Q(note__type=NoteType.FEEDBACK)
+                    | Q(note__feedback__feedback_request__isnull=True)
+                    | Q(note__feedback__receiver_id=F("user_id"))
+                ),
+            ),
+            unread_feedback=Count(
+                "pk", filter=Q(note__type=NoteType.FEEDBACK, note__feedback__receiver_id=F("user_id"))
+            ),
+            unread_one_on_ones=Count(
+                "pk", filter=Q(note__type=NoteType.ONE_ON_ONE, note__one_on_one__member_id=F("user_id"))
+            ),
+        )
+        .order_by()
+    )
+    return {row.pop("user_id"): row for row in rows}
+
+
+def refresh_inbox_counters(user_ids: Iterable[int]) -> int:
+    """Recompute InboxCounter rows for *user_ids*. Returns the number of rows written."""
+    user_ids = list(dict.fromkeys(uid for uid in user_ids if uid is not None))
+    written = 0
+    for start in range(0, len(user_ids), INBOX_BATCH_SIZE):
+        batch = user_ids[start:start + INBOX_BATCH_SIZE]
+        unread = _unread_note_counts(batch)
+        pending = dict(
+            FeedbackRequestUserLink.objects.filter(user_id__in=batch, answered=False)
+            .values_list("user_id")
+            .annotate(n=Count("pk"))
+            .order_by()
+        )
+        counters = []
+        for user_id in batch:
+            counts = unread.get(user_id, {})
+            counters.append(
+                InboxCounter(
+                    user_id=user_id,
+                    unread_mentions=counts.get("unread_mentions", 0),
+                    unread_feedback=counts.get("unread_feedback", 0),
+                    unread_one_on_ones=counts.get("unread_one_on_ones", 0),
+                    pending_feedback_requests=pending.get(user_id, 0),
+                )
+            )
+        InboxCounter.objects.bulk_create(
+            counters,
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=[*INBOX_COUNTER_FIELDS, "date_updated"],
+        )
+        written += len(counters)
+    return written
+
+
+def _flush_dirty_users():
+    user_ids, _pending.user_ids = getattr(_pending, "user_ids", set()), set()
+    refresh_inbox_counters(user_ids)
+
+
+def _flush_registered() -> bool:
+    # A flush that already ran leaves an empty buffer behind, even if its callback is still listed
+    return bool(getattr(_pending, "user_ids", None)) and any(
+        func is _flush_dirty_users for _, func, _ in connection.run_on_commit
+    )
+
+
+def mark_inbox_dirty(user_ids: Iterable[int]) -> None:
+    """Recompute the inbox counters of *user_ids* once the current transaction commits.
+
+    Users marked several times in one transaction are recomputed once.
+    """
+    user_ids = {pk for pk in user_ids if pk is not None}
+    if not user_ids:
+        return
+    registered = _flush_registered()
+    if not registered:
+        # A rolled back transaction drops its on_commit callbacks; start from a fresh buffer
+        _pending.user_ids = set()
+    _pending.user_ids.update(user_ids)
+    if not registered:
+        transaction.on_commit(_flush_dirty_users)
+
+
+def get_inbox_counter(user) -> InboxCounter:
+    """InboxCounter of *user*, computed on the spot if it is missing."""
+    counter = InboxCounter.objects.filter(pk=user.pk).first()
+    if counter is None:
+        refresh_inbox_counters([user.pk])
+        counter = InboxCounter.objects.get(pk=user.pk)
+    return counter
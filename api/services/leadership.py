@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db import transaction
+
+from api.models import LeadershipClosure, User
+
+__all__ = [
+    "LEADERSHIP_MAX_DEPTH",
+    "rebuild_leadership_closure",
+    "refresh_leadership_closure",
+    "is_in_leadership_chain",
+    "get_report_ids",
+    "get_reports",
+]
+
+# Mirrors the max_depth used by User.get_leaders()
+LEADERSHIP_MAX_DEPTH = 10
+
+CLOSURE_BATCH_SIZE = 2000
+
+
+def _walk_up(user_id: int, leader_map: Dict[int, Optional[int]]) -> List[Tuple[int, int]]:
+    """Return [(ancestor_id, depth), ...] for *user_id*, walking ``leader`` like User.get_leaders().
+
+    Unlike get_leaders() the walk is not depth-capped; readers apply LEADERSHIP_MAX_DEPTH.
+    """
+    ancestors = []
+    visited: Set[int] = set()
+    current = leader_map.get(user_id)
+    depth = 1
+    while current is not None and current not in visited:
+        ancestors.append((current, depth))
+        visited.add(current)
+        current = leader_map.get(current)
+        depth += 1
+    return ancestors
+
+
+def _closure_rows(user_ids: Iterable[int], leader_map: Dict[int, Optional[int]]) -> List[LeadershipClosure]:
+    return [
+        LeadershipClosure(ancestor_id=ancestor_id, descendant_id=user_id, depth=depth)
+        for user_id in user_ids
+        for ancestor_id, depth in _walk_up(user_id, leader_map)
+    ]
+
+
+def _leader_map() -> Dict[int, Optional[int]]:
+    return dict(User.objects.values_list("pk", "leader_id"))
+
+
+@transaction.atomic
+def rebuild_leadership_closure() -> int:
+    """Recompute the whole LeadershipClosure table from ``User.leader``. Returns rows written."""
+    leader_map = _leader_map()
+    LeadershipClosure.objects.all().delete()
+    rows = _closure_rows(leader_map.keys(), leader_map)
+    LeadershipClosure.objects.bulk_create(rows, batch_size=CLOSURE_BATCH_SIZE)
+    return len(rows)
+
+
+@transaction.atomic
+def refresh_leadership_closure(user_ids: Iterable[int]) -> int:
+    """Recompute closure rows after the ``leader`` of *user_ids* changed.
+
+    Only the moved users and their existing reports (at any depth) gain or lose ancestors,
+    so their rows are replaced; the rest of the table is untouched.
+    """
+    user_ids = {uid for uid in user_ids if uid is not None}
+    if not user_ids:
+        return 0
+    affected = user_ids | set(
+        LeadershipClosure.objects.filter(ancestor_id__in=user_ids).values_list("descendant_id", flat=True)
+    )
+    leader_map = _leader_map()
+    # Users may have been deleted in the meantime
+    affected &= leader_map.keys()
+    LeadershipClosure.objects.filter(descendant_id__in=affected).delete()
+    rows = _closure_rows(affected, leader_map)
+    LeadershipClosure.objects.bulk_create(rows, batch_size=CLOSURE_BATCH_SIZE)
+    return len(rows)
+
+
+def is_in_leadership_chain(leader: User, member: User, max_depth: int = LEADERSHIP_MAX_DEPTH) -> bool:
+    """True if *leader* is a direct or indirect leader of *member* (``leader in member.get_leaders()``)."""
+    if leader.pk is None or member.pk is None:
+        return False
+    return LeadershipClosure.objects.filter(
+        ancestor_id=leader.pk, descendant_id=member.pk, depth__lte=max_depth
+    ).exists()
+
+
+def get_report_ids(leader: User, max_depth: int = LEADERSHIP_MAX_DEPTH) -> Set[int]:
+    """Ids of every direct and indirect report of *leader* up to *max_depth* levels down."""
+    return set(
+        LeadershipClosure.objects.filter(ancestor_id=leader.pk, depth__lte=max_depth)
+        .values_list("descendant_id", flat=True)
+    )
+
+
+def get_reports(leader: User, max_depth: int = LEADERSHIP_MAX_DEPTH):
+    """Queryset of every direct and indirect report of *leader*."""
+    return User.objects.filter(
+        ancestor_links__ancestor_id=leader.pk, ancestor_links__depth__lte=max_depth
+    )
@@ -16,20 +16,23 @@ def ensure_leader_note_accesses(self, new_leader):
     from api.models import Note, NoteUserAccess, leader_permissions
 
     notes = Note.objects.filter(type__in=leader_permissions.keys(), owner=self)
-    for note in notes:
-        NoteUserAccess.ensure_note_predefined_accesses(note)
+    NoteUserAccess.ensure_notes_predefined_accesses(notes)
 
 
 def get_notes_visible_to(user):
     """
     Returns all notes this user can view (of any type).
+
+    A correlated EXISTS on NoteUserAccess, answered from its (user, can_view, note)
+    index; each note appears once, so callers need no DISTINCT.
     """
+    from django.db.models import Exists, OuterRef
+
     from api.models import Note, NoteUserAccess
 
-    accessible_note_ids = NoteUserAccess.objects.filter(
-        user=user, can_view=True
-    ).values_list("note__uuid", flat=True)
-    return Note.objects.filter(uuid__in=accessible_note_ids)
+    return Note.objects.filter(
+        Exists(NoteUserAccess.objects.filter(user=user, can_view=True, note_id=OuterRef("pk")))
+    )
 
 def grant_oneonone_access(note):
     """Create NoteUserAccess rows for leader (note.owner) and member only."""
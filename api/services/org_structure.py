@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from django.db import connection, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+
+from api.models import OrgStructureVersion
+
+__all__ = [
+    "org_structure_version",
+    "bump_org_structure_version",
+    "invalidate_org_structure",
+]
+
+ORG_STRUCTURE_VERSION_PK = 1
+
+_pending = threading.local()
+
+
+def _stored_version() -> int:
+    version = OrgStructureVersion.objects.filter(pk=ORG_STRUCTURE_VERSION_PK).values_list("version", flat=True).first()
+    if version is None:
+        version, _ = OrgStructureVersion.objects.get_or_create(
+            pk=ORG_STRUCTURE_VERSION_PK, defaults={"version": time.time_ns()}
+        )
+        version = version.version
+    return version
+
+
+def _bump_registered() -> bool:
+    return any(func is bump_org_structure_version for _, func, _ in connection.run_on_commit)
+
+
+def org_structure_version() -> str:
+    """Current org-structure version, used to key caches derived from roles and org layout.
+
+    The version lives in the database, so a change committed by any process invalidates
+    the caches of every process. Inside a transaction with uncommitted org changes the
+    version carries a token of the latest change, so this connection does not reuse
+    payloads cached before it; the token is gone again if the transaction rolls back.
+    """
+    version = str(_stored_version())
+    if _bump_registered():
+        version = f"{version}.{_pending.token}"
+    return version
+
+
+def bump_org_structure_version() -> int:
+    """Invalidate every cache keyed by org_structure_version(). Returns the new version.
+
+    Versions are at least the current nanosecond timestamp rather than a plain counter,
+    so recreating the row cannot roll the version back onto payloads cached under an
+    older value.
+    """
+    updated = OrgStructureVersion.objects.filter(pk=ORG_STRUCTURE_VERSION_PK).update(
+        version=Greatest(F("version") + 1, Value(time.time_ns()))
+    )
+    if not updated:
+        OrgStructureVersion.objects.get_or_create(pk=ORG_STRUCTURE_VERSION_PK, defaults={"version": time.time_ns()})
+    return _stored_version()
+
+
+def invalidate_org_structure() -> None:
+    """Bump the version, once the current transaction commits if there is one.
+
+    Deferring the bump keeps the version row from being locked for the rest of a long
+    transaction (e.g. an import chunk); it is registered once per transaction however
+    many rows change.
+    """
+    if not connection.in_atomic_block:
+        bump_org_structure_version()
+        return
+    _pending.token = time.time_ns()
+    if not _bump_registered():
+        transaction.on_commit(bump_org_structure_version)
@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import csv
+import json
+import operator
 from datetime import date, datetime, timezone
-from typing import Iterable, Optional
+from functools import reduce
+from typing import Iterable, List, Optional, Tuple
 
-from django.db.models import OuterRef, Subquery, Max, Q, Exists, Count, F
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import OuterRef, Subquery, Max, Q, Exists, Count, F, Func, Value, IntegerField, CharField
+from django.utils import timezone as dj_timezone
+from persiantools.jdatetime import JalaliDate
 
 from api.models import (
     User,
@@ -14,17 +23,29 @@ from api.models import (
     Summary,
     DataAccessOverride,
     Tribe,
+    UserPerformanceState,
+    LadderCategory,
 )
-from api.services.timeline_access import can_view_timeline, has_role, TECH_LADDERS, PRODUCT_LADDERS
+from api.services.timeline_access import can_view_timeline, has_role
+from api.services.user_classification import ensure_user_classifications
 from api.models import RoleType
 from api.utils.performance_tables import get_persian_year_bounds_gregorian
-from django.db.models.functions import TruncDate, Coalesce
+from api.utils.streaming import Echo
+from django.db.models.functions import TruncDate, Coalesce, Cast
 
 __all__ = [
     "get_visible_users_for_viewer",
     "build_personnel_performance_queryset",
+    "refresh_performance_states",
+    "ensure_performance_states_fresh",
     "apply_personnel_filters",
     "apply_personnel_ordering",
+    "apply_personnel_keyset",
+    "encode_personnel_cursor",
+    "decode_personnel_cursor",
+    "personnel_cursor_values",
+    "iter_personnel_performance_csv",
+    "PERSONNEL_CSV_FIELDS",
 ]
 
 
@@ -32,11 +53,12 @@ def get_visible_users_for_viewer(viewer: User, as_of: Optional[date] = None) ->
     """Return a queryset of users visible to the viewer using coarse DB-side constraints
     derived from role scopes, with a final safety pass via can_view_timeline.
 
-    Directors are additionally filtered by ladder category using the latest SenioritySnapshot as-of.
+    Directors are additionally filtered by the ladder category of the latest SenioritySnapshot,
+    read from UserClassification. Like can_view_timeline this is the latest snapshot overall,
+    so *as_of* does not change the scope.
     CTO/VP see all technical users; CPO sees all product managers (by ladder), org-wide.
     """
     qs = User.objects.select_related("team", "team__tribe", "chapter", "department")
-    as_of = as_of or date.today()
 
     # DataAccessOverride: honor explicit overrides first
     now = datetime.now(timezone.utc)
@@ -44,37 +66,26 @@ def get_visible_users_for_viewer(viewer: User, as_of: Optional[date] = None) ->
         Q(expires_at__isnull=True) | Q(expires_at__gt=now)
     ).order_by("-date_created").first()
     if override:
-        latest_sen_ladder_code = Subquery(
-            SenioritySnapshot.objects
-            .filter(user=OuterRef("pk"), effective_date__lte=as_of)
-            .order_by("-effective_date", "-date_created")
-            .values("ladder__code")[:1]
-        )
         if override.scope == DataAccessOverride.Scope.ALL:
             return qs
+        ensure_user_classifications()
         if override.scope == DataAccessOverride.Scope.TECH:
-            return qs.annotate(_ladder_code=latest_sen_ladder_code).filter(_ladder_code__in=TECH_LADDERS)
+            return qs.filter(classification__ladder_category=LadderCategory.TECH)
         if override.scope == DataAccessOverride.Scope.PRODUCT:
-            return qs.annotate(_ladder_code=latest_sen_ladder_code).filter(_ladder_code__in=PRODUCT_LADDERS)
-
-    # Prepare latest seniority ladder code as-of (used in many branches)
-    latest_sen_ladder_code = Subquery(
-        SenioritySnapshot.objects
-        .filter(user=OuterRef("pk"), effective_date__lte=as_of)
-        .order_by("-effective_date", "-date_created")
-        .values("ladder__code")[:1]
-    )
+            return qs.filter(classification__ladder_category=LadderCategory.PRODUCT)
 
     # HR/CEO/Maintainer: unrestricted
     if has_role(viewer, {RoleType.HR_MANAGER, RoleType.CEO, RoleType.MAINTAINER}):
         return qs
 
+    # Ladder categories of the latest seniority snapshots (used in many branches)
+    ensure_user_classifications()
+
     # CTO/VP: all technical users (by ladder, chapter, or org category) + direct reports
     if has_role(viewer, {RoleType.CTO, RoleType.VP}):
         return (
-            qs.annotate(_ladder_code=latest_sen_ladder_code)
-            .filter(
-                Q(_ladder_code__in=TECH_LADDERS)
+            qs.filter(
+                Q(classification__ladder_category=LadderCategory.TECH)
                 | Q(team__category="TECH")
                 | Q(team__tribe__category="TECH")
                 | Q(chapter__name__in=["DevOps", "Front"])
@@ -85,9 +96,8 @@ def get_visible_users_for_viewer(viewer: User, as_of: Optional[date] = None) ->
     # CPO: all product managers (by ladder, chapter, or org category) + direct reports
     if has_role(viewer, {RoleType.CPO}):
         return (
-            qs.annotate(_ladder_code=latest_sen_ladder_code)
-            .filter(
-                Q(_ladder_code__in=PRODUCT_LADDERS)
+            qs.filter(
+                Q(classification__ladder_category=LadderCategory.PRODUCT)
                 | Q(team__category="PRODUCT")
                 | Q(team__tribe__category="PRODUCT")
                 | Q(chapter__name__in=["Product"])
@@ -122,11 +132,11 @@ def get_visible_users_for_viewer(viewer: User, as_of: Optional[date] = None) ->
         if not viewer_tribe_id:
             return qs.none()
 
-        tribe_scoped = qs.filter(team__tribe_id=viewer_tribe_id).annotate(_ladder_code=latest_sen_ladder_code)
+        tribe_scoped = qs.filter(team__tribe_id=viewer_tribe_id)
 
         if has_role(viewer, {RoleType.ENGINEERING_DIRECTOR}):
             return tribe_scoped.filter(
-                Q(_ladder_code__in=TECH_LADDERS)
+                Q(classification__ladder_category=LadderCategory.TECH)
                 | Q(team__category="TECH")
                 | Q(team__tribe__category="TECH")
                 | Q(chapter__name__in=["DevOps", "Front"])
@@ -135,7 +145,7 @@ def get_visible_users_for_viewer(viewer: User, as_of: Optional[date] = None) ->
 
         # Product director: tribe-scoped + direct reports
         return tribe_scoped.filter(
-            Q(_ladder_code__in=PRODUCT_LADDERS)
+            Q(classification__ladder_category=LadderCategory.PRODUCT)
             | Q(team__category="PRODUCT")
             | Q(team__tribe__category="PRODUCT")
             | Q(chapter__name__in=["Product"])
@@ -154,9 +164,187 @@ def get_visible_users_for_viewer(viewer: User, as_of: Optional[date] = None) ->
     return qs
 
 
+COMMITTEE_PROPOSAL_TYPES = ["PROMOTION", "EVALUATION", "MAPPING"]
+
+# Users processed per batch when (re)computing UserPerformanceState rows
+PERFORMANCE_STATE_BATCH_SIZE = 500
+
+
+def refresh_performance_states(user_ids: Iterable[int], today: Optional[date] = None) -> int:
+    """Recompute the UserPerformanceState projection for the given users as of *today*.
+
+    Mirrors the as-of rules of the subquery path in build_personnel_performance_queryset:
+    latest snapshot by (-effective_date, -date_created), committee effective date falling
+    back to the creation date, and committee counts bucketed by Persian year.
+    Returns the number of rows written.
+    """
+    today = today or date.today()
+    user_ids = list(dict.fromkeys(uid for uid in user_ids if uid is not None))
+    written = 0
+    for start in range(0, len(user_ids), PERFORMANCE_STATE_BATCH_SIZE):
+        chunk = user_ids[start:start + PERFORMANCE_STATE_BATCH_SIZE]
+        existing_ids = set(User.objects.filter(pk__in=chunk).values_list("pk", flat=True))
+        states = {uid: _empty_state(uid, today) for uid in chunk if uid in existing_ids}
+        if not states:
+            continue
+
+        comps = (
+            CompensationSnapshot.objects.filter(user_id__in=states.keys())
+            .order_by("user_id", "-effective_date", "-date_created")
+            .values_list("user_id", "pk", "effective_date", "bonus_percentage", "salary_change")
+        )
+        for user_id, pk, effective_date, bonus, salary_change in comps:
+            state = states[user_id]
+            if effective_date > today:
+                _push_stale_after(state, effective_date)
+                continue
+            if state.latest_comp_id is None:
+                state.latest_comp_id = pk
+            if state.last_bonus_date is None and bonus and bonus > 0:
+                state.last_bonus_date = effective_date
+                state.last_bonus_percentage = bonus
+            if state.last_salary_change_date is None and salary_change != 0:
+                state.last_salary_change_date = effective_date
+
+        for snapshot_model, attr in (
+            (SenioritySnapshot, "latest_seniority_id"),
+            (OrgAssignmentSnapshot, "latest_org_id"),
+        ):
+            rows = (
+                snapshot_model.objects.filter(user_id__in=states.keys())
+                .order_by("user_id", "-effective_date", "-date_created")
+                .values_list("user_id", "pk", "effective_date")
+            )
+            for user_id, pk, effective_date in rows:
+                state = states[user_id]
+                if snapshot_model is SenioritySnapshot:
+                    state.is_mapped = True
+                if effective_date > today:
+                    _push_stale_after(state, effective_date)
+                elif getattr(state, attr) is None:
+                    setattr(state, attr, pk)
+
+        summaries = Summary.objects.filter(
+            note__owner_id__in=states.keys(),
+            note__proposal_type__in=COMMITTEE_PROPOSAL_TYPES,
+        ).values_list("note__owner_id", "committee_date", "date_created")
+        for user_id, committee_date, date_created in summaries:
+            state = states[user_id]
+            if committee_date:
+                year = str(JalaliDate.to_jalali(committee_date).year)
+                state.committees_by_year[year] = state.committees_by_year.get(year, 0) + 1
+            effective = committee_date or (dj_timezone.localdate(date_created) if date_created else None)
+            if effective is None:
+                continue
+            if effective > today:
+                _push_stale_after(state, effective)
+            elif state.last_committee_date is None or effective > state.last_committee_date:
+                state.last_committee_date = effective
+
+        UserPerformanceState.objects.bulk_create(
+            states.values(),
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=[
+                "latest_comp",
+                "latest_seniority",
+                "latest_org",
+                "is_mapped",
+                "last_committee_date",
+                "committees_by_year",
+                "last_bonus_date",
+                "last_bonus_percentage",
+                "last_salary_change_date",
+                "stale_after",
+                "computed_on",
+                "date_updated",
+            ],
+        )
+        written += len(states)
+    return written
+
+
+def ensure_performance_states_fresh(today: Optional[date] = None) -> int:
+    """Create missing projection rows and recompute rows whose future-dated data took effect."""
+    today = today or date.today()
+    pending = User.objects.filter(
+        Q(performance_state__isnull=True) | Q(performance_state__stale_after__lte=today)
+    ).values_list("pk", flat=True)
+    return refresh_performance_states(pending, today)
+
+
+def _empty_state(user_id: int, today: date) -> UserPerformanceState:
+    return UserPerformanceState(user_id=user_id, committees_by_year={}, computed_on=today)
+
+
+def _push_stale_after(state: UserPerformanceState, effective_date: date) -> None:
+    if state.stale_after is None or effective_date < state.stale_after:
+        state.stale_after = effective_date
+
+
+def _build_current_state_queryset(viewer: User, today: date):
+    """Annotate visible users from the UserPerformanceState projection (as_of == today).
+
+    Exposes the same ``_``-prefixed annotations as the historical subquery path so filters,
+    ordering and serialization are shared.
+    """
+    cur_year = JalaliDate.to_jalali(today).year
+
+    def committees_in(year):
+        return Cast(
+            Func(
+                F("performance_state__committees_by_year"),
+                Value(str(year), output_field=CharField()),
+                function="jsonb_extract_path_text",
+                output_field=CharField(),
+            ),
+            IntegerField(),
+        )
+
+    comp = "performance_state__latest_comp__"
+    sen = "performance_state__latest_seniority__"
+    org = "performance_state__latest_org__"
+    return (
+        get_visible_users_for_viewer(viewer, today)
+        .annotate(
+            _latest_comp_id=F("performance_state__latest_comp_id"),
+            _latest_sen_id=F("performance_state__latest_seniority_id"),
+            _latest_org_id=F("performance_state__latest_org_id"),
+            _last_committee_date=F("performance_state__last_committee_date"),
+            _committees_current_year=committees_in(cur_year),
+            _committees_last_year=committees_in(cur_year - 1),
+            _last_bonus_date=F("performance_state__last_bonus_date"),
+            _last_bonus_percentage=F("performance_state__last_bonus_percentage"),
+            _last_salary_change_date=F("performance_state__last_salary_change_date"),
+            _pay_band_number=F(comp + "pay_band__number"),
+            _salary_change=F(comp + "salary_change"),
+            _ladder_code=F(sen + "ladder__code"),
+            _ladder_name=F(sen + "ladder__name"),
+            _overall_score=F(sen + "overall_score"),
+            _details_json=F(sen + "details_json"),
+            _leader_name=F(org + "leader__name"),
+            _team_name=F(org + "team__name"),
+            _team_id=F(org + "team_id"),
+            _tribe_name=F(org + "team__tribe__name"),
+            _tribe_id=F(org + "team__tribe_id"),
+            _seniority_level=F(sen + "seniority_level"),
+            _is_mapped=Coalesce(F("performance_state__is_mapped"), Value(False)),
+        )
+        .select_related("team", "leader", "team__tribe")
+    )
+
+
 def build_personnel_performance_queryset(viewer: User, as_of: Optional[date]):
-    """Build a queryset annotated with latest as-of metrics for the personnel performance table."""
-    as_of = as_of or date.today()
+    """Build a queryset annotated with latest as-of metrics for the personnel performance table.
+
+    Current-date requests read the maintained UserPerformanceState projection; historical
+    as-of dates fall back to correlated subqueries over the snapshot tables.
+    """
+    today = date.today()
+    as_of = as_of or today
+    if as_of == today:
+        ensure_performance_states_fresh(today)
+        return _build_current_state_queryset(viewer, today)
 
     # Compute Persian year bounds for current and last years based on as_of
     cur_start, cur_end = get_persian_year_bounds_gregorian(as_of)
@@ -205,7 +393,7 @@ def build_personnel_performance_queryset(viewer: User, as_of: Optional[date]):
 
     # Counts of committees in current and last Persian years
     # Include NOTICE events (which use ProposalType.EVALUATION) in committee calculations
-    committee_types = ["PROMOTION", "EVALUATION", "MAPPING"]
+    committee_types = COMMITTEE_PROPOSAL_TYPES
     committees_current_year = Subquery(
         Summary.objects.filter(
             note__owner=OuterRef("pk"),
@@ -396,33 +584,44 @@ def apply_personnel_filters(qs, params: dict):
     return qs
 
 
-def apply_personnel_ordering(qs, ordering_param: Optional[str]):
-    """Order the annotated queryset by supported fields.
-    Supports comma-separated fields with optional '-' prefix for descending.
-    """
-    if not ordering_param:
-        return qs.order_by("name")
+PERSONNEL_ORDERING_MAP = {
+    "name": "name",
+    "pay_band": "_pay_band_number",
+    "last_committee_date": "_last_committee_date",
+    "committees_current_year": "_committees_current_year",
+    "committees_last_year": "_committees_last_year",
+    "overall_level": "_overall_score",
+    "team": "_team_name",
+    "leader": "_leader_name",
+    "tribe": "_tribe_name",
+    "ladder": "_ladder_name",
+    "last_bonus_percentage": "_last_bonus_percentage",
+    "is_mapped": "_is_mapped",
+    "last_bonus_date": "_last_bonus_date",
+    "last_salary_change_date": "_last_salary_change_date",
+    "salary_change": "_salary_change",
+}
+
+# Numeric fields keep NULLs last in both directions
+NULLS_LAST_ORDERING_FIELDS = [
+    "_pay_band_number",
+    "_last_bonus_percentage",
+    "_overall_score",
+    "_salary_change",
+    "_committees_current_year",
+    "_committees_last_year",
+]
 
-    ordering_map = {
-        "name": "name",
-        "pay_band": "_pay_band_number",
-        "last_committee_date": "_last_committee_date",
-        "committees_current_year": "_committees_current_year",
-        "committees_last_year": "_committees_last_year",
-        "overall_level": "_overall_score",
-        "team": "_team_name",
-        "leader": "_leader_name",
-        "tribe": "_tribe_name",
-        "ladder": "_ladder_name",
-        "last_bonus_percentage": "_last_bonus_percentage",
-        "is_mapped": "_is_mapped",
-        "last_bonus_date": "_last_bonus_date",
-        "last_salary_change_date": "_last_salary_change_date",
-        "salary_change": "_salary_change",
-    }
 
-    order_by_clauses = []
-    for token in ordering_param.split(","):
+def personnel_ordering_keys(ordering_param: Optional[str]) -> List[Tuple[F, bool, bool]]:
+    """Return the sort keys for *ordering_param* as ``[(expression, descending, nulls_last), ...]``.
+
+    Supports comma-separated fields with optional '-' prefix for descending. The last key is
+    always ``id`` so the ordering is total. Other fields sort NULLs like Postgres does by
+    default (last when ascending, first when descending).
+    """
+    keys = []
+    for token in (ordering_param or "").split(","):
         token = token.strip()
         if not token:
             continue
@@ -431,35 +630,165 @@ def apply_personnel_ordering(qs, ordering_param: Optional[str]):
 
         if key.startswith("aspect_"):
             aspect_code = key.split("_", 1)[1]
-            field_expression = F(f"_details_json__{aspect_code}")
-            if desc:
-                order_by_clauses.append(field_expression.desc(nulls_last=True))
-            else:
-                order_by_clauses.append(field_expression.asc(nulls_last=True))
+            keys.append((F(f"_details_json__{aspect_code}"), desc, True))
             continue
 
-        field = ordering_map.get(key)
+        field = PERSONNEL_ORDERING_MAP.get(key)
         if not field:
             continue
+        keys.append((F(field), desc, field in NULLS_LAST_ORDERING_FIELDS or not desc))
+
+    if not keys:
+        keys.append((F("name"), False, True))
+
+    # id as a tie-breaker keeps LIMIT/OFFSET pages and cursors stable
+    keys.append((F("id"), False, True))
+    return keys
 
-        # Handle NULL values to come last for numeric fields
-        if field in [
-            "_pay_band_number",
-            "_last_bonus_percentage",
-            "_overall_score",
-            "_salary_change",
-            "_committees_current_year",
-            "_committees_last_year",
-        ]:
-            if desc:
-                order_by_clauses.append(F(field).desc(nulls_last=True))
-            else:
-                order_by_clauses.append(F(field).asc(nulls_last=True))
+
+def apply_personnel_ordering(qs, ordering_param: Optional[str]):
+    """Order the annotated queryset by supported fields (see personnel_ordering_keys)."""
+    return qs.order_by(*[
+        expression.desc(nulls_last=True) if desc and nulls_last
+        else expression.desc(nulls_first=True) if desc
+        else expression.asc(nulls_last=True) if nulls_last
+        else expression.asc(nulls_first=True)
+        for expression, desc, nulls_last in personnel_ordering_keys(ordering_param)
+    ])
+
+
+def encode_personnel_cursor(ordering_param: Optional[str], values: list) -> str:
+    payload = json.dumps({"ordering": ordering_param or "", "after": values}, cls=DjangoJSONEncoder)
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_personnel_cursor(cursor: str, ordering_param: Optional[str]) -> list:
+    """Return the sort key values stored in *cursor*. Raises ValueError if it is malformed or
+    was issued for a different ordering."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        values = payload["after"]
+        ordering = payload["ordering"]
+    except (TypeError, KeyError, ValueError, binascii.Error) as exc:
+        raise ValueError("Malformed cursor") from exc
+    if ordering != (ordering_param or "") or not isinstance(values, list):
+        raise ValueError("Cursor does not match the requested ordering")
+    if len(values) != len(personnel_ordering_keys(ordering_param)):
+        raise ValueError("Malformed cursor")
+    return values
+
+
+def apply_personnel_keyset(qs, ordering_param: Optional[str], after: Optional[list] = None):
+    """Annotate the sort keys as ``_cursor_<i>`` and, when *after* is given, keep only rows
+    sorting after it (the keyset predicate for cursor pagination).
+
+    The returned queryset is not ordered; combine it with apply_personnel_ordering.
+    """
+    keys = personnel_ordering_keys(ordering_param)
+    qs = qs.annotate(**{f"_cursor_{i}": expression for i, (expression, _, _) in enumerate(keys)})
+    if after is None:
+        return qs
+
+    branches = []
+    equal = Q()
+    for i, ((_, desc, nulls_last), value) in enumerate(zip(keys, after)):
+        name = f"_cursor_{i}"
+        if value is None:
+            # NULLs sort last: nothing non-null follows; NULLs sort first: every non-null follows
+            following = None if nulls_last else Q(**{f"{name}__isnull": False})
+            same = Q(**{f"{name}__isnull": True})
         else:
-            # For non-numeric fields, use regular ordering
-            order_by_clauses.append(("-" if desc else "") + field)
+            following = Q(**{f"{name}__{'lt' if desc else 'gt'}": value})
+            if nulls_last:
+                following |= Q(**{f"{name}__isnull": True})
+            same = Q(**{name: value})
+        if following is not None:
+            branches.append(equal & following)
+        equal &= same
+
+    if not branches:
+        return qs.none()
+    return qs.filter(reduce(operator.or_, branches))
+
+
+def personnel_cursor_values(row, ordering_param: Optional[str]) -> list:
+    return [getattr(row, f"_cursor_{i}") for i in range(len(personnel_ordering_keys(ordering_param)))]
+
+PERSONNEL_CSV_FIELDS = [
+    "uuid",
+    "name",
+    "last_committee_date",
+    "committees_current_year",
+    "committees_last_year",
+    "pay_band",
+    "salary_change",
+    "is_mapped",
+    "last_bonus_date",
+    "last_bonus_percentage",
+    "last_salary_change_date",
+    "ladder",
+    "ladder_levels",
+    "overall_level",
+    "seniority_level",
+    "leader",
+    "team",
+    "tribe",
+]
+
+CSV_EXPORT_CHUNK_SIZE = 500
 
-    if not order_by_clauses:
-        return qs.order_by("name")
 
-    return qs.order_by(*order_by_clauses) 
\ No newline at end of file
+def iter_personnel_performance_csv(qs, chunk_size: int = CSV_EXPORT_CHUNK_SIZE):
+    """Yield the personnel performance CSV line by line.
+
+    Rows are read as plain ``.values()`` dicts through a server-side cursor, so memory stays
+    bounded by *chunk_size* regardless of how many users are exported.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(PERSONNEL_CSV_FIELDS)
+
+    rows = qs.values(
+        "uuid",
+        "name",
+        "email",
+        "_last_committee_date",
+        "_committees_current_year",
+        "_committees_last_year",
+        "_pay_band_number",
+        "_salary_change",
+        "_is_mapped",
+        "_last_bonus_date",
+        "_last_bonus_percentage",
+        "_last_salary_change_date",
+        "_ladder_code",
+        "_details_json",
+        "_overall_score",
+        "_seniority_level",
+        "_leader_name",
+        "_team_name",
+        "_tribe_name",
+        "leader__name",
+        "team__name",
+        "team__tribe__name",
+    ).iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield writer.writerow([
+            str(row["uuid"]),
+            row["name"] or row["email"],
+            row["_last_committee_date"],
+            row["_committees_current_year"] or 0,
+            row["_committees_last_year"] or 0,
+            row["_pay_band_number"],
+            row["_salary_change"],
+            bool(row["_is_mapped"]),
+            row["_last_bonus_date"],
+            row["_last_bonus_percentage"],
+            row["_last_salary_change_date"],
+            row["_ladder_code"],
+            row["_details_json"] if row["_details_json"] is not None else {},
+            row["_overall_score"],
+            row["_seniority_level"],
+            row["_leader_name"] or row["leader__name"],
+            row["_team_name"] or row["team__name"],
+            row["_tribe_name"] or row["team__tribe__name"],
+        ])
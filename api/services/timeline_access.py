@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from typing import Set, TYPE_CHECKING
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional, Set, Tuple, TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import cache
 
 if TYPE_CHECKING:
     from api.models import User, RoleType
@@ -42,7 +46,16 @@ PRODUCT_LADDERS: Set[str] = {
 }
 
 
-__all__ = ["can_view_timeline", "has_role", "TECH_LADDERS", "PRODUCT_LADDERS"]
+__all__ = [
+    "can_view_timeline",
+    "resolve_visible_users",
+    "resolve_visible_user_ids",
+    "has_role",
+    "RoleSet",
+    "invalidate_role_sets",
+    "TECH_LADDERS",
+    "PRODUCT_LADDERS",
+]
 
 
 # -----------------------------------------------------------------------------
@@ -79,7 +92,9 @@ def can_view_timeline(viewer: "User", target: "User") -> bool:
         return True
 
     # 2) Viewer is in target's leadership chain
-    if viewer in target.get_leaders():
+    from api.services.leadership import is_in_leadership_chain  # local import
+
+    if is_in_leadership_chain(viewer, target):
         return True
 
     # 3) Executive rules
@@ -127,6 +142,65 @@ def can_view_timeline(viewer: "User", target: "User") -> bool:
     return False
 
 
+def resolve_visible_users(viewer: "User"):
+    """Queryset of every user whose timeline *viewer* may read.
+
+    Set-based equivalent of calling can_view_timeline(viewer, target) for every user:
+    roles are resolved once, the leadership subtree comes from LeadershipClosure and the
+    tech/product/finance rules are indexed predicates on UserClassification. Filter with
+    ``pk__in=resolve_visible_users(viewer).values("pk")`` so the scope runs as a subquery
+    instead of shipping the ids to the database.
+    """
+    from django.db.models import Q
+    from api.models import LeadershipClosure, RoleType, Tribe, User
+    from api.services.leadership import LEADERSHIP_MAX_DEPTH
+    from api.services.user_classification import ensure_user_classifications
+
+    if has_role(viewer, {RoleType.HR_MANAGER, RoleType.CEO}):
+        return User.objects.all()
+
+    is_eng_director = has_role(viewer, {RoleType.ENGINEERING_DIRECTOR})
+    is_product_director = has_role(viewer, {RoleType.PRODUCT_DIRECTOR})
+
+    # Same precedence as can_view_timeline: the first matching executive rule decides
+    scope = None
+    if has_role(viewer, {RoleType.CTO, RoleType.VP}):
+        scope = Q(classification__is_technical=True)
+    elif has_role(viewer, {RoleType.CFO}):
+        scope = Q(classification__is_finance=True)
+    else:
+        viewer_tribe = None
+        if is_eng_director or is_product_director:
+            viewer_tribe = getattr(getattr(viewer.team, "tribe", None), "pk", None)
+            if not viewer_tribe:
+                director_field = "engineering_director" if is_eng_director else "product_director"
+                viewer_tribe = (
+                    Tribe.objects.filter(**{director_field: viewer}).values_list("pk", flat=True).first()
+                )
+        if viewer_tribe:
+            category = "is_technical" if is_eng_director else "is_product"
+            scope = Q(team__tribe_id=viewer_tribe, **{f"classification__{category}": True})
+        if has_role(viewer, {RoleType.CPO}):
+            # Directors of another tribe fall through to the CPO rule
+            cpo_scope = Q(classification__is_product=True)
+            if viewer_tribe:
+                cpo_scope &= ~Q(team__tribe_id=viewer_tribe)
+            scope = cpo_scope if scope is None else scope | cpo_scope
+
+    # Self plus direct and indirect reports, bounded like User.get_leaders()
+    reports = LeadershipClosure.objects.filter(ancestor_id=viewer.pk, depth__lte=LEADERSHIP_MAX_DEPTH)
+    visibility = Q(pk=viewer.pk) | Q(agile_coach_id=viewer.pk) | Q(pk__in=reports.values("descendant_id"))
+    if scope is not None:
+        ensure_user_classifications()
+        visibility |= scope
+    return User.objects.filter(visibility)
+
+
+def resolve_visible_user_ids(viewer: "User") -> Set[int]:
+    """Ids of resolve_visible_users(*viewer*), for per-object checks in Python."""
+    return set(resolve_visible_users(viewer).values_list("pk", flat=True))
+
+
 # -----------------------------------------------------------------------------
 # Internal helpers
 # -----------------------------------------------------------------------------
@@ -135,62 +209,146 @@ def has_role(user: "User", role_types: Set["RoleType"]) -> bool:
     """Return True if *user* holds **any** of the given role_types, determined by FK fields on
     Organization, Tribe, Team or Chapter models. The lookup follows the naming convention used in
     Role.clean(): role_type English label lower-cased, spaces replaced with underscores.
+
+    Roles are resolved once per user via RoleSet; later calls are set lookups.
     """
+    return RoleSet.for_user(user).has_any(role_types)
 
-    from api.models import Organization, Tribe, Team, Chapter  # local import
 
-    normalized_attrs = {rt.value.lower().replace(" ", "_") for rt in role_types}
+# -----------------------------------------------------------------------------
+# Role cache
+# -----------------------------------------------------------------------------
 
-    # Return mapping of role attrs present on the model to the user.
-    def _subset(model):
-        fields = {f.name for f in model._meta.get_fields()}
-        return {attr: user for attr in normalized_attrs if attr in fields}
+ROLE_SET_CACHE_PREFIX = "roleset"
 
-    org_q = _subset(Organization)
-    if org_q and Organization.objects.filter(_combine_q(org_q)).exists():
-        return True
+# Bumped on every invalidation in this process so RoleSets memoized on long-lived user
+# objects (e.g. in shells or tests) are not reused after an org-structure change.
+_role_set_generation = 0
 
-    tribe_q = _subset(Tribe)
-    if tribe_q and Tribe.objects.filter(_combine_q(tribe_q)).exists():
-        return True
 
-    # Team / Chapter leader (attribute is always 'leader')
-    if "leader" in normalized_attrs:
-        if Team.objects.filter(leader=user).exists() or Chapter.objects.filter(leader=user).exists():
-            return True
+def _role_attr(role_type) -> str:
+    return role_type.value.lower().replace(" ", "_")
 
-    return False
+
+@lru_cache(maxsize=1)
+def _role_fields() -> Tuple[Tuple[type, str], ...]:
+    """(model, field) pairs whose FK to User grants the role named like the field."""
+    from api.models import Organization, Tribe, Team, Chapter, RoleType  # local import
+
+    role_attrs = {_role_attr(rt) for rt in RoleType}
+    return tuple(
+        (model, field.name)
+        for model in (Organization, Tribe, Team, Chapter)
+        for field in model._meta.get_fields()
+        if field.name in role_attrs and field.many_to_one
+    )
 
 
-def _combine_q(attr_dict):
-    """Helper: attr→user mapping to big OR Q object."""
-    from django.db.models import Q  # local import to avoid global dependency if not needed
+class RoleSet:
+    """Every role attribute a user holds on Organization, Tribe, Team or Chapter.
 
-    q = Q()
-    for field_name, value in attr_dict.items():
-        q |= Q(**{field_name: value})
-    return q
+    Computed with one UNION query, shared across requests through Django's cache (keyed by
+    the database-backed org-structure version, so changes committed by any process drop it)
+    and memoized on the user object for the lifetime of the request.
+    """
+
+    def __init__(self, user_id: Optional[int], attrs: Iterable[str]):
+        self.user_id = user_id
+        self.attrs: FrozenSet[str] = frozenset(attrs)
+
+    def __repr__(self):
+        return f"RoleSet({self.user_id}, {sorted(self.attrs)})"
+
+    def has_any(self, role_types: Iterable["RoleType"]) -> bool:
+        return any(_role_attr(rt) in self.attrs for rt in role_types)
+
+    @staticmethod
+    def cache_key(user_id: int) -> str:
+        from api.services.org_structure import org_structure_version  # local import
+
+        return f"{ROLE_SET_CACHE_PREFIX}:{org_structure_version()}:{user_id}"
+
+    @classmethod
+    def compute(cls, user_id: Optional[int]) -> "RoleSet":
+        if user_id is None:
+            return cls(None, ())
+        from django.db.models import CharField, Value  # local import
+
+        queries = [
+            model.objects.filter(**{field_name: user_id})
+            .order_by()
+            .annotate(_role=Value(field_name, output_field=CharField()))
+            .values_list("_role", flat=True)
+            for model, field_name in _role_fields()
+        ]
+        return cls(user_id, queries[0].union(*queries[1:]))
+
+    @classmethod
+    def for_user(cls, user: "User") -> "RoleSet":
+        memo = getattr(user, "_role_set", None)
+        if memo is not None and memo[0] == _role_set_generation:
+            return memo[1]
+
+        user_id = getattr(user, "pk", None)
+        if user_id is None:
+            role_set = cls.compute(None)
+        else:
+            key = cls.cache_key(user_id)
+            attrs = cache.get(key)
+            if attrs is None:
+                role_set = cls.compute(user_id)
+                cache.set(key, role_set.attrs, getattr(settings, "ROLE_SET_CACHE_TIMEOUT", 300))
+            else:
+                role_set = cls(user_id, attrs)
+
+        try:
+            user._role_set = (_role_set_generation, role_set)
+        except AttributeError:
+            pass  # e.g. objects with __slots__; fall back to the shared cache only
+        return role_set
+
+
+def invalidate_role_sets() -> None:
+    """Drop RoleSets memoized on user objects of this process after a role-holding FK changed.
+
+    Shared cache entries need no eviction: the same change bumps the org-structure version.
+    """
+    global _role_set_generation
+    _role_set_generation += 1
 
 
 def _is_technical(user: "User") -> bool:
     """Heuristic: user has latest SenioritySnapshot ladder in TECH_LADDERS, chapter name matches, or team/tribe has TECH category.
-    Excludes product managers even if they're in TECH teams by checking for product ladder."""
-    from api.models import SenioritySnapshot
+    Excludes product managers even if they're in TECH teams by checking for product ladder.
+    Read from the denormalized UserClassification row (see _classify_technical)."""
+    from api.services.user_classification import get_user_classification  # local import
 
-    latest_snap = (
-        SenioritySnapshot.objects.filter(user=user).order_by("-effective_date", "-date_created").first()
-    )
-    
+    classification = get_user_classification(user)
+    return bool(classification and classification.is_technical)
+
+
+def _is_product(user: "User") -> bool:
+    """Heuristic: user has latest SenioritySnapshot ladder in PRODUCT_LADDERS, chapter name matches, or team/tribe has PRODUCT category.
+    Read from the denormalized UserClassification row (see _classify_product)."""
+    from api.services.user_classification import get_user_classification  # local import
+
+    classification = get_user_classification(user)
+    return bool(classification and classification.is_product)
+
+
+def _classify_technical(ladder_code, chapter_name, team_category, tribe_category) -> bool:
+    """Column-level form of _is_technical, used to compute UserClassification rows.
+    *ladder_code* is the code of the latest snapshot's ladder, or None without ladder data."""
     # If user has ladder data, use that (most reliable)
-    if latest_snap and latest_snap.ladder:
-        if latest_snap.ladder.code in TECH_LADDERS:
+    if ladder_code is not None:
+        if ladder_code in TECH_LADDERS:
             return True
         # If they have a product ladder, they're NOT technical (even if in TECH team)
-        if latest_snap.ladder.code in PRODUCT_LADDERS:
+        if ladder_code in PRODUCT_LADDERS:
             return False
-    
+
     # Enhanced chapter-based filtering (secondary check)
-    chapter_name = getattr(user.chapter, "name", "")
+    chapter_name = chapter_name or ""
     if chapter_name:
         # Technical chapters
         tech_chapters = {"DevOps", "Front"}
@@ -200,36 +358,30 @@ def _is_technical(user: "User") -> bool:
         product_chapters = {"Product"}
         if any(keyword in chapter_name for keyword in product_chapters):
             return False
-    
+
     # Fallback: check if chapter name matches TECH_LADDERS
     if chapter_name in TECH_LADDERS:
         return True
-    
+
     # Check team or tribe category (only if no ladder data exists)
     # This ensures product managers with ladder data are excluded
-    if not latest_snap or not latest_snap.ladder:
-        if user.team and user.team.category == "TECH":
+    if ladder_code is None:
+        if team_category == "TECH":
             return True
-        if user.tribe and user.tribe.category == "TECH":
+        if tribe_category == "TECH":
             return True
 
     return False
 
 
-def _is_product(user: "User") -> bool:
-    """Heuristic: user has latest SenioritySnapshot ladder in PRODUCT_LADDERS, chapter name matches, or team/tribe has PRODUCT category."""
-    from api.models import SenioritySnapshot
-
-    latest_snap = (
-        SenioritySnapshot.objects.filter(user=user).order_by("-effective_date", "-date_created").first()
-    )
-    
+def _classify_product(ladder_code, chapter_name, team_category, tribe_category) -> bool:
+    """Column-level form of _is_product; see _classify_technical."""
     # If user has ladder data, use that (most reliable)
-    if latest_snap and latest_snap.ladder and latest_snap.ladder.code in PRODUCT_LADDERS:
+    if ladder_code is not None and ladder_code in PRODUCT_LADDERS:
         return True
 
     # Enhanced chapter-based filtering (prioritized for new employees)
-    chapter_name = getattr(user.chapter, "name", "")
+    chapter_name = chapter_name or ""
     if chapter_name:
         # Product chapters (explicitly include)
         product_chapters = {"Product"}
@@ -241,9 +393,9 @@ def _is_product(user: "User") -> bool:
             return False
 
     # Check team or tribe category (fallback)
-    if user.team and user.team.category == "PRODUCT":
+    if team_category == "PRODUCT":
         return True
-    if user.tribe and user.tribe.category == "PRODUCT":
+    if tribe_category == "PRODUCT":
         return True
 
     return False
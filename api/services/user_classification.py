@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.db.models import OuterRef, Subquery
+
+from api.models import LadderCategory, SenioritySnapshot, User, UserClassification
+from api.services.timeline_access import (
+    PRODUCT_LADDERS,
+    TECH_LADDERS,
+    _classify_product,
+    _classify_technical,
+)
+
+__all__ = [
+    "refresh_user_classifications",
+    "ensure_user_classifications",
+    "get_user_classification",
+]
+
+CLASSIFICATION_BATCH_SIZE = 1000
+
+
+def _ladder_category(ladder_code) -> str:
+    if ladder_code in TECH_LADDERS:
+        return LadderCategory.TECH
+    if ladder_code in PRODUCT_LADDERS:
+        return LadderCategory.PRODUCT
+    return LadderCategory.OTHER
+
+
+def refresh_user_classifications(user_ids: Iterable[int]) -> int:
+    """Recompute UserClassification rows for *user_ids*. Returns the number of rows written.
+
+    Uses the latest SenioritySnapshot overall (like can_view_timeline), not an as-of date.
+    """
+    user_ids = list(dict.fromkeys(uid for uid in user_ids if uid is not None))
+    latest = SenioritySnapshot.objects.filter(user=OuterRef("pk")).order_by("-effective_date", "-date_created")
+    written = 0
+    for start in range(0, len(user_ids), CLASSIFICATION_BATCH_SIZE):
+        rows = (
+            User.objects.filter(pk__in=user_ids[start:start + CLASSIFICATION_BATCH_SIZE])
+            .annotate(
+                _ladder_id=Subquery(latest.values("ladder_id")[:1]),
+                _ladder_code=Subquery(latest.values("ladder__code")[:1]),
+            )
+            .values_list(
+                "pk",
+                "_ladder_id",
+                "_ladder_code",
+                "chapter__name",
+                "team__category",
+                "team__tribe__category",
+                "team__tribe__name",
+            )
+        )
+        classifications = []
+        for pk, ladder_id, ladder_code, chapter_name, team_cat, tribe_cat, tribe_name in rows:
+            classification = (ladder_code, chapter_name, team_cat, tribe_cat)
+            classifications.append(
+                UserClassification(
+                    user_id=pk,
+                    latest_ladder_id=ladder_id,
+                    ladder_category=_ladder_category(ladder_code),
+                    is_technical=_classify_technical(*classification),
+                    is_product=_classify_product(*classification),
+                    is_finance=tribe_name == "Finance",
+                )
+            )
+        UserClassification.objects.bulk_create(
+            classifications,
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=[
+                "latest_ladder",
+                "ladder_category",
+                "is_technical",
+                "is_product",
+                "is_finance",
+                "date_updated",
+            ],
+        )
+        written += len(classifications)
+    return written
+
+
+def ensure_user_classifications() -> int:
+    """Compute rows for users that have none (new users, bulk_create, invalidated rows)."""
+    return refresh_user_classifications(
+        User.objects.filter(classification__isnull=True).values_list("pk", flat=True)
+    )
+
+
+def get_user_classification(user: User) -> UserClassification:
+    """Fresh UserClassification for *user*, computed on the spot if it is missing."""
+    classification = UserClassification.objects.filter(user_id=user.pk).first()
+    if classification is None:
+        refresh_user_classifications([user.pk])
+        classification = UserClassification.objects.filter(user_id=user.pk).first()
+    return classification
@@ -1,8 +1,9 @@
 import re
-from django.db.models.signals import m2m_changed, post_save, pre_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 from django.contrib.contenttypes.models import ContentType
+from datetime import date
 from decimal import Decimal
 
 from .models import (
@@ -10,19 +11,24 @@ from .models import (
     Note,
     NoteType,
     NoteUserAccess,
+    FeedbackRequestUserLink,
     Summary,
     SummarySubmitStatus,
     NoteSubmitStatus,
     User,
     Form,
-    FormAssignment,
     OneOnOne,
     ValueTag,
     ProposalType,
     Notice,
+    Ladder,
     LadderStage,
     LadderAspect,
+    LadderLevel,
     Team,
+    Organization,
+    Tribe,
+    Chapter,
 )
 
 from api.models import OrgAssignmentSnapshot
@@ -38,6 +44,16 @@ from api.models.timeline import (
 )
 from api.serializers.note import get_current_user
 from api.services import grant_feedback_access, grant_feedback_request_access
+from api.services.acl_queue import enqueue_acl_recompute
+from api.services.inbox import mark_inbox_dirty
+from api.services.form_assignment import schedule_default_form_assignment
+from api.services.performance_tables import refresh_performance_states
+from api.services.timeline_access import invalidate_role_sets
+from api.services.leadership import refresh_leadership_closure
+from api.services.user_classification import refresh_user_classifications
+from api.services.org_structure import invalidate_org_structure
+from api.utils.timeline import invalidate_ladder_aspect_info
+from api.models import UserPerformanceState, UserClassification, Role, DataAccessOverride
 
 
 # ────────────────────────────────────────────────────────────────
@@ -54,12 +70,15 @@ def ensure_note_predefined_access(sender, instance, created, **kwargs):
 
 
 @receiver(m2m_changed, sender=Committee.members.through)
-def handle_committee_members_changed(sender, instance, action, pk_set, **kwargs):
-    changed_users = User.objects.filter(committee=instance)
-    for user in changed_users:
-        notes = Note.objects.filter(type=NoteType.Proposal, owner=user)
-        for note in notes:
-            NoteUserAccess.ensure_note_predefined_accesses(note)
+def handle_committee_members_changed(sender, instance, action, pk_set, reverse=False, **kwargs):
+    """Members of a committee gain access to the notes of every user of that committee."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    # user.committee_members.add(...) passes the committees in pk_set
+    committee_ids = (pk_set or set()) if reverse else {instance.pk}
+    enqueue_acl_recompute(
+        user_ids=User.objects.filter(committee_id__in=committee_ids).values_list("pk", flat=True)
+    )
 
 
 @receiver(m2m_changed, sender=Note.mentioned_users.through)
@@ -99,7 +118,7 @@ def handle_mentioned_users_changed(sender, instance, action, pk_set, **kwargs):
         return
     
     # For all other note types, use the default access granting logic
-    NoteUserAccess.ensure_note_predefined_accesses(instance)
+    enqueue_acl_recompute(note_ids=[instance.pk])
 
 
 @receiver(m2m_changed, sender=Committee.roles.through)
@@ -108,14 +127,7 @@ def handle_committee_roles_changed(sender, instance, action, **kwargs):
     if action not in ("post_add", "post_remove", "post_clear"):
         return
 
-    from api.models import NoteType, NoteSubmitStatus  # local import to avoid circular
-
-    affected_users = instance.committee_users.all()
-    for user in affected_users:
-        notes = user.note_set.filter(type=NoteType.Proposal,
-                                     submit_status__in=[NoteSubmitStatus.PENDING, NoteSubmitStatus.REVIEWED])
-        for note in notes:
-            NoteUserAccess.ensure_note_predefined_accesses(note)
+    enqueue_acl_recompute(user_ids=instance.committee_users.values_list("pk", flat=True))
 
 
 @receiver(post_save, sender=Summary)
@@ -125,6 +137,36 @@ def ensure_summary_predefined_access(sender, instance, created, **kwargs):
         instance.note.save()
 
 
+# ────────────────────────────────────────────────────────────────
+# Inbox counters
+# ----------------------------------------------------------------
+
+
+@receiver(m2m_changed, sender=Note.read_by.through)
+def mark_inbox_dirty_on_read_change(sender, instance, action, pk_set, reverse=False, **kwargs):
+    """Reading or unreading notes changes the unread counters of the reader."""
+    if action == "pre_clear" and not reverse:
+        # note.read_by.clear(): remember the readers, pk_set is empty on post_clear
+        instance._inbox_readers = list(instance.read_by.values_list("pk", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        mark_inbox_dirty([instance.pk])
+    elif action == "post_clear":
+        mark_inbox_dirty(getattr(instance, "_inbox_readers", ()))
+    else:
+        mark_inbox_dirty(pk_set or ())
+
+
+@receiver(post_save, sender=NoteUserAccess)
+@receiver(post_delete, sender=NoteUserAccess)
+@receiver(post_save, sender=FeedbackRequestUserLink)
+@receiver(post_delete, sender=FeedbackRequestUserLink)
+def mark_inbox_dirty_on_grant_change(sender, instance, **kwargs):
+    mark_inbox_dirty([instance.user_id])
+
+
 # ────────────────────────────────────────────────────────────────
 # Assessment form assignment
 # ----------------------------------------------------------------
@@ -134,53 +176,15 @@ def assign_default_forms(sender, instance, created, **kwargs):
     """
     Automatically assign default forms to users when a form is marked default,
     and its cycle is active. Prevent duplicate assignments.
+
+    Assignments are created after commit by a FormAssignmentJob, see
+    api.services.form_assignment.
     """
     if not instance.is_default:  # Skip non-default forms
         return
 
-    if instance.is_default and instance.cycle.is_active:
-        users = User.objects.all()
-        assignments = []
-        affected_users = []
-        skipped_users = []
-
-        for user in users:
-            # Check if the user is already assigned to this form
-            if FormAssignment.objects.filter(form=instance, assigned_to=user).exists():
-                skipped_users.append(user)
-                continue
-
-            assigned_by = None
-
-            if instance.form_type == Form.FormType.TL:
-                leaders = user.get_leaders()
-                if not leaders:
-                    skipped_users.append(user)
-                    continue
-
-                affected_users.append(user)
-
-            elif instance.form_type == Form.FormType.PM:
-                # PM forms require manual assignment for now            FUTURE ENHANCEMENT: dynamic assignment for PMs
-                skipped_users.append(user)
-                continue
-
-            else:
-                skipped_users.append(user)
-                assigned_by = None
-
-        # Run the query only for affected_users
-        assignments = [
-            FormAssignment(
-                form=instance,
-                assigned_to=user,
-                assigned_by=user.get_leaders()[0] if user.get_leaders() else None,
-                deadline=instance.cycle.end_date
-            )
-            for user in affected_users
-        ]
-
-        FormAssignment.objects.bulk_create(assignments)
+    if instance.cycle.is_active:
+        schedule_default_form_assignment(instance)
 
 
 # This is for future-proofing DB integrity
@@ -786,6 +790,17 @@ def capture_org_assignment_on_user_change(sender, instance: User, **kwargs):
     )
 
 
+@receiver(pre_delete, sender=User)
+def capture_reports_before_user_delete(sender, instance: User, **kwargs):
+    """Deleting a leader SET_NULLs their reports' leader without calling User.save."""
+    instance._direct_report_ids = list(User.objects.filter(leader=instance).values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=User)
+def refresh_leadership_closure_on_user_delete(sender, instance: User, **kwargs):
+    refresh_leadership_closure(getattr(instance, "_direct_report_ids", []))
+
+
 @receiver(pre_save, sender=Team)
 def capture_org_assignment_on_team_tribe_change(sender, instance: Team, **kwargs):
     """Create OrgAssignmentSnapshots for all team members if the team's tribe changes."""
@@ -814,4 +829,194 @@ def capture_org_assignment_on_team_tribe_change(sender, instance: Team, **kwargs
         for m in members
     ]
     if snapshots:
-        OrgAssignmentSnapshot.objects.bulk_create(snapshots)
\ No newline at end of file
+        OrgAssignmentSnapshot.objects.bulk_create(snapshots)
+        # bulk_create bypasses post_save, so refresh the projection explicitly
+        refresh_performance_states([m.pk for m in members])
+
+
+# ────────────────────────────────────────────────────────────────
+# Personnel performance projection (UserPerformanceState)
+# ----------------------------------------------------------------
+
+
+def _mark_performance_state_stale(user_id):
+    """Flag a projection row for recomputation on the next current-date table read.
+
+    Used on deletes, where recomputing in place could race a cascading User delete.
+    """
+    if user_id is None:
+        return
+    UserPerformanceState.objects.filter(user_id=user_id).update(stale_after=date.today())
+
+
+@receiver(post_save, sender=CompensationSnapshot)
+@receiver(post_save, sender=SenioritySnapshot)
+@receiver(post_save, sender=OrgAssignmentSnapshot)
+def refresh_performance_state_on_snapshot_save(sender, instance, **kwargs):
+    refresh_performance_states([instance.user_id])
+
+
+@receiver(post_delete, sender=CompensationSnapshot)
+@receiver(post_delete, sender=SenioritySnapshot)
+@receiver(post_delete, sender=OrgAssignmentSnapshot)
+def mark_performance_state_on_snapshot_delete(sender, instance, **kwargs):
+    _mark_performance_state_stale(instance.user_id)
+
+
+@receiver(post_save, sender=Summary)
+def refresh_performance_state_on_summary_save(sender, instance: Summary, **kwargs):
+    refresh_performance_states([instance.note.owner_id])
+
+
+@receiver(post_delete, sender=Summary)
+def mark_performance_state_on_summary_delete(sender, instance: Summary, **kwargs):
+    _mark_performance_state_stale(Note.objects.filter(pk=instance.note_id).values_list("owner_id", flat=True).first())
+
+
+@receiver(post_save, sender=Note)
+def mark_performance_state_on_proposal_change(sender, instance: Note, created, **kwargs):
+    # proposal_type decides whether a summary counts as a committee
+    if not created and instance.type == NoteType.Proposal:
+        _mark_performance_state_stale(instance.owner_id)
+
+
+# ────────────────────────────────────────────────────────────────
+# Role cache invalidation (RoleSet)
+# ----------------------------------------------------------------
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_save, sender=Tribe)
+@receiver(post_save, sender=Team)
+@receiver(post_save, sender=Chapter)
+@receiver(post_delete, sender=Organization)
+@receiver(post_delete, sender=Tribe)
+@receiver(post_delete, sender=Team)
+@receiver(post_delete, sender=Chapter)
+def invalidate_role_sets_on_org_change(sender, instance, **kwargs):
+    invalidate_role_sets()
+
+
+# ────────────────────────────────────────────────────────────────
+# User classification (tech / product / finance)
+# ----------------------------------------------------------------
+
+
+def _classified_members(instance):
+    """Users whose UserClassification depends on this Team, Tribe, Chapter or Ladder."""
+    if isinstance(instance, Team):
+        return User.objects.filter(team=instance)
+    if isinstance(instance, Tribe):
+        return User.objects.filter(team__tribe=instance)
+    if isinstance(instance, Chapter):
+        return User.objects.filter(chapter=instance)
+    return User.objects.filter(classification__latest_ladder=instance)
+
+
+@receiver(post_save, sender=SenioritySnapshot)
+def refresh_classification_on_seniority_save(sender, instance, **kwargs):
+    refresh_user_classifications([instance.user_id])
+
+
+@receiver(post_delete, sender=SenioritySnapshot)
+def drop_classification_on_seniority_delete(sender, instance, **kwargs):
+    # Recomputed on the next read (ensure_user_classifications); recomputing here
+    # could race a cascading User delete, like the performance projection.
+    UserClassification.objects.filter(user_id=instance.user_id).delete()
+
+
+@receiver(post_save, sender=User)
+def refresh_classification_on_user_save(sender, instance: User, created, update_fields=None, **kwargs):
+    if update_fields is not None and not {"team", "chapter"} & set(update_fields):
+        return
+    refresh_user_classifications([instance.pk])
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_save, sender=Tribe)
+@receiver(post_save, sender=Chapter)
+@receiver(post_save, sender=Ladder)
+def refresh_classification_on_org_save(sender, instance, created, **kwargs):
+    # Categories, names and ladder codes feed the classification of every member
+    if created:
+        return
+    refresh_user_classifications(_classified_members(instance).values_list("pk", flat=True))
+
+
+@receiver(pre_delete, sender=Team)
+@receiver(pre_delete, sender=Tribe)
+@receiver(pre_delete, sender=Chapter)
+@receiver(pre_delete, sender=Ladder)
+def drop_classification_on_org_delete(sender, instance, **kwargs):
+    # Members are detached with SET_NULL updates that send no signals; recompute on next read
+    UserClassification.objects.filter(user__in=_classified_members(instance)).delete()
+
+
+# ────────────────────────────────────────────────────────────────
+# Org-structure version (cached user_permissions payloads)
+# ----------------------------------------------------------------
+
+# User fields that feed roles, scopes and the filter options of user_permissions
+ORG_STRUCTURE_USER_FIELDS = {
+    "leader", "team", "chapter", "department", "organization", "agile_coach", "name", "email",
+}
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_save, sender=Tribe)
+@receiver(post_save, sender=Team)
+@receiver(post_save, sender=Chapter)
+@receiver(post_save, sender=Committee)
+@receiver(post_save, sender=Role)
+@receiver(post_save, sender=DataAccessOverride)
+@receiver(post_save, sender=Ladder)
+@receiver(post_save, sender=SenioritySnapshot)
+@receiver(post_delete, sender=Organization)
+@receiver(post_delete, sender=Tribe)
+@receiver(post_delete, sender=Team)
+@receiver(post_delete, sender=Chapter)
+@receiver(post_delete, sender=Committee)
+@receiver(post_delete, sender=Role)
+@receiver(post_delete, sender=DataAccessOverride)
+@receiver(post_delete, sender=Ladder)
+@receiver(post_delete, sender=SenioritySnapshot)
+@receiver(post_delete, sender=User)
+@receiver(m2m_changed, sender=Committee.members.through)
+@receiver(m2m_changed, sender=Committee.roles.through)
+def bump_org_structure_version_on_change(sender, action=None, **kwargs):
+    """Org layout, roles, overrides and latest ladders (CTO/CPO scopes) all feed user_permissions."""
+    if action is None or action.startswith("post_"):
+        invalidate_org_structure()
+
+
+@receiver(pre_save, sender=User)
+def capture_org_structure_user_change(sender, instance: User, update_fields=None, **kwargs):
+    """Flag saves that change a tracked field, so logins and profile saves keep the caches."""
+    fields = ORG_STRUCTURE_USER_FIELDS if update_fields is None else ORG_STRUCTURE_USER_FIELDS & set(update_fields)
+    instance._org_structure_changed = False
+    if not instance.pk or not fields:
+        return
+    columns = [User._meta.get_field(name).attname for name in fields]
+    previous = User.objects.filter(pk=instance.pk).values(*columns).first()
+    instance._org_structure_changed = previous is None or any(
+        previous[column] != getattr(instance, column) for column in columns
+    )
+
+
+@receiver(post_save, sender=User)
+def bump_org_structure_version_on_user_save(sender, instance: User, created, **kwargs):
+    if created or getattr(instance, "_org_structure_changed", True):
+        invalidate_org_structure()
+
+
+# ────────────────────────────────────────────────────────────────
+# Ladder aspect cache (timeline level names)
+# ----------------------------------------------------------------
+
+
+@receiver(post_save, sender=LadderAspect)
+@receiver(post_save, sender=LadderLevel)
+@receiver(post_delete, sender=LadderAspect)
+@receiver(post_delete, sender=LadderLevel)
+def invalidate_ladder_aspect_info_on_change(sender, instance, **kwargs):
+    invalidate_ladder_aspect_info(instance.ladder_id)
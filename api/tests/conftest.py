@@ -0,0 +1,26 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture
+def assert_within_query_budget():
+    """Request *url* and fail if the view spends more SQL queries than its ``query_budget``.
+
+    Relies on RequestMetricsMiddleware, which attaches the request's metrics to the response.
+    """
+
+    def check(client, url, method="get", **kwargs):
+        with CaptureQueriesContext(connection) as captured:
+            response = getattr(client, method)(url, **kwargs)
+        metrics = response.request_metrics
+        assert metrics.query_budget is not None, f"{metrics.view_name} declares no query_budget"
+        if metrics.over_budget:
+            queries = "\n".join(f"{i}. {q['sql']}" for i, q in enumerate(captured.captured_queries, start=1))
+            pytest.fail(
+                f"{metrics.view_name} ran {metrics.queries} queries for {url}, "
+                f"budget is {metrics.query_budget}:\n{queries}"
+            )
+        return response
+
+    return check
@@ -0,0 +1,77 @@
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.models import ApiKey
+
+User = get_user_model()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def service_key(db):
+    cache.clear()
+    user = User.objects.create_user(
+        email="service@example.com",
+        password="password123",
+        username="service@example.com",
+    )
+    api_key = ApiKey(user=user, name="Sync")
+    key = ApiKey.generate_key()
+    api_key.set_key(key)
+    api_key.save()
+    return api_key, key
+
+
+def _get(api_client, key):
+    return api_client.get("/api/notes/", **{"X-API-Key": key})
+
+
+@pytest.mark.django_db
+def test_verified_key_skips_password_hasher(api_client, service_key):
+    api_key, key = service_key
+    with mock.patch("api.models.api_key.check_password", wraps=check_password) as check:
+        assert _get(api_client, key).status_code == 200
+        assert _get(api_client, key).status_code == 200
+        assert check.call_count == 1
+        assert _get(api_client, key[:-1] + "x").status_code == 401
+        assert check.call_count == 2
+
+
+@pytest.mark.django_db
+def test_deactivated_or_rotated_key_is_rejected_immediately(api_client, service_key):
+    api_key, key = service_key
+    assert _get(api_client, key).status_code == 200
+
+    api_key.is_active = False
+    api_key.save()
+    assert _get(api_client, key).status_code == 401
+
+    api_key.is_active = True
+    new_key = ApiKey.generate_key()
+    api_key.set_key(new_key)
+    api_key.save()
+    assert _get(api_client, key).status_code == 401
+    assert _get(api_client, new_key).status_code == 200
+
+
+@pytest.mark.django_db
+def test_last_used_written_once_per_interval(api_client, service_key):
+    api_key, key = service_key
+    with CaptureQueriesContext(connection) as captured:
+        for _ in range(3):
+            assert _get(api_client, key).status_code == 200
+    updates = [q for q in captured.captured_queries if q["sql"].startswith('UPDATE "api_apikey"')]
+    assert len(updates) == 1
+    api_key.refresh_from_db()
+    assert api_key.last_used is not None
@@ -0,0 +1,79 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from api.models import DashboardStats, Note, NoteType
+from api.models.note import NoteSubmitStatus, ProposalType
+from api.services.dashboard_stats import compute_dashboard_stats, refresh_dashboard_stats
+from merlin.dashboard import dashboard_callback
+
+User = get_user_model()
+
+
+def _user(email):
+    return User.objects.create_user(email=email, password="password123", username=email)
+
+
+def _proposal(owner, proposal_type, submit_status):
+    return Note.objects.create(
+        owner=owner,
+        title="Proposal",
+        content="p",
+        date="2025-01-01",
+        type=NoteType.Proposal,
+        proposal_type=proposal_type,
+        submit_status=submit_status,
+    )
+
+
+@pytest.mark.django_db
+def test_incremental_refresh_matches_full_recount():
+    owner = _user("owner@example.com")
+    _proposal(owner, ProposalType.PROMOTION, NoteSubmitStatus.PENDING)
+    compute_dashboard_stats()
+
+    _user("new@example.com")
+    _proposal(owner, ProposalType.NOTICE, NoteSubmitStatus.REVIEWED)
+    _proposal(owner, ProposalType.PROMOTION, NoteSubmitStatus.PENDING)
+
+    incremental = refresh_dashboard_stats()
+    full = compute_dashboard_stats()
+    assert incremental.is_incremental
+    assert incremental.metrics == full.metrics
+    assert incremental.watermarks == full.watermarks
+    assert full.metrics["total_users"] == 2
+    assert full.metrics["total_notes"] == 3
+    # Every proposal type is listed, including the ones without proposals
+    assert full.metrics["proposals_by_type"] == {
+        **{str(code): 0 for code, _ in ProposalType.choices},
+        "PROMOTION": 2,
+        "NOTICE": 1,
+    }
+    assert full.metrics["proposals_by_status"][str(NoteSubmitStatus.PENDING)]["total"] == 2
+
+
+@pytest.mark.django_db
+def test_dashboard_reads_latest_snapshot():
+    owner = _user("owner@example.com")
+    for _ in range(3):
+        _proposal(owner, ProposalType.EVALUATION, NoteSubmitStatus.REVIEWED)
+    compute_dashboard_stats()
+    request = RequestFactory().get("/admin/")
+
+    with CaptureQueriesContext(connection) as captured:
+        context = dashboard_callback(request, {})
+        list(context["latest_notes"]), list(context["latest_users"]), list(context["recent_proposals"])
+    assert len(captured.captured_queries) == 4
+    assert context["total_notes"] == 3
+    assert context["pending_proposals"] == 0
+    assert context["proposals_by_status_total"][NoteSubmitStatus.REVIEWED]["count"] == 3
+    assert context["reviewed_proposals_this_week"] == 3
+
+    _proposal(owner, ProposalType.EVALUATION, NoteSubmitStatus.PENDING)
+    assert dashboard_callback(request, {})["pending_proposals"] == 0
+    refreshed = dashboard_callback(RequestFactory().get("/admin/", {"refresh_stats": "1"}), {})
+    assert refreshed["pending_proposals"] == 1
+    assert refreshed["total_notes"] == 4
+    assert DashboardStats.objects.count() == 2
@@ -1371,3 +1371,69 @@ def test_retrieve_mentions_excludes_observer_feedback_answers(
         reverse("api:feedback-entries-detail", kwargs={"uuid": fb_uuid})
     )
     assert answer_detail_response.status_code == status.HTTP_200_OK, "User C should still have access to read the answer directly"
+
+
+@pytest.mark.django_db
+def test_inbox_summary_counters_follow_reads_and_grants(
+    api_client, user_factory, mentioned_user, django_capture_on_commit_callbacks
+):
+    user_a = user_factory()  # Request owner, receives the answer
+    user_b = user_factory()  # Requestee
+    user_c = mentioned_user  # Observer mentioned in the REQUEST
+
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.force_authenticate(user_a)
+        fr_response = api_client.post(
+            reverse("api:feedback-requests-list"),
+            {
+                "title": "Need feedback on project",
+                "content": "Please review.",
+                "requestee_emails": [user_b.email],
+                "mentioned_users": [user_c.email],
+            },
+            format="json",
+        )
+    assert fr_response.status_code == status.HTTP_201_CREATED
+
+    def summary(user):
+        api_client.force_authenticate(user)
+        response = api_client.get(reverse("api:inbox-summary"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.request_metrics.queries == 1
+        return response.data
+
+    assert summary(user_b)["pending_feedback_requests"] == 1
+    assert summary(user_c)["unread_mentions"] == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.force_authenticate(user_b)
+        fb_response = api_client.post(
+            reverse("api:feedback-entries-list"),
+            {
+                "receiver_ids": [str(user_a.uuid)],
+                "feedback_request_uuid": str(fr_response.data["uuid"]),
+                "content": "Great work on the backend!",
+            },
+            format="json",
+        )
+    assert fb_response.status_code == status.HTTP_201_CREATED
+
+    assert summary(user_b)["pending_feedback_requests"] == 0
+    # The observer gets no badge for the answer, the receiver does
+    assert summary(user_c)["unread_mentions"] == 1
+    counters = summary(user_a)
+    assert counters["unread_feedback"] == 1
+    assert counters["unread_mentions"] == 1
+    api_client.force_authenticate(user_a)
+    unread = api_client.get(reverse("api:note-list"), {"retrieve_mentions": "true", "unread": "true"})
+    assert len(unread.data) == counters["unread_mentions"]
+
+    fb_note_uuid = fb_response.data["note"]["uuid"]
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.post(reverse("api:note-mark-note-as-read", kwargs={"uuid": fb_note_uuid}))
+    assert summary(user_a)["unread_feedback"] == 0
+    assert summary(user_a)["unread_mentions"] == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.post(reverse("api:note-mark-note-as-unread", kwargs={"uuid": fb_note_uuid}))
+    assert summary(user_a)["unread_feedback"] == 1
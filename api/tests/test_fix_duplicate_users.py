@@ -0,0 +1,62 @@
+from datetime import datetime
+from io import StringIO
+
+import pytest
+import pytz
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from api.models import LeadershipClosure, Note, NoteType, NoteUserAccess, TimelineEvent
+from api.models.note import Comment
+from api.models.organization import Committee
+
+User = get_user_model()
+
+WINDOW = pytz.timezone("Asia/Tehran").localize(datetime(2025, 11, 6, 10, 12, 30))
+
+
+def _user(email, date_created):
+    user = User.objects.create_user(email=email, password="password123", username=email)
+    User.objects.filter(pk=user.pk).update(date_created=date_created)
+    return user
+
+
+@pytest.fixture
+def duplicates():
+    original = _user("jane@example.com", WINDOW.replace(year=2024))
+    duplicate = _user("Jane@example.com", WINDOW)
+    report = _user("report@example.com", WINDOW.replace(year=2024))
+    report.leader = duplicate
+    report.save()
+    author = _user("author@example.com", WINDOW.replace(year=2024))
+    note = Note.objects.create(owner=author, title="n", content="c", date="2025-01-01", type=NoteType.GOAL)
+    for user in (original, duplicate):
+        NoteUserAccess.objects.update_or_create(user=user, note=note, defaults={"can_view": True})
+        Comment.objects.create(owner=user, note=note, content=user.email)
+    committee = Committee.objects.create(name="C")
+    committee.members.add(original, duplicate)
+    TimelineEvent.objects.create(user=duplicate, event_type="NOTICE", effective_date="2024-01-01")
+    return original, duplicate, report, note
+
+
+@pytest.mark.django_db
+def test_fix_duplicate_users_merges_every_relation(duplicates):
+    original, duplicate, report, note = duplicates
+
+    out = StringIO()
+    call_command("fix_duplicate_users", date="2025-11-06 10:12", dry_run=True, stdout=out)
+    assert "api_comment: repointed=0, deduplicated=1" in out.getvalue()
+    assert "api_timelineevent: repointed=1, deduplicated=0" in out.getvalue()
+    assert User.objects.filter(pk=duplicate.pk).exists()
+
+    out = StringIO()
+    call_command("fix_duplicate_users", date="2025-11-06 10:12", stdout=out)
+    assert "deleted 1 duplicate users" in out.getvalue()
+    assert not User.objects.filter(pk=duplicate.pk).exists()
+    assert TimelineEvent.objects.get().user == original
+    assert Comment.objects.get(note=note).owner == original
+    assert NoteUserAccess.objects.filter(note=note, user=original).count() == 1
+    assert list(Committee.objects.get().members.all()) == [original]
+    report.refresh_from_db()
+    assert report.leader == original
+    assert LeadershipClosure.objects.filter(ancestor=original, descendant=report, depth=1).exists()
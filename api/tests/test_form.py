@@ -2,10 +2,12 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 from django.utils import timezone
 from datetime import timedelta, datetime, time
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from api.models import Form, FormAssignment, User, Cycle, FormResponse, Question
 from api.serializers import FormSerializer
-from api.utils import calculate_form_results
+from api.utils import aggregate_form_results, calculate_form_results
 
 
 class FormAssignedByAPITestCase(APITestCase):
@@ -125,12 +127,14 @@ class FormAssignedByAPITestCase(APITestCase):
         (Or, if it is returned, its 'assigned_by_name' is empty.)
         """
         # Create a new form with the same cycle but no assignments.
-        form_no_assignment = Form.objects.create(
-            name="No Assignment Form",
-            is_default=True,
-            form_type="TL",
-            cycle=self.cycle
-        )
+        # (default forms are assigned once the transaction commits)
+        with self.captureOnCommitCallbacks(execute=True):
+            form_no_assignment = Form.objects.create(
+                name="No Assignment Form",
+                is_default=True,
+                form_type="TL",
+                cycle=self.cycle
+            )
         url = f"/api/forms/{form_no_assignment.id}/results/?cycle_id={self.cycle.id}"
         self.client.force_authenticate(user=self.user_leader)
         response = self.client.get(url)
@@ -209,37 +213,39 @@ class FormResultsAPITestCase(APITestCase):
         self.user_leader2.save()
         self.user_leader.save()
 
-        # Create a default form (results shown after cycle.end_date)
-        self.form_default = Form.objects.create(
-            name="Default Form",
-            is_default=True,
-            form_type="TL",
-            cycle=self.cycle
-        )
+        # Default forms are assigned to users once the transaction commits
+        with self.captureOnCommitCallbacks(execute=True):
+            # Create a default form (results shown after cycle.end_date)
+            self.form_default = Form.objects.create(
+                name="Default Form",
+                is_default=True,
+                form_type="TL",
+                cycle=self.cycle
+            )
 
-        # Create a manually assigned form (results shown after assignment deadline)
-        self.form_manual = Form.objects.create(
-            name="Manual Form",
-            is_default=False,
-            form_type="PM",
-            cycle=self.cycle
-        )
+            # Create a manually assigned form (results shown after assignment deadline)
+            self.form_manual = Form.objects.create(
+                name="Manual Form",
+                is_default=False,
+                form_type="PM",
+                cycle=self.cycle
+            )
 
-        # Create a form where the assessed user is user_leader2.
-        self.form_subordinate = Form.objects.create(
-            name="Subordinate Form",
-            is_default=True,
-            form_type="TL",
-            cycle=self.cycle
-        )
+            # Create a form where the assessed user is user_leader2.
+            self.form_subordinate = Form.objects.create(
+                name="Subordinate Form",
+                is_default=True,
+                form_type="TL",
+                cycle=self.cycle
+            )
 
-        # Create a form where the assessed user is the manager.
-        self.form_manager = Form.objects.create(
-            name="Manager Form",
-            is_default=True,
-            form_type="MANAGER",
-            cycle=self.cycle
-        )
+            # Create a form where the assessed user is the manager.
+            self.form_manager = Form.objects.create(
+                name="Manager Form",
+                is_default=True,
+                form_type="MANAGER",
+                cycle=self.cycle
+            )
 
         # Create questions for the forms
         self.question_default = Question.objects.create(
@@ -745,6 +751,41 @@ class AssignedByEndpointTestCase(APITestCase):
         returned_names = {entry["assigned_by_name"] for entry in team_entries}
         self.assertEqual(returned_names, expected_names)
 
+    def test_team_forms_query_count_does_not_grow_with_team(self):
+        """
+        The assigned-by endpoint resolves forms and assessed users in bulk, so adding
+        subordinates and forms does not add queries.
+        """
+        url = f"/api/forms/assigned-by/?cycle_id={self.cycle.id}"
+        self.client.force_authenticate(user=self.user_manager)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(url)
+
+        for i in range(6):
+            leader = User.objects.create(email=f"extra{i}@example.com", name=f"Extra {i}", leader=self.user_manager)
+            form = Form.objects.create(name=f"Extra Form {i}", is_default=False, form_type="TL", cycle=self.cycle)
+            for target in (self.form1, form):
+                FormAssignment.objects.create(
+                    form=target, assigned_to=self.user_member, assigned_by=leader, deadline=self.cycle.end_date
+                )
+        FormResponse.objects.create(
+            form=self.form1, user=self.user_manager,
+            question=Question.objects.create(form=self.form1, question_text="Q?", category="C"), answer=3,
+        )
+
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(url)
+        self.assertEqual(len(large), len(small))
+
+        team_forms = response.data["team_forms"]
+        self.assertEqual(len(team_forms), 2 + 12)
+        extra0 = User.objects.get(email="extra0@example.com")
+        entry = next(f for f in team_forms if f["id"] == self.form1.id and f["assigned_by"] == extra0.id)
+        self.assertEqual(entry["assigned_by_name"], "Extra 0")
+        self.assertEqual(entry["cycle_name"], self.cycle.name)
+        self.assertTrue(entry["is_expired"])
+        self.assertTrue(entry["is_filled"])
+
 
 class ResultsAggregationMathTestCase(APITestCase):
     def setUp(self):
@@ -884,3 +925,153 @@ class ResultsAggregationMathTestCase(APITestCase):
         self.assertAlmostEqual(result["total_average"], 4.0, places=2)
         for q in result["questions"]:
             self.assertAlmostEqual(q["average"], 4.0, places=2)
+
+    def test_grouped_aggregation_matches_per_user_results(self):
+        """
+        aggregate_form_results returns, for every assessed user, exactly what calculate_form_results
+        computes from that user's responses, including shared responders, NULL answers and
+        duplicate assignments.
+        """
+        extra = Question.objects.create(form=self.form, question_text="Teamwork?", category="Culture")
+        unanswered = Question.objects.create(form=self.form, question_text="Unused?", category="Unused")
+        shared = self.assessors_group1[0]
+        # shared responder also assessing leader2, twice
+        for _ in range(2):
+            FormAssignment.objects.create(
+                form=self.form, assigned_to=shared, assigned_by=self.leader2, deadline=self.cycle.end_date
+            )
+        for i, assessor in enumerate(self.assessors_group1[:4] + self.assessors_group2[:3]):
+            FormResponse.objects.create(
+                form=self.form, user=assessor, question=extra, answer=None if i == 2 else i % 5 + 1
+            )
+        adjusted_end_date = timezone.make_aware(datetime.combine(self.cycle.end_date, time.max))
+        date_range = (self.cycle.start_date, adjusted_end_date)
+        FormResponse.objects.filter(question=extra).update(date_created=self.cycle.start_date + timedelta(days=1))
+
+        assignments = self.form.formassignment_set.all()
+        with self.assertNumQueries(4):
+            results = aggregate_form_results(self.form, assignments, date_range)
+
+        self.assertEqual([r["assigned_by"] for r in results], [self.leader1.id, self.leader2.id])
+        for result in results:
+            responses = FormResponse.objects.filter(
+                question__form=self.form,
+                user__in=assignments.filter(assigned_by=result["assigned_by"]).values_list("assigned_to", flat=True),
+                date_created__range=date_range,
+            )
+            expected = calculate_form_results(responses, self.form)
+            self.assertEqual(result["total_average"], expected["total_average"])
+            self.assertEqual(result["categories"], expected["categories"])
+            self.assertEqual(
+                sorted(result["questions"], key=lambda q: q["id"]),
+                sorted(expected["questions"], key=lambda q: q["id"]),
+            )
+            self.assertNotIn("Unused", result["categories"])
+            self.assertIsNone(next(q for q in result["questions"] if q["id"] == unanswered.id)["average"])
+
+
+class DefaultFormAssignmentTestCase(APITestCase):
+    def setUp(self):
+        self.cycle = Cycle.objects.create(
+            name="Active Cycle",
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=30),
+            is_active=True,
+        )
+        self.leader = User.objects.create(email="tl@example.com", password="password123", name="TL")
+        self.members = [
+            User.objects.create(email=f"m{i}@example.com", password="password123", name=f"M{i}", leader=self.leader)
+            for i in range(5)
+        ]
+
+    def test_default_form_assigned_after_commit_with_progress(self):
+        """
+        Saving a default TL form queues a FormAssignmentJob that assigns every user with a leader
+        (assessed by that leader) once, in a fixed number of queries.
+        """
+        from api.models import FormAssignmentJob
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            form = Form.objects.create(name="Default TL", is_default=True, form_type="TL", cycle=self.cycle)
+        self.assertFalse(FormAssignment.objects.filter(form=form).exists())
+        job = FormAssignmentJob.objects.get(form=form)
+        self.assertEqual(job.status, FormAssignmentJob.Status.PENDING)
+
+        # one member was assigned by hand in the meantime
+        FormAssignment.objects.create(
+            form=form, assigned_to=self.members[0], assigned_by=self.leader, deadline=self.cycle.end_date
+        )
+        with self.assertNumQueries(11):
+            for callback in callbacks:
+                callback()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, FormAssignmentJob.Status.DONE)
+        self.assertEqual((job.assigned, job.total), (4, 4))
+        self.assertEqual(
+            sorted(FormAssignment.objects.filter(form=form).values_list("assigned_to", "assigned_by")),
+            sorted((m.pk, self.leader.pk) for m in self.members),
+        )
+
+        # saving the form again only fills gaps
+        newcomer = User.objects.create(email="new@example.com", password="password123", leader=self.leader)
+        with self.captureOnCommitCallbacks(execute=True):
+            form.save()
+        self.assertEqual(FormAssignment.objects.filter(form=form).count(), 6)
+        self.assertTrue(FormAssignment.objects.filter(form=form, assigned_to=newcomer).exists())
+
+    def test_interrupted_jobs_are_run_again(self):
+        """A running job whose worker died is reset and finished by process_form_assignment_jobs."""
+        from api.models import FormAssignmentJob
+        from api.services.form_assignment import process_form_assignment_jobs
+
+        with self.captureOnCommitCallbacks(execute=False):
+            form = Form.objects.create(name="Default TL", is_default=True, form_type="TL", cycle=self.cycle)
+        job = FormAssignmentJob.objects.get(form=form)
+        # the worker committed one batch, then was recycled
+        FormAssignment.objects.create(
+            form=form, assigned_to=self.members[0], assigned_by=self.leader, deadline=self.cycle.end_date
+        )
+        FormAssignmentJob.objects.filter(pk=job.pk).update(
+            status=FormAssignmentJob.Status.RUNNING, total=5, assigned=1, date_updated=timezone.now()
+        )
+        self.assertEqual(process_form_assignment_jobs(), 0)
+
+        FormAssignmentJob.objects.filter(pk=job.pk).update(date_updated=timezone.now() - timedelta(hours=1))
+        self.assertEqual(process_form_assignment_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, FormAssignmentJob.Status.DONE)
+        self.assertEqual((job.assigned, job.total), (4, 4))
+        self.assertEqual(FormAssignment.objects.filter(form=form).count(), 5)
+
+    def test_skipped_users_export_plans_all_forms_in_fixed_queries(self):
+        """
+        The "Export Skipped Users" action plans every selected form from one pass over the
+        users and streams the CSV in form order.
+        """
+        from django.contrib.admin.sites import site
+        from django.contrib.messages.storage.fallback import FallbackStorage
+        from django.test import RequestFactory
+
+        from api.admin.form import FormAdmin
+
+        tl_form = Form.objects.create(name="TL", is_default=False, form_type="TL", cycle=self.cycle)
+        pm_form = Form.objects.create(name="PM", is_default=False, form_type="PM", cycle=self.cycle)
+        FormAssignment.objects.create(
+            form=tl_form, assigned_to=self.members[0], assigned_by=self.leader, deadline=self.cycle.end_date
+        )
+
+        request = RequestFactory().post("/admin/api/form/")
+        request.session = {}
+        request._messages = FallbackStorage(request)
+        with self.assertNumQueries(2):
+            response = FormAdmin(Form, site).export_skipped_users_csv(
+                request, Form.objects.filter(pk__in=[tl_form.pk, pm_form.pk]).order_by("name")
+            )
+        rows = [line.strip().split(",") for line in b"".join(response.streaming_content).decode().splitlines()]
+
+        self.assertEqual(rows[0], ["Form Name", "User Email", "User Name", "Reason Skipped"])
+        self.assertEqual([row[0] for row in rows[1:]], ["PM"] * 6 + ["TL"] * 2)
+        self.assertIn(["TL", "tl@example.com", "TL", "No leader assigned"], rows)
+        self.assertIn(["TL", "m0@example.com", "M0", "Already assigned"], rows)
+        self.assertIn(["PM", "m1@example.com", "M1", "Manual assignment required"], rows)
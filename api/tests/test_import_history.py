@@ -0,0 +1,108 @@
+import csv
+import json
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import TimelineEvent
+from api.models.ladder import Ladder, LadderAspect
+from api.models.note import NoteSubmitStatus, Summary
+from api.models.performance_tables import CompensationSnapshot, SenioritySnapshot
+
+User = get_user_model()
+
+FIELDS = [
+    "user_email", "event_type", "event_date", "ladder_code", "aspect_details_json",
+    "overall_score", "pay_band_number", "salary_change", "bonus_percentage",
+]
+
+
+def _write_csv(path, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+    return str(path)
+
+
+def _history_rows(emails):
+    rows = []
+    for email in emails:
+        rows += [
+            {"user_email": email, "event_type": "PAY_CHANGE", "event_date": "2024-01-01",
+             "pay_band_number": "20", "salary_change": "1"},
+            {"user_email": email, "event_type": "BONUS_PAYOUT", "event_date": "2024-06-01",
+             "bonus_percentage": "10"},
+            {"user_email": email, "event_type": "MAPPING", "event_date": "2024-02-01",
+             "ladder_code": "SW", "aspect_details_json": json.dumps({"DES": 2})},
+            {"user_email": email, "event_type": "SENIORITY_CHANGE", "event_date": "2024-09-01",
+             "ladder_code": "SW", "aspect_details_json": json.dumps({"DES": 3})},
+        ]
+    return rows
+
+
+@pytest.fixture
+def ladder():
+    ladder = Ladder.objects.create(code="SW", name="Software")
+    LadderAspect.objects.create(ladder=ladder, code="DES", name="Design")
+    return ladder
+
+
+@pytest.mark.django_db
+def test_history_import_bulk_writes_and_reruns_idempotently(tmp_path, ladder):
+    emails = [f"user{i}@example.com" for i in range(6)]
+    for email in emails:
+        User.objects.create_user(email=email, password="password123", username=email)
+    rows = _history_rows(emails) + [
+        {"user_email": "ghost@example.com", "event_type": "NOTICE", "event_date": "2024-01-01"},
+        {"user_email": emails[0], "event_type": "NOTICE", "event_date": "2024-13-01"},
+    ]
+    path = _write_csv(tmp_path / "history.csv", rows)
+
+    out = StringIO()
+    with CaptureQueriesContext(connection) as captured:
+        call_command("import_history", csv=path, chunk_size=10, stdout=out)
+    # Lookups and writes are per chunk (3 chunks), not per row
+    assert len(captured.captured_queries) < 100
+    assert "events=24" in out.getvalue() and "errors=2" in out.getvalue()
+    assert "rows/sec" in out.getvalue()
+
+    user = User.objects.get(email=emails[0])
+    assert TimelineEvent.objects.filter(user=user).count() == 4
+    bonus = CompensationSnapshot.objects.get(user=user, effective_date="2024-06-01")
+    assert bonus.pay_band.number == 20 and bonus.bonus_percentage == 10
+    change = TimelineEvent.objects.get(user=user, event_type="SENIORITY_CHANGE")
+    assert "ارتقا از سطح 2 به 3" in change.summary_text
+    summaries = Summary.objects.filter(note__owner=user)
+    assert summaries.count() == 2
+    assert all(s.is_import and s.note.submit_status == NoteSubmitStatus.REVIEWED for s in summaries)
+    assert not TimelineEvent.objects.filter(user=user, content_type__isnull=False).exists()
+
+    call_command("import_history", csv=path, stdout=StringIO())
+    assert TimelineEvent.objects.count() == 24
+    assert SenioritySnapshot.objects.count() == 12
+    assert CompensationSnapshot.objects.count() == 12
+
+
+@pytest.mark.django_db(transaction=True)
+def test_prod_history_import_with_workers(tmp_path, settings, ladder):
+    settings.PRODUCTION_BACKUP_DIR = str(tmp_path / "backups")
+    emails = [f"user{i}@example.com" for i in range(8)]
+    for email in emails:
+        User.objects.create_user(email=email, password="password123", username=email)
+    path = _write_csv(tmp_path / "history.csv", _history_rows(emails))
+
+    out = StringIO()
+    call_command("import_history_prod", csv=path, workers=3, chunk_size=5, stdout=out)
+    assert "events=32" in out.getvalue() and "errors=0" in out.getvalue()
+    assert "rows/sec" in out.getvalue()
+    assert TimelineEvent.objects.count() == 32
+    assert CompensationSnapshot.objects.filter(bonus_percentage=10, pay_band__number=20).count() == 8
+    for email in emails:
+        change = TimelineEvent.objects.get(user__email=email, event_type="SENIORITY_CHANGE")
+        assert "ارتقا از سطح 2 به 3" in change.summary_text
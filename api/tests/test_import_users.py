@@ -0,0 +1,64 @@
+import csv
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from api.models import LeadershipClosure
+from api.models.organization import Chapter
+
+User = get_user_model()
+
+FIELDS = ["Name", "Email", "Gmail", "Chapter", "Leader"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_prod_user_import_with_workers(tmp_path, settings):
+    settings.PRODUCTION_BACKUP_DIR = str(tmp_path / "backups")
+    # A reporting chain head <- m0 <- u0..u3, spread over the partitions by email
+    rows = [{"Name": "Head", "Email": "head@example.com", "Chapter": "Backend"}]
+    rows += [
+        {"Name": f"M{i}", "Email": f"m{i}@example.com", "Chapter": "Backend", "Leader": "head@example.com"}
+        for i in range(2)
+    ]
+    rows += [
+        {"Name": f"U{i}", "Email": f"u{i}@example.com", "Chapter": "Backend", "Leader": f"M{i % 2}@example.com"}
+        for i in range(6)
+    ]
+    path = tmp_path / "users.csv"
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    out = StringIO()
+    call_command("import_users_prod", csv=str(path), workers=3, stdout=out)
+    assert "created=9" in out.getvalue()
+
+    assert Chapter.objects.filter(name="Backend").count() == 1
+    head = User.objects.get(email="head@example.com")
+    u4 = User.objects.get(email="u4@example.com")
+    assert u4.leader.email == "m0@example.com" and u4.leader.leader == head
+    assert LeadershipClosure.objects.get(ancestor=head, descendant=u4).depth == 2
+    assert LeadershipClosure.objects.filter(ancestor=head).count() == 8
+
+
+@pytest.mark.django_db(transaction=True)
+def test_prod_org_import_with_workers_counts_shared_users(tmp_path, settings):
+    settings.PRODUCTION_BACKUP_DIR = str(tmp_path / "backups")
+    User.objects.create_user(email="lead0@example.com", password="password123", username="lead0")
+    path = tmp_path / "chapters.csv"
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["chapter_name", "chapter_description", "chapter_leader_email"])
+        writer.writeheader()
+        writer.writerows(
+            {"chapter_name": f"C{i}", "chapter_leader_email": f"lead{i % 3}@example.com"} for i in range(6)
+        )
+
+    out = StringIO()
+    call_command("import_org_structure_prod", csv=str(path), workers=3, create_users=True, stdout=out)
+    assert "created=6" in out.getvalue()
+    # lead0 already existed; lead1 and lead2 are created before the partitions run
+    assert "users_created=2" in out.getvalue()
+    assert Chapter.objects.get(name="C4").leader.email == "lead1@example.com"
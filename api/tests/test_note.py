@@ -1,5 +1,7 @@
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework.test import APIClient
 from api.models import (
@@ -460,3 +462,57 @@ def test_mentioned_users_signal_handles_missing_feedback(user, mentioned_user, a
     # So there might not be access, but the signal shouldn't crash
     # Let's verify the signal didn't crash by checking the note still exists
     assert Note.objects.filter(pk=note.pk).exists()
+
+
+@pytest.mark.django_db
+def test_note_list_stays_within_query_budget(
+    api_client, user, mentioned_user, cycle, assert_within_query_budget
+):
+    for i in range(12):
+        note = Note.objects.create(
+            owner=user,
+            title=f"Note {i}",
+            content="...",
+            date=timezone.now().date(),
+            cycle=cycle,
+        )
+        note.mentioned_users.add(mentioned_user)
+        note.read_by.add(user)
+    api_client.force_authenticate(user=user)
+
+    resp = assert_within_query_budget(api_client, "/api/notes/")
+
+    assert resp.status_code == 200
+    assert len(resp.data) == 12
+    assert all(item["read_status"] for item in resp.data)
+    assert all(item["access_level"]["can_edit"] for item in resp.data)
+    assert "db;dur=" in resp["Server-Timing"]
+
+
+@pytest.mark.django_db
+def test_note_list_modes_use_exists_without_distinct(api_client, user, mentioned_user, cycle):
+    notes = []
+    for i in range(3):
+        note = Note.objects.create(
+            owner=user, title=f"Note {i}", content="...", date=timezone.now().date(), cycle=cycle
+        )
+        note.mentioned_users.add(mentioned_user)
+        notes.append(note)
+    notes[0].read_by.add(mentioned_user)
+    api_client.force_authenticate(user=mentioned_user)
+
+    expected = {
+        "/api/notes/": set(),
+        "/api/notes/?retrieve_mentions=true": {str(n.uuid) for n in notes},
+        "/api/notes/?retrieve_mentions=true&unread=true": {str(n.uuid) for n in notes[1:]},
+        f"/api/notes/?user={user.email}": {str(n.uuid) for n in notes},
+    }
+    for url, uuids in expected.items():
+        with CaptureQueriesContext(connection) as captured:
+            resp = api_client.get(url)
+        assert resp.status_code == 200
+        assert {item["uuid"] for item in resp.data} == uuids, url
+        list_sql = next(q["sql"] for q in captured.captured_queries if 'FROM "api_note"' in q["sql"])
+        assert "DISTINCT" not in list_sql
+        assert "EXISTS" in list_sql
+        assert '"api_note"."uuid" IN' not in list_sql
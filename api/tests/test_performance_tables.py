@@ -981,6 +981,28 @@ def test_csv_all_null_values_row_present(api_client):
 	assert "nulls@example.com" in b"".join(resp.streaming_content).decode() 
 
 
+@pytest.mark.django_db
+def test_csv_streams_rows_incrementally(api_client):
+	"""CSV export yields the header and each row as separate chunks, with the team fallback for users without snapshots."""
+	from django.urls import reverse
+	import csv
+	org, dep_eng, dep_prod, tribe_app, tribe_growth, team_a, team_b = _create_org_graph()
+	viewer = User.objects.create(email="hrm@example.com"); org.hr_manager = viewer; org.save(update_fields=["hr_manager"])
+	User.objects.bulk_create([User(email=f"st{i}@example.com", username=f"st{i}@example.com", team=team_a) for i in range(5)])
+	api_client.force_authenticate(viewer)
+	resp = api_client.get(reverse("api:personnel-performance-csv"))
+	assert resp.status_code == 200
+	chunks = list(resp.streaming_content)
+	total = User.objects.count()
+	assert len(chunks) == total + 1
+	rows = list(csv.DictReader(b"".join(chunks).decode().splitlines()))
+	row = next(r for r in rows if r["name"] == "st0@example.com")
+	assert row["team"] == team_a.name
+	assert row["tribe"] == team_a.tribe.name
+	assert row["is_mapped"] == "False"
+	assert row["ladder_levels"] == "{}"
+
+
 @pytest.mark.django_db
 def test_refinalizing_summary_updates_snapshots_not_duplicates(api_client):
 	"""Re-finalizing the same Summary with different values should update existing snapshots (same effective_date) and the table should reflect new values."""
@@ -1443,4 +1465,323 @@ def test_summary_seniority_level_csv_export(api_client):
 	assert resp.status_code == 200
 	text = b"".join(resp.streaming_content).decode()
 	assert "seniority_level" in text
-	assert "PRINCIPAL" in text 
\ No newline at end of file
+	assert "PRINCIPAL" in text 
+
+# ---------------------------------------------------------------------------
+# Current-state projection (UserPerformanceState)
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.django_db
+def test_current_state_projection_follows_snapshot_signals():
+	"""Snapshot and committee saves keep the per-user projection up to date."""
+	from api.models import UserPerformanceState
+	org, dep_eng, dep_prod, tribe_app, tribe_growth, team_a, team_b = _create_org_graph()
+	u = User.objects.create(email="proj@example.com", team=team_a)
+	today = timezone.now().date()
+	old = _comp(u, 0, 3.0, today - timezone.timedelta(days=30))
+	new = _comp(u, 0, 0, today - timezone.timedelta(days=5))
+	sen = _seniority(u, "Software", today - timezone.timedelta(days=5))
+	org_snap = _orgsnap(u, team_a, today - timezone.timedelta(days=5))
+	_committee(u, today - timezone.timedelta(days=2))
+
+	state = UserPerformanceState.objects.get(user=u)
+	assert state.latest_comp_id == new.id
+	assert state.latest_seniority_id == sen.id
+	assert state.latest_org_id == org_snap.id
+	assert state.is_mapped is True
+	assert state.last_bonus_date == old.effective_date
+	assert state.last_bonus_percentage == 3.0
+	assert state.last_committee_date == today - timezone.timedelta(days=2)
+	assert sum(state.committees_by_year.values()) == 1
+	assert state.stale_after is None
+
+
+@pytest.mark.django_db
+def test_current_state_projection_refreshes_future_dated_rows(api_client):
+	"""Future-dated snapshots set stale_after and are picked up once they take effect."""
+	from api.models import UserPerformanceState
+	from api.services.performance_tables import ensure_performance_states_fresh
+	org, dep_eng, dep_prod, tribe_app, tribe_growth, team_a, team_b = _create_org_graph()
+	u = User.objects.create(email="future@example.com", team=team_a)
+	today = timezone.now().date()
+	current = _comp(u, 0, 1.0, today - timezone.timedelta(days=1))
+	future = _comp(u, 0, 7.0, today + timezone.timedelta(days=3))
+
+	state = UserPerformanceState.objects.get(user=u)
+	assert state.latest_comp_id == current.id
+	assert state.stale_after == future.effective_date
+
+	ensure_performance_states_fresh(future.effective_date)
+	state.refresh_from_db()
+	assert state.latest_comp_id == future.id
+	assert state.last_bonus_percentage == 7.0
+	assert state.stale_after is None
+
+
+@pytest.mark.django_db
+def test_current_state_projection_recovers_after_snapshot_delete(api_client):
+	"""Deleting the latest snapshot falls back to the previous one on the next table read."""
+	org, dep_eng, dep_prod, tribe_app, tribe_growth, team_a, team_b = _create_org_graph()
+	viewer = User.objects.create(email="hrm@example.com"); org.hr_manager = viewer; org.save(update_fields=["hr_manager"])
+	u = User.objects.create(email="del@example.com", team=team_a)
+	today = timezone.now().date()
+	_comp(u, 0, 2.0, today - timezone.timedelta(days=20))
+	latest = _comp(u, 0, 9.0, today - timezone.timedelta(days=2))
+	latest.delete()
+
+	api_client.force_authenticate(viewer)
+	resp = api_client.get("/api/personnel/performance-table/?page_size=50")
+	row = next(r for r in resp.json()["results"] if r["name"] == "del@example.com")
+	assert row["last_bonus_percentage"] == 2.0
+
+
+@pytest.mark.django_db
+def test_current_state_matches_historical_path_values(api_client):
+	"""Today's projection and an explicit as_of of yesterday agree when nothing changed today."""
+	org, dep_eng, dep_prod, tribe_app, tribe_growth, team_a, team_b = _create_org_graph()
+	viewer = User.objects.create(email="hrm@example.com"); org.hr_manager = viewer; org.save(update_fields=["hr_manager"])
+	u = User.objects.create(email="same@example.com", team=team_a)
+	when = timezone.now().date() - timezone.timedelta(days=10)
+	_comp(u, 0, 4.0, when)
+	_seniority(u, "Software", when)
+	_orgsnap(u, team_a, when)
+	_committee(u, when)
+
+	api_client.force_authenticate(viewer)
+	yesterday = (timezone.now().date() - timezone.timedelta(days=1)).isoformat()
+	current = api_client.get("/api/personnel/performance-table/?page_size=50").json()["results"]
+	historical = api_client.get(f"/api/personnel/performance-table/?page_size=50&as_of={yesterday}").json()["results"]
+	row_now = next(r for r in current if r["name"] == "same@example.com")
+	row_then = next(r for r in historical if r["name"] == "same@example.com")
+	for key in ("last_committee_date", "last_bonus_date", "last_bonus_percentage", "ladder", "ladder_levels", "overall_level", "team", "tribe", "is_mapped"):
+		assert row_now[key] == row_then[key], key
+
+
+# ---------------------------------------------------------------------------
+# Set-based visibility resolver
+# ---------------------------------------------------------------------------
+
+
+def _access_matrix_graph():
+	"""Org with exec roles, directors, a leadership chain, a coach and mixed ladders/categories."""
+	org, dep_eng, dep_prod, tribe_app, tribe_growth, team_a, team_b = _create_org_graph()
+	finance = Tribe.objects.create(name="Finance", department=dep_prod)
+	team_fin = Team.objects.create(name="Accounting", department=dep_prod, tribe=finance)
+	team_a.category = "TECH"; team_a.save(update_fields=["category"])
+	team_b.category = "PRODUCT"; team_b.save(update_fields=["category"])
+	devops = Chapter.objects.create(name="DevOps Chapter", department=dep_eng)
+
+	cto = User.objects.create(email="cto@example.com")
+	cfo = User.objects.create(email="cfo@example.com")
+	cpo = User.objects.create(email="cpo@example.com")
+	org.cto = cto; org.cfo = cfo; org.cpo = cpo; org.save()
+	eng_dir = User.objects.create(email="engdir@example.com")
+	tribe_app.engineering_director = eng_dir; tribe_app.save(update_fields=["engineering_director"])
+	prod_dir = User.objects.create(email="proddir@example.com", team=team_b)
+	tribe_growth.product_director = prod_dir; tribe_growth.save(update_fields=["product_director"])
+
+	top = User.objects.create(email="top@example.com", team=team_a)
+	mid = User.objects.create(email="mid@example.com", team=team_a, leader=top)
+	dev = User.objects.create(email="dev@example.com", team=team_a, leader=mid)
+	pm = User.objects.create(email="pm@example.com", team=team_a, leader=mid)
+	ops = User.objects.create(email="ops@example.com", chapter=devops)
+	growth = User.objects.create(email="growth@example.com", team=team_b)
+	acct = User.objects.create(email="acct@example.com", team=team_fin)
+	coach = User.objects.create(email="coach@example.com")
+	coached = User.objects.create(email="coached@example.com", agile_coach=coach)
+	today = timezone.now().date()
+	_seniority(dev, "Software", today)
+	_seniority(pm, "Product", today)
+	_seniority(growth, "GEN-v1", today)
+	return [cto, cfo, cpo, eng_dir, prod_dir, top, mid, dev, pm, ops, growth, acct, coach, coached]
+
+
+@pytest.mark.django_db
+def test_resolve_visible_user_ids_matches_can_view_timeline():
+	"""The set-based resolver agrees with the per-target can_view_timeline check for every viewer."""
+	from api.services.timeline_access import can_view_timeline, resolve_visible_user_ids
+	viewers = _access_matrix_graph()
+	everyone = list(User.objects.all())
+	for viewer in viewers:
+		expected = {u.pk for u in everyone if can_view_timeline(viewer, u)}
+		assert resolve_visible_user_ids(viewer) == expected, viewer.email
+
+
+@pytest.mark.django_db
+def test_resolve_visible_user_ids_constant_queries(django_assert_max_num_queries):
+	"""Query count does not grow with the number of users."""
+	from api.services.timeline_access import resolve_visible_user_ids
+	viewers = _access_matrix_graph()
+	cto = viewers[0]
+	for i in range(30):
+		User.objects.create(email=f"bulk{i}@example.com", leader=cto)
+	with django_assert_max_num_queries(12):
+		resolve_visible_user_ids(cto)
+
+
+@pytest.mark.django_db
+def test_resolve_visible_users_filters_as_a_subquery():
+	"""The queryset resolver matches the id set and filters without inlining the ids."""
+	from api.services.timeline_access import resolve_visible_user_ids, resolve_visible_users
+	viewers = _access_matrix_graph()
+	for viewer in viewers:
+		visible = User.objects.filter(pk__in=resolve_visible_users(viewer).values("pk"))
+		assert set(visible.values_list("pk", flat=True)) == resolve_visible_user_ids(viewer), viewer.email
+	top = next(v for v in viewers if v.email == "top@example.com")
+	for i in range(30):
+		User.objects.create(email=f"bulk{i}@example.com", leader=top)
+	sql, params = User.objects.filter(pk__in=resolve_visible_users(top).values("pk")).query.sql_with_params()
+	assert len(params) < 10
+
+
+@pytest.mark.django_db
+def test_performance_table_paginates_visible_rows(api_client):
+	"""Count and pages come from the access-filtered queryset."""
+	viewers = _access_matrix_graph()
+	mid = next(v for v in viewers if v.email == "mid@example.com")
+	api_client.force_authenticate(mid)
+	first = api_client.get("/api/personnel/performance-table/?page_size=1&page=1").json()
+	second = api_client.get("/api/personnel/performance-table/?page_size=1&page=2").json()
+	assert first["count"] == 2  # direct reports
+	names = [r["name"] for r in first["results"] + second["results"]]
+	assert sorted(names) == ["dev@example.com", "pm@example.com"]
+	assert api_client.get("/api/personnel/performance-table/?page=0").status_code == 400
+
+
+@pytest.mark.django_db
+def test_performance_table_cursor_pages_match_offset_pages(api_client):
+	"""Walking next_cursor returns the same rows, in the same order, as offset pagination (NULLs included)."""
+	org, dep_eng, dep_prod, tribe_app, tribe_growth, team_a, team_b = _create_org_graph()
+	viewer = User.objects.create(email="hrm@example.com"); org.hr_manager = viewer; org.save(update_fields=["hr_manager"])
+	today = timezone.now().date()
+	for i in range(11):
+		u = User.objects.create(email=f"k{i}@example.com", name=f"K{i % 4}", team=[team_a, team_b, None][i % 3])
+		if i % 2:
+			snap = _seniority(u, "SWX", today)
+			snap.overall_score = i % 3
+			snap.details_json = {"DES": i % 4} if i % 5 else {}
+			snap.save()
+	api_client.force_authenticate(viewer)
+	base = "/api/personnel/performance-table/"
+	for ordering in ["", "-team", "team", "overall_level", "-overall_level,name", "aspect_DES", "-aspect_DES", "-ladder"]:
+		expected = [r["uuid"] for r in api_client.get(f"{base}?page_size=100&ordering={ordering}").json()["results"]]
+		walked, cursor = [], ""
+		for _ in range(20):
+			resp = api_client.get(f"{base}?page_size=3&ordering={ordering}&cursor={cursor}")
+			assert resp.status_code == 200
+			body = resp.json()
+			assert len(body["results"]) <= 3
+			walked += [r["uuid"] for r in body["results"]]
+			cursor = body["next_cursor"]
+			if cursor is None:
+				break
+		assert walked == expected, ordering
+
+
+@pytest.mark.django_db
+def test_performance_table_cursor_count_and_errors(api_client):
+	"""Cursor mode only counts when asked and rejects cursors issued for another ordering."""
+	viewers = _access_matrix_graph()
+	mid = next(v for v in viewers if v.email == "mid@example.com")
+	api_client.force_authenticate(mid)
+	base = "/api/personnel/performance-table/"
+	first = api_client.get(f"{base}?cursor=&page_size=1").json()
+	assert first["count"] is None and len(first["results"]) == 1 and first["next_cursor"]
+	counted = api_client.get(f"{base}?cursor={first['next_cursor']}&page_size=1&include_count=true").json()
+	assert counted["count"] == 2 and counted["next_cursor"] is None
+	assert {first["results"][0]["name"], counted["results"][0]["name"]} == {"dev@example.com", "pm@example.com"}
+	assert api_client.get(f"{base}?cursor={first['next_cursor']}&ordering=team").status_code == 400
+	assert api_client.get(f"{base}?cursor=not-a-cursor").status_code == 400
+
+
+@pytest.mark.django_db
+def test_user_classification_follows_snapshots_and_org_changes():
+	"""UserClassification is kept current by snapshot, team and tribe signals and filled lazily for bulk-created users."""
+	from api.models import UserClassification, LadderCategory
+	from api.services.timeline_access import _is_technical, _is_product, resolve_visible_user_ids
+	org, dep_eng, dep_prod, tribe_app, tribe_growth, team_a, team_b = _create_org_graph()
+	today = timezone.now().date()
+	u = User.objects.create(email="cls@example.com", team=team_b)
+	assert not UserClassification.objects.get(user=u).is_technical
+
+	team_b.category = "TECH"; team_b.save(update_fields=["category"])
+	assert _is_technical(u)
+
+	snap = _seniority(u, "Product", today)
+	row = UserClassification.objects.get(user=u)
+	assert row.ladder_category == LadderCategory.PRODUCT and row.latest_ladder_id == snap.ladder_id
+	assert _is_product(u) and not _is_technical(u)
+
+	snap.delete()
+	assert not UserClassification.objects.filter(user=u).exists()
+	assert _is_technical(u)
+
+	tribe_growth.name = "Finance"; tribe_growth.save(update_fields=["name"])
+	assert UserClassification.objects.get(user=u).is_finance
+
+	User.objects.bulk_create([User(email="bulkcls@example.com", username="bulkcls@example.com", team=team_b)])
+	bulk = User.objects.get(email="bulkcls@example.com")
+	assert not UserClassification.objects.filter(user=bulk).exists()
+	cto = User.objects.create(email="ctocls@example.com"); org.cto = cto; org.save(update_fields=["cto"])
+	assert bulk.pk in resolve_visible_user_ids(cto)
+	assert UserClassification.objects.get(user=bulk).is_technical
+
+
+@pytest.mark.django_db
+def test_performance_table_query_budget_and_metrics(api_client, assert_within_query_budget, caplog, monkeypatch):
+	"""The table stays within its query budget regardless of row count; overruns are logged."""
+	import json
+	from api.views.performance_tables import PersonnelPerformanceTableView
+	org, dep_eng, dep_prod, tribe_app, tribe_growth, team_a, team_b = _create_org_graph()
+	viewer = User.objects.create(email="hrm@example.com"); org.hr_manager = viewer; org.save(update_fields=["hr_manager"])
+	today = timezone.now().date()
+	for i in range(20):
+		u = User.objects.create(email=f"b{i}@example.com", team=[team_a, team_b][i % 2])
+		_seniority(u, "SWX", today)
+	api_client.force_authenticate(viewer)
+	base = "/api/personnel/performance-table/"
+
+	resp = assert_within_query_budget(api_client, f"{base}?page_size=50")
+	assert resp.status_code == 200 and resp.json()["count"] == 21
+	assert "db;dur=" in resp["Server-Timing"] and "total;dur=" in resp["Server-Timing"]
+
+	monkeypatch.setattr(PersonnelPerformanceTableView, "query_budget", 1)
+	with caplog.at_level("INFO", logger="api.metrics"):
+		api_client.get(base)
+	record = [r for r in caplog.records if r.name == "api.metrics"][-1]
+	payload = json.loads(record.getMessage())
+	assert record.levelname == "WARNING" and payload["event"] == "query_budget_exceeded"
+	assert payload["view"] == "PersonnelPerformanceTableView" and payload["queries"] > 1
+
+
+@pytest.mark.django_db
+def test_accessible_users_matches_table_scope_with_fields_and_etag(api_client, django_assert_max_num_queries):
+	"""accessible_users lists the performance table's users in a constant number of queries, trims fields and revalidates."""
+	from api.services.performance_tables import get_visible_users_for_viewer
+	from api.services.timeline_access import resolve_visible_users
+	viewers = _access_matrix_graph()
+	url = "/api/personnel/performance-table/accessible-users/"
+	for viewer in viewers:
+		api_client.force_authenticate(viewer)
+		expected = set(
+			get_visible_users_for_viewer(viewer).filter(id__in=resolve_visible_users(viewer).values("pk")).values_list("email", flat=True)
+		)
+		with django_assert_max_num_queries(15):
+			body = api_client.get(url).json()
+		assert {u["email"] for u in body["accessible_users"]} == expected, viewer.email
+		assert body["total_count"] == len(expected)
+
+	mid = next(v for v in viewers if v.email == "mid@example.com")
+	api_client.force_authenticate(mid)
+	resp = api_client.get(f"{url}?fields=email,ladder")
+	assert resp.status_code == 200
+	rows = {u["email"]: u for u in resp.json()["accessible_users"]}
+	assert rows["dev@example.com"] == {"email": "dev@example.com", "ladder": "Software"}
+	assert rows["pm@example.com"] == {"email": "pm@example.com", "ladder": "Product"}
+
+	etag = resp["ETag"]
+	assert api_client.get(f"{url}?fields=email,ladder", HTTP_IF_NONE_MATCH=etag).status_code == 304
+	_seniority(User.objects.get(email="pm@example.com"), "Software", timezone.now().date() + timezone.timedelta(days=1))
+	assert api_client.get(f"{url}?fields=email,ladder", HTTP_IF_NONE_MATCH=etag).status_code == 200
+	assert api_client.get(f"{url}?fields=email,salary").status_code == 400
@@ -0,0 +1,101 @@
+import gzip
+import json
+import os
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+
+from api.management.commands._prod_utils import DatabaseBackup, ProductionLogger
+from api.models import (
+    InboxCounter,
+    LeadershipClosure,
+    TimelineEvent,
+    UserClassification,
+    UserPerformanceState,
+)
+from api.models.ladder import Ladder, LadderAspect
+from api.models.performance_tables import CompensationSnapshot
+
+User = get_user_model()
+
+
+@pytest.fixture
+def backup(tmp_path, settings):
+    settings.PRODUCTION_BACKUP_DIR = str(tmp_path / "backups")
+    return DatabaseBackup(None, ProductionLogger(None))
+
+
+@pytest.mark.django_db
+def test_backup_streams_compressed_tables_and_restores_them(backup):
+    user = User.objects.create_user(email="a@example.com", password="password123", username="a")
+    ladder = Ladder.objects.create(code="SW", name="Software")
+    LadderAspect.objects.create(ladder=ladder, code="DES", name="Design")
+    event = TimelineEvent.objects.create(
+        user=user, event_type="NOTICE", effective_date="2024-01-01", summary_text="قبل"
+    )
+
+    path = backup.create_backup("test")
+    with open(os.path.join(path, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert manifest["tables"]["api_timelineevent"]["rows"] == 1
+    assert manifest["tables"]["api_compensationsnapshot"]["rows"] == 0
+    entry = manifest["tables"]["api_ladder"]
+    with gzip.open(os.path.join(path, entry["file"]), "rt", encoding="utf-8") as f:
+        rows = [dict(zip(entry["columns"], json.loads(line))) for line in f]
+    assert [row["code"] for row in rows] == ["SW"]
+
+    TimelineEvent.objects.filter(pk=event.pk).update(summary_text="بعد")
+    LadderAspect.objects.all().delete()
+    Ladder.objects.create(code="EM", name="Management")
+
+    assert backup.restore_backup(path)
+    assert TimelineEvent.objects.get(pk=event.pk).summary_text == "قبل"
+    assert list(Ladder.objects.values_list("code", flat=True)) == ["SW"]
+    assert LadderAspect.objects.get().ladder_id == ladder.pk
+    # Sequences continue past the restored ids
+    assert Ladder.objects.create(code="EM", name="Management").pk > ladder.pk
+
+
+@pytest.mark.django_db
+def test_restore_refuses_a_corrupted_backup(backup):
+    Ladder.objects.create(code="SW", name="Software")
+    path = backup.create_backup("test")
+    Ladder.objects.create(code="EM", name="Management")
+    with gzip.open(os.path.join(path, "api_ladder.ndjson.gz"), "at", encoding="utf-8") as f:
+        f.write("[]\n")
+
+    assert not backup.restore_backup(path)
+    assert Ladder.objects.count() == 2
+    assert backup.logger.operations_log[-1]["operation"] == "restore_failed"
+
+
+@pytest.mark.django_db
+def test_restore_over_an_import_rebuilds_per_user_projections(backup, tmp_path):
+    head = User.objects.create_user(email="head@example.com", password="password123", username="head")
+    path = backup.create_backup("test")
+
+    csv_path = tmp_path / "users.csv"
+    csv_path.write_text(
+        "Name,Email,Gmail,Chapter,Leader\n"
+        "New,new@example.com,,Backend,head@example.com\n",
+        encoding="utf-8",
+    )
+    call_command("import_users_prod", csv=str(csv_path), stdout=StringIO())
+    CompensationSnapshot.objects.create(user=head, bonus_percentage=10, effective_date="2024-01-01")
+    new = User.objects.get(email="new@example.com")
+    assert LeadershipClosure.objects.filter(ancestor=head, descendant=new).exists()
+    assert UserPerformanceState.objects.get(user=head).latest_comp_id is not None
+
+    assert backup.restore_backup(path)
+    # The foreign-key checks a committed restore runs
+    with connection.cursor() as cursor:
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+    assert list(User.objects.values_list("email", flat=True)) == ["head@example.com"]
+    assert not LeadershipClosure.objects.exists()
+    assert list(UserClassification.objects.values_list("user_id", flat=True)) == [head.pk]
+    assert list(InboxCounter.objects.values_list("user_id", flat=True)) == [head.pk]
+    assert UserPerformanceState.objects.get(user=head).latest_comp_id is None
+    assert UserPerformanceState.objects.count() == 1
@@ -144,6 +144,94 @@ def test_regular_user_denied(settings, api_client, member, leader):
     assert api_client.get(url).status_code == 403
 
 
+@pytest.mark.django_db
+def test_indirect_leader_can_view(api_client, leader, member):
+    """A leader two levels up can view the timeline through the leadership closure."""
+    director = User.objects.create(email="director@example.com", username="director")
+    leader.leader = director
+    leader.save()
+    api_client.force_authenticate(director)
+    url = reverse("api:user-timeline", args=[str(member.uuid)])
+    assert api_client.get(url).status_code == 200
+
+
+# ---------------------------------------------------------------------------
+# Leadership closure
+# ---------------------------------------------------------------------------
+
+
+def _closure_pairs():
+    from api.models import LeadershipClosure
+    return set(LeadershipClosure.objects.values_list("ancestor_id", "descendant_id", "depth"))
+
+
+@pytest.mark.django_db
+def test_leadership_closure_follows_leader_changes(leader, member):
+    """Moving a subtree re-parents every report below it; rebuild yields the same rows."""
+    from api.services.leadership import get_report_ids, is_in_leadership_chain, rebuild_leadership_closure
+
+    director = User.objects.create(email="director@example.com", username="director")
+    intern = User.objects.create(email="intern@example.com", username="intern", leader=member)
+    leader.leader = director
+    leader.save()
+
+    assert get_report_ids(director) == {leader.pk, member.pk, intern.pk}
+    assert is_in_leadership_chain(director, intern)
+    assert {(director.pk, intern.pk, 3), (leader.pk, intern.pk, 2), (member.pk, intern.pk, 1)} <= _closure_pairs()
+
+    other = User.objects.create(email="other@example.com", username="other")
+    member.leader = other
+    member.save()
+    assert get_report_ids(director) == {leader.pk}
+    assert get_report_ids(other) == {member.pk, intern.pk}
+    assert not is_in_leadership_chain(leader, intern)
+
+    incremental = _closure_pairs()
+    rebuild_leadership_closure()
+    assert _closure_pairs() == incremental
+
+
+@pytest.mark.django_db
+def test_leadership_closure_matches_get_leaders_with_cycles(leader, member):
+    """Cyclic leader data is walked exactly like User.get_leaders()."""
+    from api.services.leadership import is_in_leadership_chain
+
+    leader.leader = member
+    leader.save()
+    users = [leader, member]
+    for target in users:
+        target.refresh_from_db()
+        for viewer in users:
+            assert is_in_leadership_chain(viewer, target) == (viewer in target.get_leaders())
+
+
+@pytest.mark.django_db
+def test_leadership_closure_on_leader_delete(leader, member):
+    """Deleting a middle leader detaches their reports from the chain above."""
+    from api.services.leadership import get_report_ids
+
+    director = User.objects.create(email="director@example.com", username="director")
+    leader.leader = director
+    leader.save()
+    leader.delete()
+    assert get_report_ids(director) == set()
+    assert not _closure_pairs() & {(director.pk, member.pk, 2)}
+
+
+@pytest.mark.django_db
+def test_my_team_include_indirect(api_client, leader, member):
+    """my-team lists direct reports by default and the whole subtree on request."""
+    Cycle.objects.create(name="C", start_date=timezone.now(), end_date=timezone.now(), is_active=True)
+    director = User.objects.create(email="director@example.com", username="director")
+    leader.leader = director
+    leader.save()
+    api_client.force_authenticate(director)
+    direct = api_client.get("/api/my-team/").json()
+    indirect = api_client.get("/api/my-team/?include_indirect=true").json()
+    assert {u["email"] for u in direct} == {"leader@example.com"}
+    assert {u["email"] for u in indirect} == {"leader@example.com", "member@example.com"}
+
+
 # ---------------------------------------------------------------------------
 # Signal mapping – committee types
 # ---------------------------------------------------------------------------
@@ -378,6 +466,56 @@ def test_level_not_embedded_when_no_snapshot(settings, api_client, member):
     assert "level" not in body
 
 
+@pytest.mark.django_db
+def test_current_level_caches_aspect_names_until_aspect_changes(member, member_snapshot):
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from api.utils import get_current_level
+
+    cache.clear()
+    assert get_current_level(member)["details"]["Design"] == 3
+    with CaptureQueriesContext(connection) as captured:
+        get_current_level(member)
+    assert len(captured.captured_queries) == 1  # the snapshot only
+
+    aspect = LadderAspect.objects.get(ladder=member_snapshot.ladder, code="DES")
+    aspect.name = "System Design"
+    aspect.save()
+    assert get_current_level(member)["details"]["System Design"] == 3
+
+
+@pytest.mark.django_db
+def test_timeline_keyset_pages_follow_page_order(api_client, member):
+    today = timezone.now().date()
+    for i in range(23):
+        TimelineEvent.objects.create(
+            user=member,
+            event_type=EventType.SENIORITY_CHANGE,
+            summary_text=f"Event {i}",
+            effective_date=today - timezone.timedelta(days=i // 4),  # several events per day
+        )
+    expected = list(
+        TimelineEvent.objects.filter(user=member)
+        .order_by("-effective_date", "-date_created", "-id")
+        .values_list("summary_text", flat=True)
+    )
+    api_client.force_authenticate(member)
+    url = reverse("api:user-timeline", args=[str(member.uuid)])
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        body = api_client.get(url, {"cursor": cursor}).json()
+        assert "count" not in body
+        seen += [event["summary_text"] for event in body["results"]]
+        cursor = body["next_cursor"]
+    assert seen == expected
+
+    # Page numbers keep working for existing clients
+    assert api_client.get(url).json()["count"] == 23
+    assert api_client.get(url, {"cursor": "not-a-cursor"}).status_code == 400
+
+
 # ────────────────────────────────────────────────────────────
 # Current ladder endpoint & snapshot signal
 # ────────────────────────────────────────────────────────────
@@ -10,12 +10,13 @@ from api.models import (
     User, Organization, Department, Team, Tribe, Committee,
     Role, RoleType, RoleScope,
     Note, NoteType, NoteSubmitStatus,
-    NoteUserAccess,
+    NoteUserAccess, NoteAccessRecompute,
     Summary, SummarySubmitStatus,
     leader_permissions, committee_roles_permissions,
     Cycle,
 )
 from api.services.note_access import ensure_leader_note_accesses
+from api.services.acl_queue import process_acl_queue
 
 # ───────────────────────────────────────────────
 # Factory classes
@@ -316,6 +317,47 @@ def test_permission_idempotency(user):
     NoteUserAccess.ensure_note_predefined_accesses(note)
     assert NoteUserAccess.objects.count() == first_count
 
+
+@pytest.mark.django_db
+def test_batch_access_updates_changed_rows(user, leader):
+    """ensure_notes_predefined_accesses updates existing rows in place when the matrix changes."""
+    _make_user_hierarchy(user, leader=leader)
+    draft = NoteFactory(owner=user, submit_status=NoteSubmitStatus.INITIAL_SUBMIT)
+    goal = NoteFactory(owner=user, type=NoteType.GOAL)
+    assert NoteUserAccess.objects.get(user=user, note=draft).can_edit
+
+    Note.objects.filter(pk=draft.pk).update(submit_status=NoteSubmitStatus.PENDING)
+    draft.refresh_from_db()
+    NoteUserAccess.ensure_notes_predefined_accesses([draft, goal])
+
+    assert NoteUserAccess.objects.filter(note__in=[draft, goal]).count() == 4
+    assert not NoteUserAccess.objects.get(user=user, note=draft).can_edit
+    assert NoteUserAccess.objects.get(user=user, note=goal).can_edit
+    leader_acl = NoteUserAccess.objects.get(user=leader, note=goal)
+    for field, value in leader_permissions[NoteType.GOAL].items():
+        assert getattr(leader_acl, field) == value
+
+
+@pytest.mark.django_db
+def test_committee_member_change_is_batched(committee_user, django_assert_max_num_queries):
+    """Adding a committee member recomputes every proposal of the committee in a fixed number of queries."""
+    role = RoleFactory(role_type=RoleType.LEADER, role_scope=RoleScope.USER)
+    committee = CommitteeFactory(roles=[role])
+    notes = []
+    for _ in range(5):
+        owner_leader = UserFactory()
+        owner = UserFactory(leader=owner_leader, committee=committee)
+        notes.append(NoteFactory(owner=owner, submit_status=NoteSubmitStatus.PENDING))
+
+    with django_assert_max_num_queries(15):
+        committee.members.add(committee_user)
+
+    expected = committee_roles_permissions[NoteType.Proposal]
+    for note in notes:
+        acl = NoteUserAccess.objects.get(user=committee_user, note=note)
+        for field, value in expected.items():
+            assert getattr(acl, field) == value
+
 # ───────────────────────────────────────────────
 # D. Signals
 # ───────────────────────────────────────────────
@@ -444,4 +486,186 @@ def test_committee_roles_m2m_signal_grants_acl(user, committee_user):
     committee.roles.add(role_cto)
 
     # now acl should exist
-    assert NoteUserAccess.objects.filter(user=org_cto, note=note).exists()
\ No newline at end of file
+    assert NoteUserAccess.objects.filter(user=org_cto, note=note).exists()
+
+@pytest.mark.django_db
+def test_deferred_acl_recompute_is_queued_and_coalesced(user, committee_user, mentioned_user, settings,
+                                                        django_capture_on_commit_callbacks):
+    """With ACL_RECOMPUTE_DEFERRED, m2m changes enqueue one row per key and process_acl_queue applies them."""
+    settings.ACL_RECOMPUTE_DEFERRED = "true"
+    committee = CommitteeFactory()
+    user.committee = committee
+    user.save(update_fields=["committee"])
+    note = NoteFactory(owner=user, submit_status=NoteSubmitStatus.PENDING)
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        committee.members.add(committee_user)
+        committee.members.add(mentioned_user)
+        committee.members.remove(mentioned_user)
+        note.mentioned_users.add(mentioned_user)
+    assert sum(cb.__name__ == "_flush_pending_keys" for cb in callbacks) == 1
+
+    queued = set(NoteAccessRecompute.objects.values_list("note_id", "user_id"))
+    assert queued == {(None, user.pk), (note.pk, None)}
+    assert not NoteUserAccess.objects.filter(user=committee_user, note=note).exists()
+
+    assert process_acl_queue(batch_size=1) == 2
+    assert not NoteAccessRecompute.objects.exists()
+    assert NoteUserAccess.objects.get(user=committee_user, note=note).can_view
+    assert NoteUserAccess.objects.get(user=mentioned_user, note=note).can_write_feedback
+
+
+# ───────────────────────────────────────────────
+# Role cache (RoleSet)
+# ───────────────────────────────────────────────
+
+
+@pytest.mark.django_db
+def test_role_set_collects_roles_across_models(user):
+    """One RoleSet covers organization, tribe and team/chapter role fields."""
+    from api.services.timeline_access import RoleSet, has_role
+
+    OrganizationFactory(cto=user, hr_manager=user)
+    TribeFactory(engineering_director=user)
+    TeamFactory(leader=user)
+
+    role_set = RoleSet.compute(user.pk)
+    assert role_set.attrs == {"cto", "hr_manager", "engineering_director", "leader"}
+    assert has_role(user, {RoleType.CTO})
+    assert has_role(user, {RoleType.CEO, RoleType.LEADER})
+    assert not has_role(user, {RoleType.CEO, RoleType.CPO})
+
+
+@pytest.mark.django_db
+def test_has_role_is_memoized_per_user(user, django_assert_num_queries):
+    """After the first call, has_role answers from the memoized RoleSet."""
+    from django.core.cache import cache
+    from api.services.timeline_access import has_role
+
+    OrganizationFactory(ceo=user)
+    cache.clear()
+    user = User.objects.get(pk=user.pk)
+    # the org-structure version and the UNION of role fields
+    with django_assert_num_queries(2):
+        assert has_role(user, {RoleType.CEO})
+        assert not has_role(user, {RoleType.CTO})
+        assert not has_role(user, {RoleType.LEADER})
+    # a fresh object for the same user (next request) hits the shared cache instead
+    fresh = User(pk=user.pk, email=user.email)
+    with django_assert_num_queries(1):
+        assert has_role(fresh, {RoleType.CEO})
+
+
+@pytest.mark.django_db
+def test_role_set_invalidated_by_other_processes(user):
+    """A role revoked and committed by another process stops granting access on the next request."""
+    from django.core.cache import cache
+    from api.services.org_structure import bump_org_structure_version
+    from api.services.timeline_access import has_role
+
+    cache.clear()
+    org = OrganizationFactory(hr_manager=user)
+    assert has_role(User.objects.get(pk=user.pk), {RoleType.HR_MANAGER})
+
+    # update() sends no signals; the other process only bumps the stored version
+    Organization.objects.filter(pk=org.pk).update(hr_manager=None)
+    bump_org_structure_version()
+    assert not has_role(User.objects.get(pk=user.pk), {RoleType.HR_MANAGER})
+
+
+@pytest.mark.django_db
+def test_role_set_invalidated_on_org_save(user, leader):
+    """Reassigning a role FK drops the cached roles of both the old and new holder."""
+    from api.services.timeline_access import has_role
+
+    org = OrganizationFactory(cto=user)
+    assert has_role(user, {RoleType.CTO})
+    assert not has_role(leader, {RoleType.CTO})
+
+    org.cto = leader
+    org.save()
+    assert not has_role(user, {RoleType.CTO})
+    assert has_role(leader, {RoleType.CTO})
+
+    team = TeamFactory(leader=user)
+    assert has_role(user, {RoleType.LEADER})
+    team.delete()
+    assert not has_role(user, {RoleType.LEADER})
+
+
+@pytest.mark.django_db
+def test_user_permissions_cached_until_org_structure_changes(user, leader, django_assert_num_queries):
+    """The payload is served from cache with an ETag and recomputed after an org change."""
+    from django.core.cache import cache
+    from rest_framework.test import APIClient
+
+    cache.clear()
+    client = APIClient()
+    client.force_authenticate(user=user)
+    url = "/api/profile/permissions/"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert "CEO" not in first.data["user"]["roles"]
+    # one query each: the org-structure version
+    with django_assert_num_queries(2):
+        assert client.get(url).data == first.data
+        assert client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+
+    OrganizationFactory(ceo=user)
+    changed = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert changed.status_code == 200
+    assert "CEO" in changed.data["user"]["roles"]
+    assert changed["ETag"] != first["ETag"]
+
+    # unrelated saves keep the cached payload
+    etag = changed["ETag"]
+    leader.last_login = timezone.now()
+    leader.save(update_fields=["last_login"])
+    with django_assert_num_queries(1):
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+
+@pytest.mark.django_db
+def test_user_permissions_invalidated_by_other_processes(user):
+    """The org-structure version lives in the database, so bumps made elsewhere are seen."""
+    from django.core.cache import cache
+    from rest_framework.test import APIClient
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from api.services.org_structure import bump_org_structure_version, org_structure_version
+
+    cache.clear()
+    client = APIClient()
+    client.force_authenticate(user=user)
+    url = "/api/profile/permissions/"
+    first = client.get(url)
+
+    # A management command in another process commits a bump: only the stored version tells
+    version = org_structure_version()
+    bump_org_structure_version()
+    assert org_structure_version() != version
+
+    with CaptureQueriesContext(connection) as captured:
+        assert client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+    # recomputed, not served from the cache
+    assert len(captured.captured_queries) > 1
+
+
+@pytest.mark.django_db
+def test_org_structure_version_kept_by_saves_that_change_no_tracked_field(user, leader):
+    """Logins and full saves of unchanged users keep the version; org changes still bump it."""
+    from api.services.org_structure import org_structure_version
+
+    version = org_structure_version()
+    # What the BEPA callback does on every login
+    user.last_login = timezone.now()
+    user.save(update_fields=["last_login"])
+    # A full-instance save that only touches an untracked field
+    user.last_login = timezone.now()
+    user.save()
+    assert org_structure_version() == version
+
+    user.leader = leader
+    user.save()
+    assert org_structure_version() != version
@@ -64,6 +64,7 @@ urlpatterns = [
     path("users/", views.UserListView.as_view(), name="user-list"),
     path("users/<uuid:uuid>/", views.UserDetailView.as_view(), name="user-detail"),
     path("templates/", views.TemplatesView.as_view(), name="templates"),
+    path("inbox/summary/", views.InboxSummaryView.as_view(), name="inbox-summary"),
     path("value-tags/", views.ValueTagListView.as_view(), name="value-tags"),
     path("users/<uuid:user_id>/timeline/", UserTimelineView.as_view(), name="user-timeline"),
     path("personnel/performance-table/", PersonnelPerformanceTableView.as_view(), name="personnel-performance-table"),
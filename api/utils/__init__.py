@@ -2,5 +2,7 @@ from .timeline import *
 from .form import *
 from .performance_tables import *
 from .seniority_level import *
+from .http import *
+from .streaming import *
 
 __all__ = []
\ No newline at end of file
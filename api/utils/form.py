@@ -1,9 +1,9 @@
 from collections import defaultdict
-from django.db.models import Avg
-from api.models import Question
+from django.db.models import Avg, Count, Sum
+from api.models import FormResponse, Question, User
 
 
-__all__ = ['calculate_form_results']
+__all__ = ['calculate_form_results', 'aggregate_form_results']
 
 
 def calculate_form_results(responses, form):
@@ -53,3 +53,82 @@ def calculate_form_results(responses, form):
         "categories": category_averages,    # dict
         "questions": question_averages,     # list of dicts
     }
+
+
+def aggregate_form_results(form, assignments, date_range=None):
+    """
+    Calculate calculate_form_results() for every assessed user (assigned_by) of *assignments*
+    with a fixed number of queries.
+
+    Responses are summed in one query grouped by (responder, question) and pivoted in memory
+    into each assessed user's question, category and overall averages, following the same
+    rules as calculate_form_results (NULL "I don't know" answers are left out of averages but
+    count towards the overall weighting).
+
+    Args:
+        form (Form): The form being processed.
+        assignments (QuerySet): FormAssignment rows of the form to aggregate.
+        date_range (tuple, optional): (start, end) bounds on the responses' date_created.
+
+    Returns:
+        list: One dict per assessed user, ordered by id, with "assigned_by" and
+        "assigned_by_name" added to the calculate_form_results keys.
+    """
+    responders = defaultdict(set)
+    for assessed_id, responder_id in assignments.values_list("assigned_by", "assigned_to").distinct():
+        responders[assessed_id].add(responder_id)
+    if not responders:
+        return []
+
+    questions = list(Question.objects.filter(form=form).order_by("pk").values_list("pk", "question_text", "category"))
+    responses = FormResponse.objects.filter(
+        question__form=form,
+        user_id__in=set().union(*responders.values()),
+    )
+    if date_range is not None:
+        responses = responses.filter(date_created__range=date_range)
+    # (responder, question) -> (sum of answers, answered count, response count)
+    totals = {
+        (row["user_id"], row["question_id"]): (row["answer_sum"] or 0, row["answered"], row["responses"])
+        for row in responses.values("user_id", "question_id").annotate(
+            answer_sum=Sum("answer"), answered=Count("answer"), responses=Count("id")
+        )
+    }
+    names = dict(User.objects.filter(pk__in=responders.keys()).values_list("pk", "name"))
+
+    results = []
+    for assessed_id in sorted(responders):
+        category_totals = {}
+        question_averages = []
+        total_sum = 0
+        total_count = 0
+        for question_id, text, category in questions:
+            answer_sum = answered = count = 0
+            for responder_id in responders[assessed_id]:
+                q_sum, q_answered, q_count = totals.get((responder_id, question_id), (0, 0, 0))
+                answer_sum += q_sum
+                answered += q_answered
+                count += q_count
+            question_avg = answer_sum / answered if answered else None
+            question_averages.append({
+                "id": question_id,
+                "text": text,
+                "average": question_avg,
+            })
+            if count:
+                category_sum, category_answered = category_totals.get(category, (0, 0))
+                category_totals[category] = (category_sum + answer_sum, category_answered + answered)
+            total_sum += (question_avg if question_avg is not None else 0) * count
+            total_count += count
+
+        results.append({
+            "total_average": None if total_count == 0 else total_sum / total_count,
+            "categories": {
+                category: category_sum / category_answered if category_answered else None
+                for category, (category_sum, category_answered) in category_totals.items()
+            },
+            "questions": question_averages,
+            "assigned_by": assessed_id,
+            "assigned_by_name": names.get(assessed_id, ""),
+        })
+    return results
@@ -0,0 +1,32 @@
+import hashlib
+import json
+from typing import Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+__all__ = ["json_etag", "etag_response"]
+
+
+def json_etag(payload) -> str:
+    """Strong ETag of a JSON-serialisable payload (stable across key order)."""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), cls=DjangoJSONEncoder)
+    return quote_etag(hashlib.md5(body.encode(), usedforsecurity=False).hexdigest())
+
+
+def etag_response(request, payload, etag: Optional[str] = None) -> Response:
+    """Response carrying *payload* and its ETag, or an empty 304 if the client's
+    If-None-Match already matches. Clients must revalidate before reusing a copy.
+    """
+    etag = etag or json_etag(payload)
+    known = parse_etags(request.headers.get("If-None-Match", ""))
+    if "*" in known or etag in (tag.removeprefix("W/") for tag in known):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(payload)
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
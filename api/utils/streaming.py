@@ -0,0 +1,8 @@
+__all__ = ["Echo"]
+
+
+class Echo:
+    """File-like object whose write() returns the value, so csv.writer output can be yielded."""
+
+    def write(self, value):
+        return value
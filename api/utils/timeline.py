@@ -1,13 +1,46 @@
 from typing import Optional, Dict
 
-from api.models import SenioritySnapshot, User, LadderAspect
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+
+from api.models import SenioritySnapshot, User, LadderAspect, LadderLevel
 from api.models.timeline import TitleChange
 
 __all__ = [
     "get_current_level",
     "get_current_job_title",
+    "get_ladder_aspect_info",
+    "invalidate_ladder_aspect_info",
 ]
 
+LADDER_ASPECTS_CACHE_PREFIX = "ladder_aspects"
+
+
+def _ladder_aspects_cache_key(ladder_id) -> str:
+    return f"{LADDER_ASPECTS_CACHE_PREFIX}:{ladder_id}"
+
+
+def get_ladder_aspect_info(ladder_id) -> Dict:
+    """Return ``{"names": {aspect code: name}, "max_level": int}`` for a ladder, cached.
+
+    The entry is dropped by the LadderAspect / LadderLevel signals; bulk imports that bypass
+    them are covered by ``LADDER_ASPECTS_CACHE_TIMEOUT``.
+    """
+    key = _ladder_aspects_cache_key(ladder_id)
+    info = cache.get(key)
+    if info is None:
+        info = {
+            "names": dict(LadderAspect.objects.filter(ladder_id=ladder_id).values_list("code", "name")),
+            "max_level": LadderLevel.objects.filter(ladder_id=ladder_id).aggregate(m=Max("level"))["m"] or 0,
+        }
+        cache.set(key, info, getattr(settings, "LADDER_ASPECTS_CACHE_TIMEOUT", 3600))
+    return info
+
+
+def invalidate_ladder_aspect_info(ladder_id) -> None:
+    cache.delete(_ladder_aspects_cache_key(ladder_id))
+
 
 def get_current_level(user: User) -> Optional[Dict]:
     """Return the latest seniority data for the user or None.
@@ -22,21 +55,19 @@ def get_current_level(user: User) -> Optional[Dict]:
     snapshot = (
         SenioritySnapshot.objects.filter(user=user)
         .order_by("-effective_date", "-date_created")
-        .select_related("ladder")
         .first()
     )
     if not snapshot:
         return None
-    
+
+    ladder_info = get_ladder_aspect_info(snapshot.ladder_id) if snapshot.ladder_id else None
+
     # Map aspect codes to names
     details_with_names = {}
     stages_with_names = {}
-    if snapshot.ladder and snapshot.details_json:
-        # Get aspect names for this ladder
-        aspect_names = {}
-        for aspect in LadderAspect.objects.filter(ladder=snapshot.ladder):
-            aspect_names[aspect.code] = aspect.name
-        
+    if ladder_info and snapshot.details_json:
+        aspect_names = ladder_info["names"]
+
         # Map codes to names in details and stages
         for code, level in snapshot.details_json.items():
             aspect_name = aspect_names.get(code, code)  # Fallback to code if name not found
@@ -48,12 +79,12 @@ def get_current_level(user: User) -> Optional[Dict]:
         # If no ladder or details, return as is
         details_with_names = snapshot.details_json
         stages_with_names = snapshot.stages_json or {}
-    
+
     return {
         "overall": snapshot.overall_score,
         "details": details_with_names,
         "stages": stages_with_names,
-        "max_level": snapshot.ladder.get_max_level() if snapshot.ladder else 0,
+        "max_level": ladder_info["max_level"] if ladder_info else 0,
     }
 
 
@@ -168,16 +168,19 @@ class BepaCallbackView(APIView):
         from django.utils import timezone
         
         user, created = User.objects.get_or_create(email=email)
+        update_fields = ["last_login"]
 
         if not user.name:
             user.name = name
+            update_fields.append("name")
 
         if created:
             user.set_unusable_password()
+            update_fields.append("password")
         
         # Update last_login to track BEPA logins
         user.last_login = timezone.now()
-        user.save()
+        user.save(update_fields=update_fields)
 
         refresh = RefreshToken.for_user(user)
         refresh["name"] = user.name
@@ -1,4 +1,4 @@
-import copy
+from django.db.models import Exists, OuterRef
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from datetime import datetime, time
@@ -8,7 +8,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from api.models import User, Form, Question, FormResponse, FormAssignment, Cycle
-from api.utils import calculate_form_results
+from api.utils import aggregate_form_results
 from api.serializers import (
     FormSerializer,
     FormDetailSerializer,
@@ -21,6 +21,16 @@ from api.views.mixins import CycleQueryParamMixin
 __all__ = ['FormViewSet']
 
 
+def _with_serializer_flags(forms, user):
+    """Annotate the is_expired / is_filled inputs of FormSerializer so it runs no per-form queries."""
+    return forms.select_related("cycle").annotate(
+        has_open_assignment=Exists(
+            FormAssignment.objects.filter(form=OuterRef("pk"), deadline__gte=timezone.now().date())
+        ),
+        is_filled_by_user=Exists(FormResponse.objects.filter(form=OuterRef("pk"), user=user)),
+    )
+
+
 class FormViewSet(CycleQueryParamMixin, viewsets.ModelViewSet):
     """
     A ViewSet to handle CRUD operations on forms, and form assignment.
@@ -265,41 +275,13 @@ class FormViewSet(CycleQueryParamMixin, viewsets.ModelViewSet):
         
         # Adjust the cycle's end date to include the entire day
         adjusted_end_date = timezone.make_aware(datetime.combine(cycle.end_date, time.max))
-
-        # A helper to fetch and calculate results given a queryset of assignments
-        def get_aggregated_results(assignments):
-            # If there are no assignments, return None
-            if not assignments.exists():
-                return None
-            # We want to group by the assessed user (assigned_by).
-            aggregated_list = []
-            distinct_assessed_ids = assignments.values_list("assigned_by", flat=True).distinct()
-            for assessed_id in distinct_assessed_ids:
-                # Get assignments for this assessed user
-                assignments_for_assessed = assignments.filter(assigned_by=assessed_id)
-                responses = FormResponse.objects.filter(
-                    question__form=form,
-                    user__in=assignments_for_assessed.values_list("assigned_to", flat=True),
-                    date_created__range=(cycle.start_date, adjusted_end_date),
-                )
-                aggregated = calculate_form_results(responses, form)
-                # Add the assessed user's id and name
-                aggregated["assigned_by"] = assessed_id
-                try:
-                    user_obj = User.objects.get(id=assessed_id)
-                    aggregated["assigned_by_name"] = user_obj.name
-                except User.DoesNotExist:
-                    aggregated["assigned_by_name"] = ""
-                aggregated_list.append(aggregated)
-
-            return aggregated_list
+        date_range = (cycle.start_date, adjusted_end_date)
 
         # Get results for the current user (My Results)
-        my_results_data = get_aggregated_results(my_assignments)
         # Since the current user is the assessed user, we expect a single aggregated result.
-        my_results = my_results_data if my_results_data else []
+        my_results = aggregate_form_results(form, my_assignments, date_range)
         # Get results for the team (My Team's Results)
-        team_results = get_aggregated_results(team_assignments) or []
+        team_results = aggregate_form_results(form, team_assignments, date_range)
 
         # Prepare the structured response
         response_data = {
@@ -327,7 +309,7 @@ class FormViewSet(CycleQueryParamMixin, viewsets.ModelViewSet):
             if not cycle:
                 return Response({"detail": "No valid cycle found."}, status=status.HTTP_400_BAD_REQUEST)
         
-        forms = Form.objects.filter(cycle=cycle)
+        forms = _with_serializer_flags(Form.objects.filter(cycle=cycle), request.user)
         # my_forms: forms where an assignment exists with assigned_by == request.user.
         my_forms = forms.filter(formassignment__assigned_by=request.user).distinct()
         
@@ -339,26 +321,30 @@ class FormViewSet(CycleQueryParamMixin, viewsets.ModelViewSet):
         # team_forms: forms where an assignment exists with assigned_by__leader == request.user,
         team_assignments = FormAssignment.objects.filter(form__cycle=cycle, assigned_by__leader=request.user)
         # Group by form and assessed user.
-        distinct_pairs = team_assignments.values_list("form_id", "assigned_by", flat=False).distinct()
-
-        team_forms = []
-        for form_id, assessed_id in distinct_pairs:
-            form = Form.objects.get(id=form_id)
-
-            try:
-                assigned_by_name = User.objects.get(id=assessed_id).name
-            except User.DoesNotExist:
-                assigned_by_name = ""
-            # Shallow-copy the form so that each entry is independent.
-            form_copy = copy.copy(form) 
-            form_copy._assigned_by = assessed_id
-            form_copy._assigned_by_name = assigned_by_name
-            team_forms.append(form_copy)
-                
+        distinct_pairs = list(team_assignments.values_list("form_id", "assigned_by", flat=False).distinct())
+
+        # Each form is serialized once; every (form, assessed user) pair reuses its row
+        team_form_objs = forms.in_bulk({form_id for form_id, _ in distinct_pairs})
+        assessed_names = User.objects.only("name").in_bulk({assessed_id for _, assessed_id in distinct_pairs})
+        for form in team_form_objs.values():
+            # Filled per pair below; skips the serializer's assigned_by_name fallback queries
+            form._assigned_by = form._assigned_by_name = None
+        team_form_rows = {
+            row["id"]: row
+            for row in FormSerializer(team_form_objs.values(), many=True, context={"request": request}).data
+        }
+        team_forms = [
+            {
+                **team_form_rows[form_id],
+                "assigned_by": assessed_id,
+                "assigned_by_name": getattr(assessed_names.get(assessed_id), "name", ""),
+            }
+            for form_id, assessed_id in distinct_pairs
+        ]
+
         my_serializer = FormSerializer(my_forms, many=True, context={"request": request})
-        team_serializer = FormSerializer(team_forms, many=True, context={"request": request})
 
         return Response({
             "my_forms": my_serializer.data,
-            "team_forms": team_serializer.data
+            "team_forms": team_forms
         })
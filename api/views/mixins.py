@@ -1,3 +1,6 @@
+from functools import lru_cache
+
+from api.middleware import timed_serializer
 from api.models import Cycle
 
 class CycleQueryParamMixin:
@@ -16,3 +19,35 @@ class CycleQueryParamMixin:
             currnet_cycle = Cycle.get_current_cycle()
             queryset = queryset.filter(cycle=currnet_cycle)
         return super().filter_queryset(queryset)
+
+
+@lru_cache(maxsize=None)
+def _timed_serializer_class(serializer_class):
+    """Subclass of *serializer_class* whose ``.data`` is timed into the request metrics."""
+
+    class TimedSerializer(serializer_class):
+        _timed = True
+
+        @property
+        def data(self):
+            with timed_serializer():
+                return super().data
+
+    TimedSerializer.__name__ = TimedSerializer.__qualname__ = serializer_class.__name__
+    return TimedSerializer
+
+
+class QueryBudgetMixin:
+    """Declares the SQL query budget of a view for RequestMetricsMiddleware.
+
+    ``query_budget`` is an int, or a dict keyed by viewset action (``{"list": 10}``).
+    Serializers returned by get_serializer() are timed for the Server-Timing header.
+    """
+
+    query_budget = None
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if not getattr(serializer, "_timed", False):
+            serializer.__class__ = _timed_serializer_class(type(serializer))
+        return serializer
@@ -1,10 +1,10 @@
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Prefetch, Q
 from django.db import transaction
 from django.shortcuts import get_object_or_404
 from rest_framework import status, viewsets, permissions, mixins
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
-from rest_framework.generics import ListAPIView
+from rest_framework.generics import ListAPIView, RetrieveAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.utils.translation import gettext_lazy as _
@@ -28,17 +28,19 @@ from api.permissions import (
 )
 from api.serializers import (
     CommentSerializer,
+    InboxCounterSerializer,
     NoteSerializer,
     SummarySerializer,
     OneOnOneSerializer,
 )
-from api.services import get_notes_visible_to
-from api.views.mixins import CycleQueryParamMixin
+from api.services import get_inbox_counter, get_notes_visible_to
+from api.views.mixins import CycleQueryParamMixin, QueryBudgetMixin
 
 
 __all__ = [
     "NoteViewSet",
     "TemplatesView",
+    "InboxSummaryView",
     "CommentViewSet",
     "FeedbackViewSet",
     "SummaryViewSet",
@@ -47,7 +49,8 @@ __all__ = [
 ]
 
 
-class NoteViewSet(CycleQueryParamMixin, viewsets.ModelViewSet):
+class NoteViewSet(QueryBudgetMixin, CycleQueryParamMixin, viewsets.ModelViewSet):
+    query_budget = {"list": 10}
     lookup_field = "uuid"
     serializer_class = NoteSerializer
     permission_classes = (IsAuthenticated, NotePermission)
@@ -75,35 +78,33 @@ class NoteViewSet(CycleQueryParamMixin, viewsets.ModelViewSet):
         proposal_type_filter = self.request.query_params.get("proposal_type")
         unread_filter = self.request.query_params.get("unread")
 
-        accessible_notes = get_notes_visible_to(self.request.user)
+        user = self.request.user
+        accessible_notes = get_notes_visible_to(user)
 
+        # Every mode is a single filtered query over the visible notes; the joined relations
+        # are single-valued (FK / one-to-one), so rows never repeat and no DISTINCT is needed.
         if user_email:
             queryset = accessible_notes.filter(owner__email=user_email)
 
         elif retrieve_mentions:
             # Get all accessible notes user doesn't own
-            queryset = accessible_notes.filter(~Q(owner=self.request.user))
-            
+            queryset = accessible_notes.exclude(owner=user)
+
             # EXCLUDE feedback answers where user is only mentioned in parent REQUEST
             # (not the receiver). This prevents phantom notifications for "observer" mentions.
             # User can still access these answers via /feedback-requests/{uuid}/entries/
             queryset = queryset.exclude(
                 Q(type=NoteType.FEEDBACK) &
                 Q(feedback__feedback_request__isnull=False) &  # It's an answer (has parent request)
-                ~Q(feedback__receiver=self.request.user)  # User is NOT the receiver
+                ~Q(feedback__receiver=user)  # User is NOT the receiver
             )
 
         else:
-            queryset = accessible_notes.filter(owner=self.request.user)
-
-            # ALSO include feedback the user received
-            queryset = queryset | accessible_notes.filter(
-                type=NoteType.FEEDBACK, feedback__receiver=self.request.user
-            )
-
-            # ALSO include 1-on-1s where the user is the member
-            queryset = queryset | accessible_notes.filter(
-                type=NoteType.ONE_ON_ONE, one_on_one__member=self.request.user
+            # Own notes, feedback the user received and 1-on-1s where the user is the member
+            queryset = accessible_notes.filter(
+                Q(owner=user)
+                | Q(type=NoteType.FEEDBACK, feedback__receiver=user)
+                | Q(type=NoteType.ONE_ON_ONE, one_on_one__member=user)
             )
 
         if note_type_filter:
@@ -112,12 +113,25 @@ class NoteViewSet(CycleQueryParamMixin, viewsets.ModelViewSet):
         if proposal_type_filter:
             queryset = queryset.filter(proposal_type=proposal_type_filter)
 
+        is_read = Exists(Note.read_by.through.objects.filter(note_id=OuterRef("pk"), user_id=user.pk))
         if unread_filter and unread_filter.lower() == "true":
-            user = self.request.user
-            queryset = queryset.exclude(read_by=user)
+            queryset = queryset.filter(~is_read)
 
         # Optimize nested serialization of linked notes and read status
-        queryset = queryset.prefetch_related(
+        return queryset.select_related(
+            "owner",
+            "one_on_one__member",
+            "feedback__feedback_request",
+            "feedback_request",
+        ).annotate(
+            is_read=is_read
+        ).prefetch_related(
+            "mentioned_users",
+            Prefetch(
+                "noteuseraccess_set",
+                queryset=NoteUserAccess.objects.filter(user=user),
+                to_attr="user_accesses",
+            ),
             "linked_notes",
             "linked_notes__one_on_one",
             "linked_notes__feedback",
@@ -125,8 +139,6 @@ class NoteViewSet(CycleQueryParamMixin, viewsets.ModelViewSet):
             "linked_notes__read_by",
         )
 
-        return queryset.distinct()
-
     @action(detail=True, methods=["post"], url_path="read")
     def mark_note_as_read(self, request, uuid=None):
         """
@@ -182,6 +194,19 @@ class TemplatesView(ListAPIView):
         return (user_templates | public_templates).distinct()
 
 
+class InboxSummaryView(QueryBudgetMixin, RetrieveAPIView):
+    """
+    Unread and pending counters for the inbox badges of the current user
+    """
+
+    query_budget = 2  # authenticated user + the InboxCounter primary-key read
+    permission_classes = [IsAuthenticated]
+    serializer_class = InboxCounterSerializer
+
+    def get_object(self):
+        return get_inbox_counter(self.request.user)
+
+
 class CommentViewSet(CycleQueryParamMixin, viewsets.ModelViewSet):
     lookup_field = "uuid"
     serializer_class = CommentSerializer
@@ -1,23 +1,32 @@
-import csv
-from datetime import datetime
-from io import StringIO
+import hashlib
+from datetime import date, datetime
 
 from django.conf import settings
+from django.core.cache import cache
 from django.http import StreamingHttpResponse
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, OpenApiParameter, PolymorphicProxySerializer
 
 from api.services.performance_tables import (
     build_personnel_performance_queryset,
     apply_personnel_filters,
     apply_personnel_ordering,
+    apply_personnel_keyset,
+    encode_personnel_cursor,
+    decode_personnel_cursor,
+    personnel_cursor_values,
+    iter_personnel_performance_csv,
 )
-from api.services.timeline_access import can_view_timeline, has_role
+from api.services.timeline_access import resolve_visible_users, has_role
 from api.utils.performance_tables import build_csv_filename
-from api.serializers.performance_tables import PerformanceTableResponseSerializer
+from api.serializers.performance_tables import (
+    PerformanceTableResponseSerializer,
+    PerformanceTableCursorResponseSerializer,
+)
 from api.models import RoleType
+from api.views.mixins import QueryBudgetMixin
 
 __all__ = [
     "PersonnelPerformanceTableView",
@@ -50,10 +59,22 @@ def is_service_account(user):
 
 
 @extend_schema(
-    responses={200: PerformanceTableResponseSerializer},
+    parameters=[
+        OpenApiParameter("cursor", str, description="Opt into keyset pagination; empty for the first page, "
+                                                    "then the previous response's next_cursor"),
+        OpenApiParameter("include_count", bool, description="Cursor mode only: include the (cached) total count"),
+    ],
+    responses={
+        200: PolymorphicProxySerializer(
+            component_name="PerformanceTablePage",
+            serializers=[PerformanceTableResponseSerializer, PerformanceTableCursorResponseSerializer],
+            resource_type_field_name=None,
+        )
+    },
 )
-class PersonnelPerformanceTableView(APIView):
+class PersonnelPerformanceTableView(QueryBudgetMixin, APIView):
     permission_classes = [IsAuthenticated]
+    query_budget = 15
 
     def get(self, request):
         return self._json_response(request)
@@ -81,68 +102,113 @@ class PersonnelPerformanceTableView(APIView):
         # Apply ordering
         qs = apply_personnel_ordering(qs, request.query_params.get("ordering"))
 
-        # Filter by access per user (safety net)
-        visible = []
-        for u in qs:
-            if can_view_timeline(request.user, u):
-                visible.append(u)
-        
-
+        # Filter by access (safety net), applied in the database as a subquery
+        visible = qs.filter(id__in=resolve_visible_users(request.user).values("pk"))
 
         # Pagination
+        cursor_mode = "cursor" in request.query_params
         try:
-            page = int(request.query_params.get("page", 1))
+            page = 1 if cursor_mode else int(request.query_params.get("page", 1))
             page_size = int(request.query_params.get("page_size", 10))
         except ValueError:
             return Response({"detail": "Invalid page or page_size"}, status=400)
-        
+        if page < 1 or page_size < 1:
+            return Response({"detail": "Invalid page or page_size"}, status=400)
+
         # Service accounts can request larger page sizes
         max_page_size = 5000 if is_service_account(request.user) else 500
         if page_size > max_page_size:
             page_size = max_page_size
+
+        if cursor_mode:
+            return self._cursor_response(request, visible, page_size)
+
         start = (page - 1) * page_size
         end = start + page_size
         page_items = visible[start:end]
 
-        # Serialize all requested columns
-        data = []
-        for u in page_items:
-            row = {
-                "uuid": str(u.uuid),
-                "name": u.name or u.email,
-                "last_committee_date": getattr(u, "_last_committee_date", None),
-                "committees_current_year": getattr(u, "_committees_current_year", 0)
-                or 0,
-                "committees_last_year": getattr(u, "_committees_last_year", 0) or 0,
-                "pay_band": getattr(u, "_pay_band_number", None),
-                "salary_change": getattr(u, "_salary_change", None),
-                "is_mapped": bool(getattr(u, "_is_mapped", False)),
-                "last_bonus_date": getattr(u, "_last_bonus_date", None),
-                "last_bonus_percentage": getattr(u, "_last_bonus_percentage", None),
-                "last_salary_change_date": getattr(u, "_last_salary_change_date", None),
-                "ladder": getattr(u, "_ladder_name", None),
-                "ladder_levels": getattr(u, "_details_json", {}) if getattr(u, "_details_json", {}) is not None else {},
-                "overall_level": getattr(u, "_overall_score", None),
-                "seniority_level": getattr(u, "_seniority_level", None),
-                "leader": getattr(u, "_leader_name", None)
-                or getattr(u.leader, "name", None),
-                "team": getattr(u, "_team_name", None) or getattr(u.team, "name", None),
-                "tribe": getattr(u, "_tribe_name", None)
-                or getattr(getattr(u.team, "tribe", None), "name", None),
+        return Response(
+            {
+                "count": visible.count(),
+                "page": page,
+                "page_size": page_size,
+                "results": [_performance_row(u) for u in page_items],
             }
-            data.append(row)
+        )
 
+    def _cursor_response(self, request, visible, page_size):
+        """Keyset pagination: fetch page_size + 1 rows sorting after the cursor position."""
+        ordering = request.query_params.get("ordering")
+        cursor = request.query_params.get("cursor")
+        try:
+            after = decode_personnel_cursor(cursor, ordering) if cursor else None
+        except ValueError:
+            return Response({"detail": "Invalid cursor"}, status=400)
+
+        rows = list(apply_personnel_keyset(visible, ordering, after)[: page_size + 1])
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        next_cursor = (
+            encode_personnel_cursor(ordering, personnel_cursor_values(rows[-1], ordering))
+            if has_next
+            else None
+        )
 
+        count = None
+        if request.query_params.get("include_count") == "true":
+            count = self._cached_count(request, visible)
 
         return Response(
             {
-                "count": len(visible),
-                "page": page,
+                "count": count,
                 "page_size": page_size,
-                "results": data,
+                "next_cursor": next_cursor,
+                "results": [_performance_row(u) for u in rows],
             }
         )
 
+    def _cached_count(self, request, visible):
+        """Total row count for the viewer and filters, cached so paging through a cursor counts once."""
+        params = sorted(
+            (key, value)
+            for key, value in request.query_params.lists()
+            if key not in ("cursor", "page", "page_size", "include_count")
+        )
+        digest = hashlib.sha1(repr((request.user.pk, date.today(), params)).encode()).hexdigest()
+        cache_key = f"performance_table:count:{digest}"
+        count = cache.get(cache_key)
+        if count is None:
+            count = visible.count()
+            cache.set(cache_key, count, getattr(settings, "PERFORMANCE_TABLE_COUNT_CACHE_TIMEOUT", 60))
+        return count
+
+
+def _performance_row(u):
+    """Serialize one annotated user row of the performance table."""
+    return {
+        "uuid": str(u.uuid),
+        "name": u.name or u.email,
+        "last_committee_date": getattr(u, "_last_committee_date", None),
+        "committees_current_year": getattr(u, "_committees_current_year", 0)
+        or 0,
+        "committees_last_year": getattr(u, "_committees_last_year", 0) or 0,
+        "pay_band": getattr(u, "_pay_band_number", None),
+        "salary_change": getattr(u, "_salary_change", None),
+        "is_mapped": bool(getattr(u, "_is_mapped", False)),
+        "last_bonus_date": getattr(u, "_last_bonus_date", None),
+        "last_bonus_percentage": getattr(u, "_last_bonus_percentage", None),
+        "last_salary_change_date": getattr(u, "_last_salary_change_date", None),
+        "ladder": getattr(u, "_ladder_name", None),
+        "ladder_levels": getattr(u, "_details_json", {}) if getattr(u, "_details_json", {}) is not None else {},
+        "overall_level": getattr(u, "_overall_score", None),
+        "seniority_level": getattr(u, "_seniority_level", None),
+        "leader": getattr(u, "_leader_name", None)
+        or getattr(u.leader, "name", None),
+        "team": getattr(u, "_team_name", None) or getattr(u.team, "name", None),
+        "tribe": getattr(u, "_tribe_name", None)
+        or getattr(getattr(u.team, "tribe", None), "name", None),
+    }
+
 
 class PersonnelPerformanceCSVView(APIView):
     permission_classes = [IsAuthenticated]
@@ -168,70 +234,15 @@ class PersonnelPerformanceCSVView(APIView):
         # Apply ordering
         qs = apply_personnel_ordering(qs, request.query_params.get("ordering"))
 
-        # Filter by access per user (safety net)
-        visible = []
-        for u in qs:
-            if can_view_timeline(request.user, u):
-                visible.append(u)
-        
+        # Filter by access (safety net), applied in the database as a subquery
+        visible = qs.filter(id__in=resolve_visible_users(request.user).values("pk"))
+
         # Check if user has access to any data
-        if not visible:
+        if not visible.exists():
             return Response({"detail": "No data accessible to user"}, status=404)
         
-        try:
-            # Create full CSV with all fields
-            buffer = StringIO()
-            fieldnames = [
-                "uuid",
-                "name",
-                "last_committee_date",
-                "committees_current_year",
-                "committees_last_year",
-                "pay_band",
-                "salary_change",
-                "is_mapped",
-                "last_bonus_date",
-                "last_bonus_percentage",
-                "last_salary_change_date",
-                "ladder",
-                "ladder_levels",
-                "overall_level",
-                "seniority_level",
-                "leader",
-                "team",
-                "tribe",
-            ]
-            
-            writer = csv.DictWriter(buffer, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            # Serialize all data for CSV
-            for u in visible:
-                row = {
-                    "uuid": str(u.uuid),
-                    "name": u.name or u.email,
-                    "last_committee_date": getattr(u, "_last_committee_date", None),
-                    "committees_current_year": getattr(u, "_committees_current_year", 0) or 0,
-                    "committees_last_year": getattr(u, "_committees_last_year", 0) or 0,
-                    "pay_band": getattr(u, "_pay_band_number", None),
-                    "salary_change": getattr(u, "_salary_change", None),
-                    "is_mapped": bool(getattr(u, "_is_mapped", False)),
-                    "last_bonus_date": getattr(u, "_last_bonus_date", None),
-                    "last_bonus_percentage": getattr(u, "_last_bonus_percentage", None),
-                    "last_salary_change_date": getattr(u, "_last_salary_change_date", None),
-                    "ladder": getattr(u, "_ladder_code", None),
-                    "ladder_levels": getattr(u, "_details_json", {}) if getattr(u, "_details_json", {}) is not None else {},
-                    "overall_level": getattr(u, "_overall_score", None),
-                    "seniority_level": getattr(u, "_seniority_level", None),
-                    "leader": getattr(u, "_leader_name", None) or getattr(u.leader, "name", None),
-                    "team": getattr(u, "_team_name", None) or getattr(u.team, "name", None),
-                    "tribe": getattr(u, "_tribe_name", None) or getattr(getattr(u.team, "tribe", None), "name", None),
-                }
-                writer.writerow(row)
-
-            filename = build_csv_filename(as_of_str)
-            response = StreamingHttpResponse(buffer.getvalue(), content_type="text/csv")
-            response["Content-Disposition"] = f"attachment; filename={filename}"
-            return response
-        except Exception as e:
-            return Response({"detail": f"CSV export failed: {str(e)}"}, status=500)
\ No newline at end of file
+        # Rows are rendered lazily while the response is sent
+        filename = build_csv_filename(as_of_str)
+        response = StreamingHttpResponse(iter_personnel_performance_csv(visible), content_type="text/csv")
+        response["Content-Disposition"] = f"attachment; filename={filename}"
+        return response
\ No newline at end of file
@@ -9,6 +9,7 @@ from rest_framework.response import Response
 from django.db import models
 
 from api.services.timeline_access import can_view_timeline
+from api.services.leadership import get_reports
 from api.models import User, Cycle, Ladder, SenioritySnapshot
 from api.serializers.profile import (
     ProfileSerializer,
@@ -60,7 +61,10 @@ class UserDetailView(RetrieveAPIView):
 
 
 class MyTeamViewSet(viewsets.ReadOnlyModelViewSet):
-    """Read-only list of the current user's direct reports with 1:1 metadata, for the current cycle."""
+    """Read-only list of the current user's direct reports with 1:1 metadata, for the current cycle.
+
+    ``?include_indirect=true`` on the list extends it to every report down the leadership chain.
+    """
 
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = ProfileSerializer
@@ -68,7 +72,11 @@ class MyTeamViewSet(viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         leader = self.request.user
         cycle = Cycle.get_current_cycle()
-        qs = User.objects.filter(leader=leader)
+        include_indirect = (
+            self.action == "list"
+            and self.request.query_params.get("include_indirect", "").lower() in ("true", "1")
+        )
+        qs = get_reports(leader) if include_indirect else User.objects.filter(leader=leader)
 
         if cycle is not None:
             qs = qs.annotate(
@@ -1,9 +1,16 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
 from django.conf import settings
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from rest_framework.generics import ListAPIView
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import ParseError, PermissionDenied
+from rest_framework.response import Response
 from rest_framework import mixins, viewsets
 
 from api.models import User, TimelineEvent, RoleType, TitleChange, Notice
@@ -30,19 +37,96 @@ class IsMaintainer(IsAuthenticated):
         return False
 
 
+class TimelineKeysetPagination(PageNumberPagination):
+    """Page numbers by default; ``?cursor=`` (empty for the first page, then the previous
+    response's ``next_cursor``) switches to keyset pagination.
+
+    The cursor encodes the (effective_date, date_created, id) of the last event of a page, so
+    every page is an index range scan on TimelineEvent(user, effective_date, date_created)
+    whatever its depth. Keyset responses carry no ``count``. Assumes the queryset is ordered
+    by ``-effective_date, -date_created, -id``.
+    """
+
+    page_size = 10
+    cursor_query_param = "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.use_keyset = self.cursor_query_param in request.query_params
+        if not self.use_keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        position = self.decode_cursor(request.query_params[self.cursor_query_param])
+        if position is not None:
+            queryset = queryset.filter(self._after(*position))
+        events = list(queryset[: self.page_size + 1])
+        self.next_position = None
+        if len(events) > self.page_size:
+            events = events[: self.page_size]
+            last = events[-1]
+            self.next_position = (last.effective_date, last.date_created, last.pk)
+        return events
+
+    def get_paginated_response(self, data):
+        if not self.use_keyset:
+            return super().get_paginated_response(data)
+        next_cursor = self.encode_cursor(self.next_position) if self.next_position else None
+        return Response({"next_cursor": next_cursor, "results": data})
+
+    @staticmethod
+    def _after(effective_date, date_created, pk) -> Q:
+        """Events that come after the cursor in ``-effective_date, -date_created, -id`` order.
+
+        Postgres sorts NULL date_created first in descending order.
+        """
+        later_day = Q(effective_date__lt=effective_date)
+        if date_created is None:
+            return (
+                later_day
+                | Q(effective_date=effective_date, date_created__isnull=True, pk__lt=pk)
+                | Q(effective_date=effective_date, date_created__isnull=False)
+            )
+        return (
+            later_day
+            | Q(effective_date=effective_date, date_created__lt=date_created)
+            | Q(effective_date=effective_date, date_created=date_created, pk__lt=pk)
+        )
+
+    @staticmethod
+    def encode_cursor(position) -> str:
+        effective_date, date_created, pk = position
+        # isoformat() keeps microseconds, which DjangoJSONEncoder would truncate
+        payload = json.dumps([effective_date.isoformat(), date_created.isoformat() if date_created else None, pk])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None
+        try:
+            effective_date, date_created, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return (
+                date.fromisoformat(effective_date),
+                datetime.fromisoformat(date_created) if date_created else None,
+                int(pk),
+            )
+        except (TypeError, ValueError, binascii.Error):
+            raise ParseError("Invalid cursor")
+
+
 class UserTimelineView(ListAPIView):
     """Return paginated timeline events for a given user_id respecting basic ACL."""
 
     serializer_class = TimelineEventLiteSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TimelineKeysetPagination
 
-    class _Pagination(PageNumberPagination):
-        page_size = 10
-
-    pagination_class = _Pagination
+    def get_target_user(self) -> User:
+        """The timeline owner, looked up once per request."""
+        if not hasattr(self, "_target_user"):
+            self._target_user = get_object_or_404(User, uuid=self.kwargs["user_id"])
+        return self._target_user
 
     def get_queryset(self):
-        target_user = get_object_or_404(User, uuid=self.kwargs["user_id"])
+        target_user = self.get_target_user()
         request_user = self.request.user
 
         # Fine-grained ACL check
@@ -51,15 +135,14 @@ class UserTimelineView(ListAPIView):
 
         return (
             TimelineEvent.objects.filter(user=target_user)
-            .order_by("-effective_date", "-date_created")
+            .order_by("-effective_date", "-date_created", "-id")
         )
 
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
 
         if request.query_params.get("include_level") == "true":
-            target_user = get_object_or_404(User, uuid=self.kwargs["user_id"])
-            level_data = get_current_level(target_user)
+            level_data = get_current_level(self.get_target_user())
             if level_data:
                 response.data["level"] = level_data
         return response
@@ -1,5 +1,7 @@
+from django.conf import settings
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -15,19 +17,42 @@ from api.services.timeline_access import (
     TECH_LADDERS, 
     PRODUCT_LADDERS,
     _is_technical,
-    _is_product
+    _is_product,
+    resolve_visible_users,
 )
-from api.models import RoleType, SenioritySnapshot
+from api.services.performance_tables import get_visible_users_for_viewer
+from api.services.leadership import is_in_leadership_chain
+from api.services.org_structure import org_structure_version
+from api.services.user_classification import ensure_user_classifications
+from api.utils.http import etag_response, json_etag
+from api.models import LadderCategory, RoleType, SenioritySnapshot
 from django.db.models import Q, Subquery, OuterRef, Exists
 
 
-@extend_schema(responses={200: UserPermissionsSerializer})
+USER_PERMISSIONS_CACHE_PREFIX = "user_permissions"
+
+
+@extend_schema(responses={200: UserPermissionsSerializer, 304: None})
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def user_permissions(request):
-    """Get current user's permissions and accessible data for UI configuration."""
+    """Get current user's permissions and accessible data for UI configuration.
+
+    The payload is cached per user under the current org-structure version, so any
+    org, role or override change recomputes it. Supports ETag / If-None-Match.
+    """
     user = request.user
-    
+    cache_key = f"{USER_PERMISSIONS_CACHE_PREFIX}:{org_structure_version()}:{user.pk}"
+    cached = cache.get(cache_key)
+    if cached is None:
+        payload = _user_permissions_payload(user)
+        cached = (json_etag(payload), payload)
+        cache.set(cache_key, cached, getattr(settings, "USER_PERMISSIONS_CACHE_TIMEOUT", 3600))
+    etag, payload = cached
+    return etag_response(request, payload, etag=etag)
+
+
+def _user_permissions_payload(user):
     # Determine user's roles
     roles = []
     if has_role(user, {RoleType.CEO}):
@@ -59,6 +84,9 @@ def user_permissions(request):
     can_view_all_users = has_role(user, {RoleType.CEO, RoleType.HR_MANAGER, RoleType.MAINTAINER})
     can_view_technical_users = has_role(user, {RoleType.CTO, RoleType.VP}) or has_role(user, {RoleType.ENGINEERING_DIRECTOR})
     can_view_product_users = has_role(user, {RoleType.CPO}) or has_role(user, {RoleType.PRODUCT_DIRECTOR})
+    if can_view_technical_users or can_view_product_users:
+        # Ladder-category scopes below read UserClassification
+        ensure_user_classifications()
 
     # Visibility of performance table (Team Leaders and above + Agile Coaches)
     is_team_leader = Team.objects.filter(leader=user).exists()
@@ -111,15 +139,7 @@ def user_permissions(request):
             accessible_tribes = [user.team.tribe.name]
     elif has_role(user, {RoleType.CTO, RoleType.VP}):
         # CTO/VP: tribes with (any TECH user by latest ladder) OR (unmapped users in TECH tribe/team)
-        latest_ladder_code = Subquery(
-            SenioritySnapshot.objects
-            .filter(user=OuterRef("pk"))
-            .order_by("-effective_date", "-date_created")
-            .values("ladder__code")[:1]
-        )
-        tech_tribe_ids_from_ladder = User.objects.annotate(_ladder_code=latest_ladder_code).filter(
-            _ladder_code__in=TECH_LADDERS
-        ).values("team__tribe_id")
+        tech_tribe_ids_from_ladder = User.objects.filter(classification__ladder_category=LadderCategory.TECH).values("team__tribe_id")
         unmapped_tech_tribe_ids = User.objects.filter(
             seniority_snapshots__isnull=True
         ).filter(
@@ -132,15 +152,7 @@ def user_permissions(request):
         )
     elif has_role(user, {RoleType.CPO}):
         # CPO: tribes with at least one user whose latest ladder is PRODUCT OR belongs to Product chapter
-        latest_ladder_code = Subquery(
-            SenioritySnapshot.objects
-            .filter(user=OuterRef("pk"))
-            .order_by("-effective_date", "-date_created")
-            .values("ladder__code")[:1]
-        )
-        product_tribe_ids_from_ladder = User.objects.annotate(_ladder_code=latest_ladder_code).filter(
-            _ladder_code__in=PRODUCT_LADDERS
-        ).values("team__tribe_id")
+        product_tribe_ids_from_ladder = User.objects.filter(classification__ladder_category=LadderCategory.PRODUCT).values("team__tribe_id")
         product_tribe_ids_from_chapter = User.objects.filter(chapter__name__iexact="Product").values("team__tribe_id")
         accessible_tribes = list(
             Tribe.objects.filter(
@@ -167,15 +179,7 @@ def user_permissions(request):
         accessible_teams = list(Team.objects.filter(tribe__name__in=accessible_tribes).values_list('name', flat=True))
     elif has_role(user, {RoleType.CTO, RoleType.VP}):
         # CTO/VP: teams with (any TECH user by latest ladder) OR (unmapped users AND team/tribe categorized as TECH)
-        latest_ladder_code = Subquery(
-            SenioritySnapshot.objects
-            .filter(user=OuterRef("pk"))
-            .order_by("-effective_date", "-date_created")
-            .values("ladder__code")[:1]
-        )
-        tech_team_ids = User.objects.annotate(_ladder_code=latest_ladder_code).filter(
-            _ladder_code__in=TECH_LADDERS
-        ).values("team_id")
+        tech_team_ids = User.objects.filter(classification__ladder_category=LadderCategory.TECH).values("team_id")
         accessible_teams = list(
             Team.objects.filter(
                 Q(pk__in=Subquery(tech_team_ids))
@@ -187,15 +191,7 @@ def user_permissions(request):
         )
     elif has_role(user, {RoleType.CPO}):
         # CPO: teams with at least one user whose latest ladder is PRODUCT OR belongs to Product chapter
-        latest_ladder_code = Subquery(
-            SenioritySnapshot.objects
-            .filter(user=OuterRef("pk"))
-            .order_by("-effective_date", "-date_created")
-            .values("ladder__code")[:1]
-        )
-        product_team_ids_from_ladder = User.objects.annotate(_ladder_code=latest_ladder_code).filter(
-            _ladder_code__in=PRODUCT_LADDERS
-        ).values("team_id")
+        product_team_ids_from_ladder = User.objects.filter(classification__ladder_category=LadderCategory.PRODUCT).values("team_id")
         product_team_ids_from_chapter = User.objects.filter(chapter__name__iexact="Product").values("team_id")
         accessible_teams = list(
             Team.objects.filter(
@@ -217,17 +213,10 @@ def user_permissions(request):
         leaders_qs = User.objects.filter(user__isnull=False).distinct()
     elif has_role(user, {RoleType.CTO, RoleType.VP}):
         # Leaders with (any TECH subordinate by LATEST ladder) OR (unmapped subordinate AND subordinate categorized TECH)
-        latest_ladder_code = Subquery(
-            SenioritySnapshot.objects
-            .filter(user=OuterRef("pk"))
-            .order_by("-effective_date", "-date_created")
-            .values("ladder__code")[:1]
-        )
         tech_sub_exists = Exists(
             User.objects
             .filter(leader=OuterRef("pk"))
-            .annotate(_ladder_code=latest_ladder_code)
-            .filter(_ladder_code__in=TECH_LADDERS)
+            .filter(classification__ladder_category=LadderCategory.TECH)
         )
         unmapped_tech_sub_exists = Exists(
             User.objects
@@ -237,17 +226,10 @@ def user_permissions(request):
         leaders_qs = User.objects.filter(tech_sub_exists | unmapped_tech_sub_exists).distinct()
     elif has_role(user, {RoleType.CPO}):
         # Leaders with (any PRODUCT subordinate by LATEST ladder) OR (subordinate in Product chapter)
-        latest_ladder_code = Subquery(
-            SenioritySnapshot.objects
-            .filter(user=OuterRef("pk"))
-            .order_by("-effective_date", "-date_created")
-            .values("ladder__code")[:1]
-        )
         product_sub_exists = Exists(
             User.objects
             .filter(leader=OuterRef("pk"))
-            .annotate(_ladder_code=latest_ladder_code)
-            .filter(_ladder_code__in=PRODUCT_LADDERS)
+            .filter(classification__ladder_category=LadderCategory.PRODUCT)
         )
         product_chapter_sub_exists = Exists(
             User.objects.filter(leader=OuterRef("pk"), chapter__name__iexact="Product")
@@ -262,7 +244,7 @@ def user_permissions(request):
     elif Team.objects.filter(leader=user).exists():
         leaders_qs = User.objects.filter(pk=user.pk)
 
-    accessible_leaders = list({(l.name or l.email) for l in leaders_qs if (l.name or l.email)})
+    accessible_leaders = sorted({(l.name or l.email) for l in leaders_qs if (l.name or l.email)})
     
     # Determine scope
     if can_view_all_users:
@@ -288,7 +270,7 @@ def user_permissions(request):
         }
     }
     
-    return Response({
+    return {
         "user": {
             "id": user.id,
             "email": user.email,
@@ -307,7 +289,7 @@ def user_permissions(request):
             "scope": scope,
         },
         "ui_hints": ui_hints,
-    })
+    }
 
 
 @extend_schema(responses={200: TimelinePermissionsSerializer})
@@ -326,7 +308,7 @@ def timeline_permissions(request, target_id):
         reason = "self"
     elif has_role(viewer, {RoleType.HR_MANAGER}):
         reason = "hr_manager"
-    elif viewer in target.get_leaders():
+    elif is_in_leadership_chain(viewer, target):
         reason = "leadership_chain"
     elif has_role(viewer, {RoleType.CEO}):
         reason = "ceo"
@@ -357,29 +339,59 @@ def timeline_permissions(request, target_id):
     })
 
 
-@extend_schema(responses={200: AccessibleUsersResponseSerializer})
+# Fields of each accessible_users entry, mapped to their values() lookup
+ACCESSIBLE_USER_FIELDS = {
+    "id": "id",
+    "email": "email",
+    "name": "name",
+    "ladder": "latest_ladder_code",
+    "tribe": "team__tribe__name",
+    "team": "team__name",
+}
+
+
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            "fields",
+            str,
+            description="Comma-separated subset of " + ", ".join(ACCESSIBLE_USER_FIELDS),
+        )
+    ],
+    responses={200: AccessibleUsersResponseSerializer, 304: None},
+)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def accessible_users(request):
-    """Get list of users accessible to current user for performance table."""
+    """Get list of users accessible to current user for performance table.
+
+    Same scoping as the performance table, resolved in the database in one query.
+    Supports ``?fields=`` trimming and ETag / If-None-Match revalidation.
+    """
     viewer = request.user
-    
-    # Get all users that the viewer can access
-    accessible_users = []
-    all_users = User.objects.filter(is_superuser=False).select_related('team', 'team__tribe')
-    
-    for user in all_users:
-        if can_view_timeline(viewer, user):
-            latest_snapshot = user.seniority_snapshots.order_by('-effective_date').first()
-            accessible_users.append({
-                "id": user.id,
-                "email": user.email,
-                "name": user.name,
-                "ladder": getattr(latest_snapshot.ladder, 'code', None) if latest_snapshot else None,
-                "tribe": getattr(getattr(user.team, 'tribe', None), 'name', None),
-                "team": getattr(user.team, 'name', None),
-            })
-    
+
+    fields = list(ACCESSIBLE_USER_FIELDS)
+    if request.query_params.get("fields"):
+        fields = [f.strip() for f in request.query_params["fields"].split(",") if f.strip()]
+        unknown = [f for f in fields if f not in ACCESSIBLE_USER_FIELDS]
+        if unknown:
+            return Response({"detail": f"Unknown fields: {', '.join(unknown)}"}, status=400)
+
+    qs = (
+        get_visible_users_for_viewer(viewer)
+        .filter(is_superuser=False, id__in=resolve_visible_users(viewer).values("pk"))
+        .order_by("id")
+    )
+    if "ladder" in fields:
+        latest_ladder = SenioritySnapshot.objects.filter(user=OuterRef("pk")).order_by(
+            "-effective_date", "-date_created"
+        )
+        qs = qs.annotate(latest_ladder_code=Subquery(latest_ladder.values("ladder__code")[:1]))
+    accessible_users = [
+        {field: row[ACCESSIBLE_USER_FIELDS[field]] for field in fields}
+        for row in qs.values(*(ACCESSIBLE_USER_FIELDS[field] for field in fields))
+    ]
+
     # Determine scope
     scope = "all_users"
     if has_role(viewer, {RoleType.CTO, RoleType.VP}):
@@ -397,7 +409,7 @@ def accessible_users(request):
     elif Team.objects.filter(leader=viewer).exists():
         scope = "team_only"
     
-    return Response({
+    return etag_response(request, {
         "accessible_users": accessible_users,
         "total_count": len(accessible_users),
         "scope": scope,
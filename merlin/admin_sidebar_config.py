@@ -152,6 +152,11 @@ UNFOLD_SIDEBAR_CONFIG = {
                     "icon": "assignment_ind",
                     "link": _make_link('admin:api_formassignment_changelist'),
                 },
+                {
+                    "title": "Form assignment jobs",
+                    "icon": "pending_actions",
+                    "link": _make_link('admin:api_formassignmentjob_changelist'),
+                },
             ],
         },
         {
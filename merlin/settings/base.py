@@ -73,6 +73,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -230,6 +231,12 @@ BEPA_REDIRECT_URI = os.getenv("BEPA_REDIRECT_URI", "")
 
 SIGNUP_DISABLED = os.getenv("MERLIN_SIGNUP_DISABLED", "false")
 
+# When "true", committee/mention ACL changes are queued and applied by `manage.py process_acl_queue`
+ACL_RECOMPUTE_DEFERRED = os.getenv("MERLIN_ACL_RECOMPUTE_DEFERRED", "false")
+
+# When "true", default-form assignments run in a background thread after the form is saved
+FORM_ASSIGNMENT_IN_BACKGROUND = os.getenv("MERLIN_FORM_ASSIGNMENT_IN_BACKGROUND", "false")
+
 AUTH_USER_MODEL = "api.User"
 
 # Import admin sidebar configuration with error handling
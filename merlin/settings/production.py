@@ -67,6 +67,12 @@ LOGGING = {
             "level": "ERROR",
             "propagate": False,
         },
+        # One JSON line per request: query count, DB/serializer/Python time, budget overruns
+        "api.metrics": {
+            "handlers": ["info-file", "console"],
+            "level": os.environ.get("MERLIN_REQUEST_METRICS_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
         "django": {
             "level": "INFO",
             "propagate": True,